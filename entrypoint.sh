@@ -13,17 +13,19 @@ done
 
 echo "PostgreSQL готов!"
 
-# Выполнение миграций
-echo "Выполнение миграций..."
-uv run python softlex/manage.py migrate --noinput
-
-# Сбор статических файлов
-echo "Сбор статических файлов..."
-uv run python softlex/manage.py collectstatic --noinput
-
-# Создание суперпользователя, если не существует
-echo "Проверка суперпользователя..."
-uv run python softlex/manage.py shell -c "
+# Миграции и подготовка выполняются один раз - в сервисе web
+if [ "${SKIP_MIGRATIONS:-0}" != "1" ]; then
+    # Выполнение миграций
+    echo "Выполнение миграций..."
+    uv run python softlex/manage.py migrate --noinput
+
+    # Сбор статических файлов
+    echo "Сбор статических файлов..."
+    uv run python softlex/manage.py collectstatic --noinput
+
+    # Создание суперпользователя, если не существует
+    echo "Проверка суперпользователя..."
+    uv run python softlex/manage.py shell -c "
 from django.contrib.auth import get_user_model
 User = get_user_model()
 if not User.objects.filter(is_superuser=True).exists():
@@ -32,7 +34,15 @@ if not User.objects.filter(is_superuser=True).exists():
     print('Суперпользователь создан: admin/admin')
 else:
     print('Суперпользователь уже существует')
-"
+    "
+fi
+
+# Команда web - сервер приложений gunicorn (настройки в gunicorn.conf.py):
+# WEB_MODE=wsgi - процессы с потоками, WEB_MODE=asgi - воркеры uvicorn
+if [ "$1" = "web" ]; then
+    echo "Запуск сервера приложений (${WEB_MODE:-wsgi})..."
+    exec uv run gunicorn --config gunicorn.conf.py
+fi
 
 echo "Запуск сервера..."
 
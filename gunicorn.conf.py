@@ -0,0 +1,63 @@
+"""
+Настройки gunicorn для запуска Softlex в production
+
+Запуск из корня проекта (файл подхватывается автоматически):
+
+    gunicorn                  # WSGI: процессы с потоками (gthread)
+    WEB_MODE=asgi gunicorn    # ASGI: асинхронные воркеры uvicorn
+
+Число процессов и потоков рассчитывается по доступным процессору ядрам
+и переопределяется переменными WEB_WORKERS и WEB_THREADS. Плавный
+перезапуск: kill -HUP <pid мастера> - новые воркеры поднимаются с новым
+кодом, старые дообслуживают начатые запросы.
+"""
+import os
+
+
+def _cpu_count():
+    """Ядра, доступные процессу (с учетом ограничения cpuset контейнера)"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+WEB_MODE = os.environ.get('WEB_MODE', 'wsgi')
+if WEB_MODE not in ('wsgi', 'asgi'):
+    raise RuntimeError(f'WEB_MODE должен быть wsgi или asgi, получено: {WEB_MODE}')
+
+CPU_COUNT = _cpu_count()
+
+# Модули проекта лежат в softlex/ (рядом с manage.py)
+chdir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'softlex')
+bind = os.environ.get('WEB_BIND', '0.0.0.0:8000')
+
+if WEB_MODE == 'asgi':
+    wsgi_app = 'softlex.asgi:application'
+    worker_class = 'uvicorn_worker.UvicornWorker'
+    # Асинхронный воркер сам обслуживает много соединений - по одному на ядро
+    workers = int(os.environ.get('WEB_WORKERS') or CPU_COUNT)
+else:
+    wsgi_app = 'softlex.wsgi:application'
+    worker_class = 'gthread'
+    # Потоки перекрывают ожидание базы данных, процессы занимают все ядра
+    workers = int(os.environ.get('WEB_WORKERS') or CPU_COUNT * 2 + 1)
+    threads = int(os.environ.get('WEB_THREADS') or 4)
+
+# Зависший запрос перезапускает воркер; при остановке и HUP начатые
+# запросы дообслуживаются в течение graceful_timeout
+timeout = int(os.environ.get('WEB_TIMEOUT') or 60)
+graceful_timeout = int(os.environ.get('WEB_GRACEFUL_TIMEOUT') or 30)
+keepalive = 5
+
+# Периодический перезапуск воркеров ограничивает рост памяти; разброс не
+# дает всем воркерам перезапуститься одновременно
+max_requests = int(os.environ.get('WEB_MAX_REQUESTS') or 1000)
+max_requests_jitter = max_requests // 10
+
+# Перезапуск при изменении кода - только для разработки
+reload = os.environ.get('WEB_RELOAD', '0') == '1'
+
+accesslog = '-'
+errorlog = '-'
+loglevel = os.environ.get('WEB_LOG_LEVEL', 'info')
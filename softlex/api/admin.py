@@ -0,0 +1,10 @@
+from django.contrib import admin
+
+from .models import ApiToken
+
+
+@admin.register(ApiToken)
+class ApiTokenAdmin(admin.ModelAdmin):
+    list_display = ('name', 'prefix', 'user', 'created_at', 'last_used_at')
+    search_fields = ('name', 'prefix', 'user__email')
+    readonly_fields = ('prefix', 'created_at', 'last_used_at')
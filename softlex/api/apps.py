@@ -0,0 +1,11 @@
+from django.apps import AppConfig
+
+
+class ApiConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'api'
+    verbose_name = 'API'
+
+    def ready(self):
+        # Сброс кэша токенов при их удалении
+        from . import signals  # noqa: F401
@@ -0,0 +1,98 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.utils import timezone
+
+from .models import ApiToken
+
+User = get_user_model()
+
+
+# Время жизни закэшированного соответствия токена пользователю (секунды)
+API_TOKEN_CACHE_TIMEOUT = getattr(settings, 'API_TOKEN_CACHE_TIMEOUT', 5 * 60)
+
+# Схемы заголовка Authorization: "Token <ключ>" или "Bearer <ключ>"
+AUTH_SCHEMES = {'token', 'bearer'}
+
+
+def _token_cache_key(key_hash):
+    return f'api_token:{key_hash}'
+
+
+def token_cache_enabled():
+    """
+    Можно ли кэшировать токены
+
+    Отзыв токена сбрасывает кэш только в том процессе, где он удален,
+    поэтому при локальном кэше процесса (locmem, как по умолчанию)
+    токен проверяется по таблице на каждый запрос.
+    """
+    return not isinstance(caches['default'], (LocMemCache, DummyCache))
+
+
+def get_token_user_id(key):
+    """
+    Возвращает ID владельца токена
+
+    При общем кэше (CACHE_URL) соответствие хэша токена пользователю
+    кэшируется, поэтому таблица токенов читается один раз за
+    API_TOKEN_CACHE_TIMEOUT. Неизвестные токены тоже кэшируются, чтобы
+    перебор не нагружал БД. Время последнего использования обновляется
+    не чаще раза за API_TOKEN_CACHE_TIMEOUT.
+
+    Args:
+        key: Ключ из заголовка Authorization
+
+    Returns:
+        int: ID пользователя или None, если токен неизвестен
+    """
+    key_hash = ApiToken.hash_key(key)
+    use_cache = token_cache_enabled()
+    cache_key = _token_cache_key(key_hash)
+    cached = cache.get(cache_key) if use_cache else None
+    if cached is None:
+        # Только из основной базы: удаленный токен, прочитанный с отстающей
+        # реплики, снова попал бы в кэш
+        token = (
+            ApiToken.objects.using(DEFAULT_DB_ALIAS)
+            .filter(key_hash=key_hash)
+            .values_list('pk', 'user_id', 'last_used_at')
+            .first()
+        )
+        if token:
+            now = timezone.now()
+            if token[2] is None or token[2] < now - timedelta(seconds=API_TOKEN_CACHE_TIMEOUT):
+                ApiToken.objects.filter(pk=token[0]).update(last_used_at=now)
+        # 0 - токен неизвестен (None в кэше неотличим от промаха)
+        cached = token[1] if token else 0
+        if use_cache:
+            cache.set(cache_key, cached, API_TOKEN_CACHE_TIMEOUT)
+    return cached or None
+
+
+def invalidate_token(key_hash):
+    """Сбрасывает закэшированный токен после фиксации транзакции"""
+    if token_cache_enabled():
+        transaction.on_commit(lambda: cache.delete(_token_cache_key(key_hash)))
+
+
+def authenticate_token(request):
+    """
+    Определяет пользователя по токену из заголовка Authorization
+
+    Returns:
+        User: Владелец токена или None, если токен не передан или неверен
+    """
+    scheme, _, key = request.headers.get('Authorization', '').partition(' ')
+    key = key.strip()
+    if scheme.lower() not in AUTH_SCHEMES or not key:
+        return None
+    user_id = get_token_user_id(key)
+    if user_id is None:
+        return None
+    return User.objects.filter(pk=user_id).first()
@@ -0,0 +1,289 @@
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from testcases.forms import TestCaseRowForm
+from testcases.members import sync_project_members
+from testcases.models import Section, TestCase
+from testcases.stats import adjust_project_stats
+
+from .forms import MemberItemForm, SectionItemForm
+from .utils import ApiError, read_json
+
+
+# Максимальное количество элементов в одном пакетном запросе
+API_BATCH_LIMIT = getattr(settings, 'API_BATCH_LIMIT', 500)
+
+SECTION_WRITE_FIELDS = ['name', 'order', 'parent']
+TESTCASE_WRITE_FIELDS = [*TestCaseRowForm.Meta.fields, 'section']
+MEMBER_WRITE_FIELDS = list(MemberItemForm.base_fields)
+
+
+def read_items(request):
+    """
+    Элементы пакетного запроса из тела {"items": [...]}
+
+    Raises:
+        ApiError: Если тело не содержит непустого списка объектов или
+            элементов больше API_BATCH_LIMIT
+    """
+    data = read_json(request)
+    items = data.get('items') if isinstance(data, dict) else None
+    if not isinstance(items, list) or not items:
+        raise ApiError('Ожидается объект {"items": [...]} с непустым списком')
+    if len(items) > API_BATCH_LIMIT:
+        raise ApiError(f'За один запрос можно передать не более {API_BATCH_LIMIT} элементов')
+    if not all(isinstance(item, dict) for item in items):
+        raise ApiError('Каждый элемент items должен быть объектом')
+    return items
+
+
+def _to_id(value):
+    """ID из JSON или None, если значение не является целым числом"""
+    if isinstance(value, bool):
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _item_errors(item, allowed, form=None):
+    """Ошибки элемента: неизвестные поля и ошибки формы {поле: [...]}"""
+    errors = {name: ['Неизвестное поле'] for name in item if name not in allowed}
+    if form is not None and not form.is_valid():
+        for field, messages in form.errors.items():
+            errors.setdefault(field, []).extend(messages)
+    return errors
+
+
+def _raise_errors(errors):
+    """Весь пакет отклоняется, если хотя бы один элемент некорректен"""
+    if errors:
+        raise ApiError('Данные не прошли проверку, ничего не сохранено', errors=errors)
+
+
+def _project_sections(project, items, field):
+    """ID и пути секций проекта, на которые ссылаются элементы, одним запросом"""
+    ids = {_to_id(item.get(field)) for item in items} - {None}
+    if not ids:
+        return {}
+    return dict(Section.objects.filter(project=project, pk__in=ids).values_list('pk', 'path'))
+
+
+def _check_section(item, field, sections, errors, message):
+    """Проверяет ссылку на секцию (null - без секции) и возвращает ее ID"""
+    value = item.get(field)
+    if value is None:
+        return None
+    section_id = _to_id(value)
+    if section_id not in sections:
+        errors[field] = [message]
+    return section_id
+
+
+def _key_owners(project, items):
+    """Тест-кейсы проекта, которым сейчас принадлежат ключи пакета: {ключ: ID}"""
+    keys = {item['automation_key'] for item in items if isinstance(item.get('automation_key'), str)} - {''}
+    if not keys:
+        return {}
+    return dict(
+        TestCase.objects
+        .filter(project=project, automation_key__in=keys)
+        .values_list('automation_key', 'pk')
+    )
+
+
+def _check_key(key, taken, seen, errors):
+    if not key:
+        return
+    if key in taken:
+        errors['automation_key'] = ['Тест-кейс с таким ключом автоматизации уже есть в проекте']
+    elif key in seen:
+        errors['automation_key'] = ['Ключ повторяется в запросе']
+    else:
+        seen.add(key)
+
+
+def create_sections(project, items):
+    """
+    Создает секции пакетом
+
+    Родитель должен быть существующей секцией проекта. Секции вставляются
+    одним bulk_create, материализованные пути - одним bulk_update.
+
+    Returns:
+        list: Созданные секции
+
+    Raises:
+        ApiError: Если хотя бы один элемент некорректен
+    """
+    parents = _project_sections(project, items, 'parent')
+    sections = []
+    errors = []
+    for index, item in enumerate(items):
+        form = SectionItemForm(data=item)
+        item_errors = _item_errors(item, SECTION_WRITE_FIELDS, form)
+        parent_id = _check_section(
+            item, 'parent', parents, item_errors, 'Родительская секция не найдена в проекте'
+        )
+        if item_errors:
+            errors.append({'index': index, 'errors': item_errors})
+            continue
+        section = form.instance
+        section.project = project
+        section.parent_id = parent_id
+        sections.append(section)
+    _raise_errors(errors)
+
+    with transaction.atomic():
+        created = Section.objects.bulk_create(sections)
+        # bulk_create не вызывает save(): пути проставляются отдельно
+        for section in created:
+            section.path = Section.build_path(parents.get(section.parent_id, ''), section.pk)
+        Section.objects.bulk_update(created, ['path'])
+        adjust_project_stats(project.pk, section_count=len(created))
+    return created
+
+
+def create_test_cases(project, items, user):
+    """
+    Создает тест-кейсы пакетом в одной транзакции
+
+    Каждый элемент проверяется по правилам TestCaseForm; секции и ключи
+    автоматизации всего пакета проверяются одним запросом каждые.
+
+    Returns:
+        list: Созданные тест-кейсы
+
+    Raises:
+        ApiError: Если хотя бы один элемент некорректен
+    """
+    sections = _project_sections(project, items, 'section')
+    taken = set(_key_owners(project, items))
+    seen = set()
+    test_cases = []
+    errors = []
+    for index, item in enumerate(items):
+        form = TestCaseRowForm(data=item)
+        item_errors = _item_errors(item, TESTCASE_WRITE_FIELDS, form)
+        section_id = _check_section(item, 'section', sections, item_errors, 'Секция не найдена в проекте')
+        _check_key(form.cleaned_data.get('automation_key'), taken, seen, item_errors)
+        if item_errors:
+            errors.append({'index': index, 'errors': item_errors})
+            continue
+        test_case = form.instance
+        test_case.project = project
+        test_case.section_id = section_id
+        test_case.created_by = user
+        test_cases.append(test_case)
+    _raise_errors(errors)
+
+    try:
+        with transaction.atomic():
+            created = TestCase.objects.bulk_create(test_cases)
+            # bulk_create не вызывает сигналы - обновляем счетчики проекта явно
+            adjust_project_stats(project.pk, test_case_count=len(created))
+    except IntegrityError:
+        raise ApiError('Ключ автоматизации занят параллельным запросом, повторите запрос', 409)
+    return created
+
+
+def update_test_cases(project, items):
+    """
+    Изменяет тест-кейсы пакетом в одной транзакции
+
+    Элемент содержит id и только изменяемые поля. Тест-кейсы загружаются
+    одним запросом, проверяются по правилам TestCaseForm и записываются
+    одним bulk_update только по переданным полям.
+
+    Ключи автоматизации проверяются по состоянию после изменения: ключ,
+    который другой тест-кейс пакета меняет на новый, свободен, поэтому
+    тест-кейсы могут обменяться ключами.
+
+    Returns:
+        list: Измененные тест-кейсы
+
+    Raises:
+        ApiError: Если хотя бы один элемент некорректен
+    """
+    instances = TestCase.objects.filter(project=project).in_bulk(
+        list({_to_id(item.get('id')) for item in items} - {None})
+    )
+    sections = _project_sections(project, items, 'section')
+    owners = _key_owners(project, items)
+    checked = []
+    fields = set()
+    for index, item in enumerate(items):
+        instance = instances.pop(_to_id(item.get('id')), None)
+        if instance is None:
+            checked.append((index, None, {'id': ['Тест-кейс не найден в проекте или указан повторно']}, None))
+            continue
+        data = {name: getattr(instance, name) for name in TestCaseRowForm.Meta.fields}
+        data.update((name, value) for name, value in item.items() if name in data)
+        form = TestCaseRowForm(data=data, instance=instance)
+        item_errors = _item_errors(item, ['id', *TESTCASE_WRITE_FIELDS], form)
+        if 'section' in item:
+            instance.section_id = _check_section(
+                item, 'section', sections, item_errors, 'Секция не найдена в проекте'
+            )
+        checked.append((index, instance, item_errors, form.cleaned_data.get('automation_key')))
+        fields.update(name for name in item if name in TESTCASE_WRITE_FIELDS)
+
+    # Ключи после изменения: {ID тест-кейса пакета: ключ}
+    new_keys = {instance.pk: key for _, instance, _, key in checked if instance is not None and key is not None}
+    # Занят ключ, который остается у тест-кейса вне пакета или у тест-кейса
+    # пакета, не меняющего его
+    taken = {key for key, pk in owners.items() if new_keys.get(pk, key) == key}
+    seen = set()
+    updated = []
+    errors = []
+    for index, instance, item_errors, key in checked:
+        if instance is not None and owners.get(key) != instance.pk:
+            _check_key(key, taken, seen, item_errors)
+        if item_errors:
+            errors.append({'index': index, 'errors': item_errors})
+            continue
+        updated.append(instance)
+    _raise_errors(errors)
+
+    # bulk_update не обновляет auto_now поля
+    now = timezone.now()
+    for instance in updated:
+        instance.updated_at = now
+    # Уникальность проверяется после каждой строки UPDATE: ключи, которые
+    # переходят к другим тест-кейсам пакета, сначала освобождаются
+    released = [pk for key, pk in owners.items() if key not in taken]
+    try:
+        with transaction.atomic():
+            if released:
+                TestCase.objects.filter(pk__in=released).update(automation_key='')
+            TestCase.objects.bulk_update(updated, [*sorted(fields), 'updated_at'])
+    except IntegrityError:
+        raise ApiError('Ключ автоматизации занят параллельным запросом, повторите запрос', 409)
+    return updated
+
+
+def add_members(project, items, user):
+    """
+    Добавляет участников или меняет их роли пакетом
+
+    Участники, не указанные в запросе, остаются в проекте.
+
+    Returns:
+        dict: Результат sync_project_members: added, updated, removed, unknown
+
+    Raises:
+        ApiError: Если хотя бы один элемент некорректен
+    """
+    members = []
+    errors = []
+    for index, item in enumerate(items):
+        form = MemberItemForm(data=item)
+        item_errors = _item_errors(item, MEMBER_WRITE_FIELDS, form)
+        if item_errors:
+            errors.append({'index': index, 'errors': item_errors})
+            continue
+        members.append(form.cleaned_data)
+    _raise_errors(errors)
+    return sync_project_members(project, members, added_by=user, replace=False)
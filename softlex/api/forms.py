@@ -0,0 +1,37 @@
+from django import forms
+
+from testcases.members import MEMBER_ROLES
+from testcases.models import Section
+
+
+class SectionItemForm(forms.ModelForm):
+    """Проверка секции из пакетного запроса API (родитель проверяется отдельно)"""
+    
+    order = forms.IntegerField(min_value=0, required=False)
+    
+    class Meta:
+        model = Section
+        fields = ['name', 'order']
+        error_messages = {
+            'name': {
+                'required': 'Поле название секции обязательно для заполнения',
+                'max_length': 'Название секции не должно превышать 200 символов'
+            },
+        }
+    
+    def clean_order(self):
+        return self.cleaned_data['order'] or 0
+
+
+class MemberItemForm(forms.Form):
+    """Проверка участника из пакетного запроса API"""
+    
+    user_id = forms.IntegerField(required=False)
+    user_email = forms.EmailField(required=False)
+    role = forms.ChoiceField(choices=list(MEMBER_ROLES.items()))
+    
+    def clean(self):
+        cleaned_data = super().clean()
+        if not cleaned_data.get('user_id') and not cleaned_data.get('user_email'):
+            raise forms.ValidationError('Укажите user_id или user_email')
+        return cleaned_data
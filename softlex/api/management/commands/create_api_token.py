@@ -0,0 +1,23 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from api.models import ApiToken
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Создает токен JSON API для пользователя (например, для CI)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('email', help='Email пользователя - владельца токена')
+        parser.add_argument('--name', default='CI', help='Название токена')
+
+    def handle(self, *args, **options):
+        user = User.objects.filter(email=options['email']).first()
+        if user is None:
+            raise CommandError(f'Пользователь {options["email"]} не найден')
+
+        token, key = ApiToken.generate(user, options['name'])
+        self.stderr.write(f'Токен "{token.name}" создан. Сохраните его: повторно он не показывается.')
+        self.stdout.write(key)
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:46
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApiToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, verbose_name='Название')),
+                ('key_hash', models.CharField(editable=False, max_length=64, unique=True, verbose_name='Хэш токена')),
+                ('prefix', models.CharField(editable=False, max_length=8, verbose_name='Начало токена')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Создан')),
+                ('last_used_at', models.DateTimeField(blank=True, null=True, verbose_name='Последнее использование')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='api_tokens', to=settings.AUTH_USER_MODEL, verbose_name='Пользователь')),
+            ],
+            options={
+                'verbose_name': 'Токен API',
+                'verbose_name_plural': 'Токены API',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,55 @@
+import hashlib
+import secrets
+
+from django.conf import settings
+from django.db import models
+
+
+class ApiToken(models.Model):
+    """Токен доступа к JSON API (например, для CI)"""
+    
+    # Количество первых символов токена, сохраняемых для отображения
+    PREFIX_LENGTH = 8
+    
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='api_tokens',
+        verbose_name='Пользователь'
+    )
+    name = models.CharField(max_length=100, verbose_name='Название')
+    # Хранится только SHA-256 токена: сам токен показывается один раз
+    key_hash = models.CharField(max_length=64, unique=True, editable=False, verbose_name='Хэш токена')
+    prefix = models.CharField(max_length=PREFIX_LENGTH, editable=False, verbose_name='Начало токена')
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='Создан')
+    last_used_at = models.DateTimeField(null=True, blank=True, verbose_name='Последнее использование')
+    
+    class Meta:
+        verbose_name = 'Токен API'
+        verbose_name_plural = 'Токены API'
+        ordering = ['-created_at']
+    
+    def __str__(self):
+        return f'{self.name} ({self.prefix}…)'
+    
+    @staticmethod
+    def hash_key(key):
+        return hashlib.sha256(key.encode('utf-8')).hexdigest()
+    
+    @classmethod
+    def generate(cls, user, name):
+        """
+        Создает токен пользователя
+        
+        Returns:
+            tuple: (токен, ключ) - ключ нужно сразу передать владельцу,
+            в БД он не сохраняется
+        """
+        key = secrets.token_urlsafe(32)
+        token = cls.objects.create(
+            user=user,
+            name=name,
+            key_hash=cls.hash_key(key),
+            prefix=key[:cls.PREFIX_LENGTH],
+        )
+        return token, key
@@ -0,0 +1,11 @@
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from .auth import invalidate_token
+from .models import ApiToken
+
+
+@receiver(post_delete, sender=ApiToken)
+def token_deleted(sender, instance, **kwargs):
+    """Отозванный токен перестает действовать сразу, а не по истечении кэша"""
+    invalidate_token(instance.key_hash)
@@ -0,0 +1,17 @@
+from django.urls import path
+
+from . import views
+
+app_name = 'api'
+
+urlpatterns = [
+    path('projects/', views.project_list, name='project_list'),
+    path('projects/<int:pk>/', views.project_detail, name='project_detail'),
+    path('projects/<int:pk>/sections/', views.section_list, name='section_list'),
+    path('projects/<int:pk>/testcases/', views.testcase_list, name='testcase_list'),
+    path('projects/<int:pk>/members/', views.member_list, name='member_list'),
+    path('testcases/<int:pk>/', views.testcase_detail, name='testcase_detail'),
+    path('runs/<int:pk>/junit/', views.run_junit, name='run_junit'),
+    path('jobs/<int:pk>/', views.job_detail, name='job_detail'),
+    path('status/database/', views.database_status, name='database_status'),
+]
@@ -0,0 +1,189 @@
+import json
+from functools import wraps
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, PermissionDenied
+from django.http import Http404, JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+
+from testcases.pagination import paginate_keyset
+from testcases.permissions import get_project_permissions
+
+from .auth import authenticate_token
+
+
+# Размер страницы списков по умолчанию и максимальный (параметр limit)
+API_PAGE_SIZE = getattr(settings, 'API_PAGE_SIZE', 100)
+API_MAX_PAGE_SIZE = getattr(settings, 'API_MAX_PAGE_SIZE', 500)
+
+
+class ApiError(Exception):
+    """Ошибка запроса, возвращаемая клиенту в виде JSON"""
+
+    def __init__(self, message, status=400, errors=None):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+        self.errors = errors
+
+    def response(self):
+        return api_error(self.message, self.status, errors=self.errors)
+
+
+def api_error(message, status, errors=None):
+    """Ответ с ошибкой: {"error": ..., "errors": [...]}"""
+    data = {'error': message}
+    if errors is not None:
+        data['errors'] = errors
+    return JsonResponse(data, status=status, json_dumps_params={'ensure_ascii': False})
+
+
+def api_response(data, status=200):
+    return JsonResponse(data, status=status, json_dumps_params={'ensure_ascii': False})
+
+
+def api_view(*methods):
+    """
+    Декоратор представлений JSON API
+
+    Проверяет метод запроса и токен из заголовка Authorization, подменяет
+    request.user владельцем токена и превращает ApiError, Http404 и
+    PermissionDenied в JSON-ответы. Сессия и CSRF не используются.
+
+    Args:
+        methods: Разрешенные HTTP-методы
+    """
+    def decorator(view):
+        @csrf_exempt
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in methods:
+                response = api_error('Метод не поддерживается', 405)
+                response['Allow'] = ', '.join(methods)
+                return response
+
+            user = authenticate_token(request)
+            if user is None:
+                response = api_error('Требуется токен API в заголовке "Authorization: Token <ключ>"', 401)
+                response['WWW-Authenticate'] = 'Token'
+                return response
+            if user.is_blocked:
+                return api_error('Ваш аккаунт заблокирован', 403)
+            request.user = user
+            request.project_permissions = get_project_permissions(user)
+
+            try:
+                return view(request, *args, **kwargs)
+            except ApiError as error:
+                return error.response()
+            except Http404:
+                return api_error('Не найдено', 404)
+            except PermissionDenied as error:
+                return api_error(str(error) or 'Доступ запрещен', 403)
+        return wrapper
+    return decorator
+
+
+def read_json(request):
+    """
+    Разбирает тело запроса как JSON
+
+    Raises:
+        ApiError: Если тело не является JSON
+    """
+    try:
+        return json.loads(request.body or b'null')
+    except (ValueError, UnicodeDecodeError):
+        raise ApiError('Тело запроса должно быть JSON')
+
+
+def parse_fields(request, available):
+    """
+    Поля ответа из параметра fields=a,b,c
+
+    Поле id возвращается всегда. Без параметра возвращаются все поля,
+    поэтому большие текстовые колонки клиент отключает явно.
+
+    Args:
+        request: Запрос
+        available: Допустимые поля ресурса
+
+    Returns:
+        list: Поля ответа
+
+    Raises:
+        ApiError: Если запрошено неизвестное поле
+    """
+    raw = request.GET.get('fields', '')
+    if not raw.strip():
+        return list(available)
+    fields = list(dict.fromkeys(name.strip() for name in raw.split(',') if name.strip()))
+    unknown = [name for name in fields if name not in available]
+    if unknown:
+        raise ApiError(
+            f'Неизвестные поля: {", ".join(unknown)}. Доступны: {", ".join(available)}'
+        )
+    if 'id' not in fields:
+        fields.insert(0, 'id')
+    return fields
+
+
+def project_fields(queryset, fields, ordering=()):
+    """
+    Ограничивает выборку колонками запрошенных полей
+
+    Поля сортировки тоже загружаются: по ним строится курсор, и без них
+    каждый объект страницы догружал бы их отдельным запросом. Аннотации
+    выборки загружаются и так.
+    """
+    names = dict.fromkeys([*fields, *(name.lstrip('-') for name in ordering)])
+    return queryset.only(*[name for name in names if name not in queryset.query.annotations])
+
+
+def _attname(model, name):
+    """Атрибут объекта для поля ответа: ID для внешних ключей"""
+    try:
+        return model._meta.get_field(name).attname
+    except FieldDoesNotExist:
+        # Аннотация выборки
+        return name
+
+
+def serialize(obj, fields):
+    """Словарь полей объекта; внешние ключи выдаются как ID"""
+    return {name: getattr(obj, _attname(type(obj), name)) for name in fields}
+
+
+def parse_limit(request):
+    """Размер страницы из параметра limit"""
+    try:
+        limit = int(request.GET.get('limit', API_PAGE_SIZE))
+    except ValueError:
+        raise ApiError('Параметр limit должен быть числом')
+    return max(1, min(limit, API_MAX_PAGE_SIZE))
+
+
+def list_response(request, queryset, ordering, fields):
+    """
+    Страница списка с курсорной пагинацией
+
+    Returns:
+        JsonResponse: {"results": [...], "next_cursor": ..., "next": URL
+        следующей страницы или null}
+    """
+    page = paginate_keyset(
+        project_fields(queryset, fields, ordering),
+        ordering,
+        request.GET.get('cursor'),
+        per_page=parse_limit(request),
+    )
+    next_url = None
+    if page.has_next:
+        params = request.GET.copy()
+        params['cursor'] = page.next_cursor
+        next_url = request.build_absolute_uri(f'{request.path}?{params.urlencode()}')
+    return api_response({
+        'results': [serialize(obj, fields) for obj in page],
+        'next_cursor': page.next_cursor,
+        'next': next_url,
+    })
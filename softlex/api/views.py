@@ -0,0 +1,258 @@
+import os
+import tempfile
+import time
+import uuid
+
+from django.conf import settings
+from django.core.exceptions import PermissionDenied
+from django.core.files.base import File
+from django.core.files.storage import default_storage
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.models import F
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+
+from jobs.models import Job
+from jobs.registry import enqueue
+from testcases.models import Project, ProjectMember, Section, TestCase, TestRun
+from testcases.utils import get_accessible_projects, has_project_access
+
+from .batch import add_members, create_sections, create_test_cases, read_items, update_test_cases
+from .utils import ApiError, api_response, api_view, list_response, parse_fields, serialize
+
+
+# Поля ресурсов, доступные в параметре fields=
+PROJECT_FIELDS = ['id', 'name', 'description', 'created_by', 'created_at', 'updated_at']
+SECTION_FIELDS = ['id', 'name', 'parent', 'path', 'order', 'created_at']
+TESTCASE_FIELDS = [
+    'id', 'title', 'description', 'preconditions', 'steps', 'expected_result',
+    'automation_key', 'section', 'project', 'created_by', 'created_at', 'updated_at',
+]
+MEMBER_FIELDS = ['id', 'user', 'email', 'role', 'added_at', 'added_by']
+
+# Сортировка списков API: по возрастанию ID, чтобы курсор выдерживал
+# добавление новых объектов во время обхода
+API_ORDERING = ('id',)
+
+# Максимальный размер отчета JUnit XML в теле запроса (байты)
+JUNIT_MAX_SIZE = 200 * 1024 * 1024
+
+# Размер блока, которым тело запроса копируется во временный файл (байты)
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+
+def get_project(request, pk, min_role='viewer'):
+    """
+    Возвращает проект, если у пользователя есть в нем нужная роль
+
+    Raises:
+        Http404: Если проект не найден или удален
+        PermissionDenied: Если роли недостаточно
+    """
+    project = get_object_or_404(Project.objects.active(), pk=pk)
+    if not has_project_access(request.user, project, min_role=min_role):
+        raise PermissionDenied('Недостаточно прав в проекте')
+    return project
+
+
+@api_view('GET')
+def project_list(request):
+    """Проекты, доступные владельцу токена"""
+    fields = parse_fields(request, PROJECT_FIELDS)
+    return list_response(request, get_accessible_projects(request.user), API_ORDERING, fields)
+
+
+@api_view('GET')
+def project_detail(request, pk):
+    """Проект со счетчиками"""
+    project = get_project(request, pk)
+    data = serialize(project, parse_fields(request, PROJECT_FIELDS))
+    data['stats'] = {
+        'test_case_count': project.stats.test_case_count,
+        'section_count': project.stats.section_count,
+        'member_count': project.stats.member_count,
+    }
+    return api_response(data)
+
+
+@api_view('GET', 'POST')
+def section_list(request, pk):
+    """
+    Секции проекта
+
+    GET - список в порядке ID; POST {"items": [{"name", "parent", "order"}]} -
+    пакетное создание (нужна роль редактора).
+    """
+    if request.method == 'POST':
+        project = get_project(request, pk, min_role='editor')
+        created = create_sections(project, read_items(request))
+        return api_response({'results': [serialize(section, SECTION_FIELDS) for section in created]}, status=201)
+
+    project = get_project(request, pk)
+    fields = parse_fields(request, SECTION_FIELDS)
+    return list_response(request, Section.objects.filter(project=project), API_ORDERING, fields)
+
+
+@api_view('GET', 'POST', 'PATCH')
+def testcase_list(request, pk):
+    """
+    Тест-кейсы проекта
+
+    GET - список в порядке ID, фильтры section (с поддеревом) и
+    automation_key; POST - пакетное создание; PATCH - пакетное изменение
+    по id. Пакет принимается или отклоняется целиком.
+    """
+    if request.method == 'POST':
+        project = get_project(request, pk, min_role='editor')
+        created = create_test_cases(project, read_items(request), request.user)
+        return api_response({'results': [serialize(test_case, TESTCASE_FIELDS) for test_case in created]}, status=201)
+    if request.method == 'PATCH':
+        project = get_project(request, pk, min_role='editor')
+        updated = update_test_cases(project, read_items(request))
+        return api_response({'results': [serialize(test_case, TESTCASE_FIELDS) for test_case in updated]})
+
+    project = get_project(request, pk)
+    fields = parse_fields(request, TESTCASE_FIELDS)
+    test_cases = TestCase.objects.filter(project=project)
+    if request.GET.get('section'):
+        section = get_object_or_404(Section, project=project, pk=request.GET['section'])
+        test_cases = test_cases.filter(section__path__startswith=section.path)
+    if request.GET.get('automation_key'):
+        test_cases = test_cases.filter(automation_key=request.GET['automation_key'])
+    return list_response(request, test_cases, API_ORDERING, fields)
+
+
+@api_view('GET')
+def testcase_detail(request, pk):
+    """Тест-кейс"""
+    fields = parse_fields(request, TESTCASE_FIELDS)
+    test_case = get_object_or_404(TestCase.objects.only(*fields, 'project'), pk=pk, project__is_deleted=False)
+    if not has_project_access(request.user, test_case.project_id):
+        raise PermissionDenied('Недостаточно прав в проекте')
+    return api_response(serialize(test_case, fields))
+
+
+@api_view('GET', 'POST')
+def member_list(request, pk):
+    """
+    Участники проекта
+
+    GET - список с email пользователей; POST {"items": [{"user_id" или "user_email",
+    "role"}]} - добавление и смена ролей (нужна роль администратора).
+    """
+    if request.method == 'POST':
+        project = get_project(request, pk, min_role='admin')
+        return api_response(add_members(project, read_items(request), request.user))
+
+    project = get_project(request, pk)
+    fields = parse_fields(request, MEMBER_FIELDS)
+    members = ProjectMember.objects.filter(project=project).annotate(email=F('user__email'))
+    return list_response(request, members, API_ORDERING, fields)
+
+
+def read_body(request, max_size):
+    """
+    Копирует тело запроса во временный файл блоками
+
+    request.body ограничен DATA_UPLOAD_MAX_MEMORY_SIZE и держит тело целиком
+    в памяти; здесь в памяти остается не больше FILE_UPLOAD_MAX_MEMORY_SIZE,
+    остальное пишется на диск.
+    """
+    buffer = tempfile.SpooledTemporaryFile(
+        max_size=settings.FILE_UPLOAD_MAX_MEMORY_SIZE, dir=settings.FILE_UPLOAD_TEMP_DIR
+    )
+    try:
+        while chunk := request.read(UPLOAD_CHUNK_SIZE):
+            buffer.write(chunk)
+            if buffer.tell() > max_size:
+                raise ApiError('Размер отчета не должен превышать 200 МБ', 413)
+    except BaseException:
+        buffer.close()
+        raise
+    buffer.seek(0)
+    return File(buffer, name='report.xml')
+
+
+@api_view('POST')
+def run_junit(request, pk):
+    """
+    Загрузка отчета JUnit XML в прогон
+
+    Тело запроса - сам отчет. Отчет обрабатывается фоновой задачей;
+    ответ 202 содержит ID задачи и адрес для опроса ее состояния.
+    Параметр create_missing=1 создает тест-кейсы для неизвестных ключей.
+    """
+    run = get_object_or_404(TestRun, pk=pk, project__is_deleted=False)
+    if not has_project_access(request.user, run.project_id, min_role='editor'):
+        raise PermissionDenied('Недостаточно прав в проекте')
+    if int(request.META.get('CONTENT_LENGTH') or 0) > JUNIT_MAX_SIZE:
+        raise ApiError('Размер отчета не должен превышать 200 МБ', 413)
+
+    with read_body(request, JUNIT_MAX_SIZE) as report, transaction.atomic():
+        if not report.size:
+            raise ApiError('Тело запроса должно содержать отчет JUnit XML')
+        # Отчет обрабатывается фоновой задачей, которая удалит файл по завершении
+        path = default_storage.save(f'imports/{uuid.uuid4().hex}.xml', report)
+        job = enqueue('testcases.import_junit', {
+            'path': path,
+            'run_id': run.pk,
+            'user_id': request.user.pk,
+            'create_missing': request.GET.get('create_missing') in ('1', 'true'),
+        }, user=request.user)
+    return api_response({
+        'job': job.pk,
+        'status': job.status,
+        'url': request.build_absolute_uri(reverse('api:job_detail', args=[job.pk])),
+    }, status=202)
+
+
+@api_view('GET')
+def job_detail(request, pk):
+    """Состояние фоновой задачи, запущенной владельцем токена"""
+    job = get_object_or_404(Job, pk=pk)
+    if job.created_by_id != request.user.pk and not request.user.is_admin:
+        raise PermissionDenied('Нет доступа к этой задаче')
+    return api_response({
+        'id': job.pk,
+        'task': job.task,
+        'status': job.status,
+        'progress': job.progress,
+        'total': job.total,
+        'message': job.message,
+        'result': job.result,
+        'error': job.error,
+    })
+
+
+@api_view('GET')
+def database_status(request):
+    """
+    Подключения к базе данных процесса, обработавшего запрос
+
+    Пул подключений у каждого процесса сервера свой, поэтому ответ
+    содержит pid. По статистике пула и max_connections подбирается число
+    воркеров и размер пула. Доступно системным администраторам.
+    """
+    if not request.user.is_admin:
+        raise PermissionDenied('Доступно только администраторам')
+
+    connection = connections[DEFAULT_DB_ALIAS]
+    started = time.perf_counter()
+    with connection.cursor() as cursor:
+        cursor.execute('SHOW max_connections')
+        max_connections = int(cursor.fetchone()[0])
+        latency = time.perf_counter() - started
+        cursor.execute('SELECT count(*) FROM pg_stat_activity WHERE datname = current_database()')
+        open_connections = cursor.fetchone()[0]
+
+    pool = connection.pool
+    return api_response({
+        'pid': os.getpid(),
+        'mode': settings.DB_CONN_MODE,
+        'conn_max_age': connection.settings_dict['CONN_MAX_AGE'],
+        'latency_ms': round(latency * 1000, 2),
+        'max_connections': max_connections,
+        'connections': open_connections,
+        # pool_size, pool_available, requests_waiting, requests_errors и т.д.
+        'pool': pool.get_stats() if pool is not None else None,
+    })
@@ -0,0 +1,11 @@
+from django.contrib import admin
+
+from .models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'task', 'queue', 'status', 'progress', 'total', 'attempts', 'created_by', 'created_at')
+    list_filter = ('status', 'queue', 'task')
+    search_fields = ('task', 'message')
+    readonly_fields = ('created_at', 'started_at', 'heartbeat_at', 'finished_at')
@@ -0,0 +1,127 @@
+import multiprocessing
+import os
+import signal
+import socket
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from jobs.process import init_process, run_job
+from jobs.registry import get_queue_limits
+from jobs.worker import claim_job, requeue_stale_jobs
+
+
+class Command(BaseCommand):
+    help = 'Запускает пул процессов, выполняющих фоновые задачи из БД'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=getattr(settings, 'JOB_WORKERS', None),
+            help='Количество процессов пула (по умолчанию - сумма лимитов очередей)'
+        )
+        parser.add_argument(
+            '--queue',
+            action='append',
+            dest='queues',
+            metavar='ИМЯ=ЛИМИТ',
+            help='Очередь и число одновременно выполняемых задач; можно указать несколько раз'
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=1.0,
+            help='Пауза между проверками пустых очередей (секунды)'
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Выполнить все готовые задачи и завершиться'
+        )
+
+    def handle(self, *args, **options):
+        limits = self.parse_queues(options['queues']) if options['queues'] else get_queue_limits()
+        workers = options['workers'] or sum(limits.values())
+        if workers < 1:
+            raise CommandError('Количество процессов должно быть больше нуля')
+
+        self.stopping = False
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+        worker_name = f'{socket.gethostname()}:{os.getpid()}'
+        queues = ', '.join(f'{queue}={limit}' for queue, limit in limits.items())
+        self.stdout.write(f'Воркер {worker_name}: процессов {workers}, очереди {queues}')
+
+        # Соединения родителя не должны достаться дочерним процессам
+        connections.close_all()
+        running = {queue: set() for queue in limits}
+        last_stale_check = 0
+
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=init_process,
+        ) as pool:
+            while not self.stopping:
+                for futures in running.values():
+                    futures.difference_update({future for future in futures if future.done()})
+
+                if time.monotonic() - last_stale_check > 60:
+                    requeued = requeue_stale_jobs()
+                    if requeued:
+                        self.stdout.write(f'Возвращено зависших задач: {requeued}')
+                    last_stale_check = time.monotonic()
+
+                claimed = self.fill_slots(pool, running, limits, workers, worker_name)
+                in_flight = set().union(*running.values())
+
+                if options['once'] and not claimed and not in_flight:
+                    break
+                if not claimed:
+                    # Ждем освобождения слота или паузу опроса очередей
+                    if in_flight:
+                        wait(in_flight, timeout=options['poll_interval'], return_when=FIRST_COMPLETED)
+                    else:
+                        time.sleep(options['poll_interval'])
+
+            self.stdout.write('Остановка: ожидание выполняемых задач...')
+
+        self.stdout.write(self.style.SUCCESS('Воркер остановлен'))
+
+    def fill_slots(self, pool, running, limits, workers, worker_name):
+        """Захватывает задачи, пока в очередях есть свободные слоты"""
+        claimed = 0
+        for queue, limit in limits.items():
+            while (
+                not self.stopping
+                and len(running[queue]) < limit
+                and sum(len(futures) for futures in running.values()) < workers
+            ):
+                job = claim_job(queue, worker_name)
+                if job is None:
+                    break
+                running[queue].add(pool.submit(run_job, job.pk))
+                claimed += 1
+        return claimed
+
+    def parse_queues(self, values):
+        """Разбирает значения --queue вида имя=лимит"""
+        limits = {}
+        for value in values:
+            name, _, limit = value.partition('=')
+            try:
+                limits[name] = int(limit or 1)
+            except ValueError:
+                raise CommandError(f'Неверный лимит очереди: {value}')
+            if not name or limits[name] < 1:
+                raise CommandError(f'Неверная очередь: {value}')
+        return limits
+
+    def stop(self, signum, frame):
+        """Прекращает захват новых задач; начатые выполняются до конца"""
+        self.stopping = True
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:09
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Job',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('task', models.CharField(max_length=100, verbose_name='Задача')),
+                ('queue', models.CharField(default='default', max_length=50, verbose_name='Очередь')),
+                ('params', models.JSONField(blank=True, default=dict, verbose_name='Параметры')),
+                ('status', models.CharField(choices=[('pending', 'В очереди'), ('running', 'Выполняется'), ('done', 'Завершена'), ('failed', 'Ошибка')], default='pending', max_length=10, verbose_name='Статус')),
+                ('progress', models.PositiveIntegerField(default=0, verbose_name='Выполнено')),
+                ('total', models.PositiveIntegerField(blank=True, null=True, verbose_name='Всего')),
+                ('message', models.CharField(blank=True, max_length=300, verbose_name='Сообщение')),
+                ('result', models.JSONField(blank=True, null=True, verbose_name='Результат')),
+                ('error', models.TextField(blank=True, verbose_name='Ошибка')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='Попытки')),
+                ('max_attempts', models.PositiveSmallIntegerField(default=1, verbose_name='Максимум попыток')),
+                ('worker', models.CharField(blank=True, max_length=100, verbose_name='Воркер')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Создана')),
+                ('run_after', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Запустить после')),
+                ('started_at', models.DateTimeField(blank=True, null=True, verbose_name='Начата')),
+                ('heartbeat_at', models.DateTimeField(blank=True, null=True, verbose_name='Последняя активность')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Завершена')),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='jobs', to=settings.AUTH_USER_MODEL, verbose_name='Создатель')),
+            ],
+            options={
+                'verbose_name': 'Фоновая задача',
+                'verbose_name_plural': 'Фоновые задачи',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(condition=models.Q(('status', 'pending')), fields=['queue', 'run_after', 'id'], name='job_pending_idx'), models.Index(condition=models.Q(('status', 'running')), fields=['heartbeat_at'], name='job_running_idx'), models.Index(fields=['created_by', '-created_at'], name='job_created_by_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,154 @@
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections, models
+from django.db.models import F, Q
+from django.utils import timezone
+
+
+# Псевдоним отдельного соединения для отчета о прогрессе задачи
+PROGRESS_DB_ALIAS = 'jobs_progress'
+
+
+class Job(models.Model):
+    """Фоновая задача, выполняемая воркерами вне цикла запроса"""
+    
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'В очереди'),
+        (STATUS_RUNNING, 'Выполняется'),
+        (STATUS_DONE, 'Завершена'),
+        (STATUS_FAILED, 'Ошибка'),
+    ]
+    
+    task = models.CharField(max_length=100, verbose_name='Задача')
+    queue = models.CharField(max_length=50, default='default', verbose_name='Очередь')
+    params = models.JSONField(default=dict, blank=True, verbose_name='Параметры')
+    status = models.CharField(
+        max_length=10,
+        choices=STATUS_CHOICES,
+        default=STATUS_PENDING,
+        verbose_name='Статус'
+    )
+    
+    # Прогресс выполнения
+    progress = models.PositiveIntegerField(default=0, verbose_name='Выполнено')
+    total = models.PositiveIntegerField(null=True, blank=True, verbose_name='Всего')
+    message = models.CharField(max_length=300, blank=True, verbose_name='Сообщение')
+    result = models.JSONField(null=True, blank=True, verbose_name='Результат')
+    error = models.TextField(blank=True, verbose_name='Ошибка')
+    
+    # Повторные попытки
+    attempts = models.PositiveSmallIntegerField(default=0, verbose_name='Попытки')
+    max_attempts = models.PositiveSmallIntegerField(default=1, verbose_name='Максимум попыток')
+    
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='jobs',
+        verbose_name='Создатель'
+    )
+    worker = models.CharField(max_length=100, blank=True, verbose_name='Воркер')
+    
+    # Временные метки
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='Создана')
+    run_after = models.DateTimeField(default=timezone.now, verbose_name='Запустить после')
+    started_at = models.DateTimeField(null=True, blank=True, verbose_name='Начата')
+    heartbeat_at = models.DateTimeField(null=True, blank=True, verbose_name='Последняя активность')
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name='Завершена')
+    
+    class Meta:
+        verbose_name = 'Фоновая задача'
+        verbose_name_plural = 'Фоновые задачи'
+        ordering = ['-created_at']
+        indexes = [
+            # Выборка следующей задачи очереди затрагивает только ожидающие
+            models.Index(
+                fields=['queue', 'run_after', 'id'],
+                condition=Q(status='pending'),
+                name='job_pending_idx'
+            ),
+            models.Index(
+                fields=['heartbeat_at'],
+                condition=Q(status='running'),
+                name='job_running_idx'
+            ),
+            models.Index(fields=['created_by', '-created_at'], name='job_created_by_idx'),
+        ]
+    
+    # Псевдоним соединения, открытого progress_connection()
+    _progress_db = None
+    
+    def __str__(self):
+        return f"{self.task} #{self.pk} ({self.get_status_display()})"
+    
+    @property
+    def is_finished(self):
+        return self.status in (self.STATUS_DONE, self.STATUS_FAILED)
+    
+    @property
+    def percent(self):
+        """Процент выполнения или None, если объем работы неизвестен"""
+        if self.status == self.STATUS_DONE:
+            return 100
+        if not self.total:
+            return None
+        return min(100, self.progress * 100 // self.total)
+    
+    def set_progress(self, progress, total=None, message=None):
+        """
+        Сохраняет прогресс выполнения и отметку активности воркера
+        
+        Args:
+            progress: Количество выполненных единиц работы
+            total: Общий объем работы (если изменился)
+            message: Текст для отображения пользователю
+        """
+        updates = {'progress': progress, 'heartbeat_at': timezone.now()}
+        if total is not None:
+            updates['total'] = total
+        if message is not None:
+            updates['message'] = message[:300]
+        self._progress_queryset().update(**updates)
+        for field, value in updates.items():
+            setattr(self, field, value)
+    
+    def add_progress(self, amount, message=None):
+        """Увеличивает прогресс на заданную величину"""
+        updates = {'progress': F('progress') + amount, 'heartbeat_at': timezone.now()}
+        if message is not None:
+            updates['message'] = message[:300]
+        self._progress_queryset().update(**updates)
+        self.progress += amount
+    
+    @contextmanager
+    def progress_connection(self):
+        """
+        Отчет о прогрессе через отдельное соединение с базой
+    
+        Внутри длинной транзакции set_progress и add_progress пишут строку
+        задачи через собственное соединение в режиме autocommit: прогресс
+        и отметка активности видны сразу и не откатываются вместе с
+        транзакцией, а строка задачи не остается заблокированной.
+        """
+        if self._progress_db:
+            yield
+            return
+        connections[PROGRESS_DB_ALIAS] = connections.create_connection(DEFAULT_DB_ALIAS)
+        self._progress_db = PROGRESS_DB_ALIAS
+        try:
+            yield
+        finally:
+            self._progress_db = None
+            connections[PROGRESS_DB_ALIAS].close()
+            del connections[PROGRESS_DB_ALIAS]
+    
+    def _progress_queryset(self):
+        queryset = Job.objects.using(self._progress_db) if self._progress_db else Job.objects
+        return queryset.filter(pk=self.pk)
@@ -0,0 +1,30 @@
+"""
+Точки входа дочерних процессов воркера
+
+Модуль не импортирует модели на верхнем уровне: процессы пула
+запускаются методом spawn и должны сначала инициализировать Django.
+"""
+import signal
+
+
+def init_process():
+    """Инициализирует Django в дочернем процессе пула"""
+    # Ctrl+C получает вся группа процессов; остановкой управляет родитель,
+    # а начатые задачи должны доработать
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    import django
+    django.setup()
+
+
+def run_job(job_id):
+    """Выполняет задачу в дочернем процессе"""
+    from django.db import close_old_connections
+    from .worker import execute_job
+
+    # Процесс живет долго: соединения проверяются, как между запросами
+    close_old_connections()
+    try:
+        return execute_job(job_id)
+    finally:
+        close_old_connections()
@@ -0,0 +1,79 @@
+from django.conf import settings
+
+from .models import Job
+
+
+# Зарегистрированные задачи: имя -> (функция, очередь по умолчанию)
+_tasks = {}
+
+
+class JobFailed(Exception):
+    """
+    Задача не может быть выполнена (например, ее объект уже удален)
+
+    Задача помечается упавшей без повторных попыток, текст ошибки
+    показывается пользователю.
+    """
+
+
+def job_task(name, queue='default', max_attempts=1):
+    """
+    Регистрирует функцию как фоновую задачу
+    
+    Функция вызывается воркером как func(job, **params) и может сообщать
+    прогресс через job.set_progress(). Возвращаемое значение (JSON)
+    сохраняется в job.result.
+    
+    Args:
+        name: Уникальное имя задачи
+        queue: Очередь по умолчанию
+        max_attempts: Сколько раз выполнять задачу при ошибках
+    """
+    def decorator(func):
+        _tasks[name] = (func, queue, max_attempts)
+        return func
+    return decorator
+
+
+def get_task(name):
+    """Возвращает функцию задачи или None, если задача не зарегистрирована"""
+    entry = _tasks.get(name)
+    return entry[0] if entry else None
+
+
+def enqueue(name, params=None, queue=None, user=None, run_after=None):
+    """
+    Ставит задачу в очередь
+    
+    Запись создается в текущей транзакции, поэтому воркер увидит задачу
+    только после ее фиксации.
+    
+    Args:
+        name: Имя зарегистрированной задачи
+        params: Параметры задачи (JSON)
+        queue: Очередь (по умолчанию - очередь задачи)
+        user: Пользователь, запустивший задачу
+        run_after: Не запускать раньше этого времени
+    
+    Returns:
+        Job: Созданная задача
+    """
+    if name not in _tasks:
+        raise ValueError(f'Задача {name} не зарегистрирована')
+    _, default_queue, max_attempts = _tasks[name]
+    job = Job(
+        task=name,
+        queue=queue or default_queue,
+        params=params or {},
+        max_attempts=max_attempts,
+        created_by=user,
+    )
+    if run_after is not None:
+        job.run_after = run_after
+    job.save()
+    return job
+
+
+def get_queue_limits():
+    """Лимиты одновременно выполняемых задач по очередям из настроек"""
+    return dict(getattr(settings, 'JOB_QUEUES', {'default': 1}))
@@ -0,0 +1,30 @@
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required
+from django.core.exceptions import PermissionDenied
+from django.shortcuts import get_object_or_404, redirect, render
+
+from .models import Job
+
+
+def get_user_job(request, pk):
+    """Возвращает задачу, если пользователь ее запустил или является администратором"""
+    job = get_object_or_404(Job, pk=pk)
+    if job.created_by_id != request.user.pk and not request.user.is_admin:
+        raise PermissionDenied("У вас нет доступа к этой задаче")
+    return job
+
+
+@login_required
+def job_detail(request, pk):
+    """Страница с прогрессом фоновой задачи"""
+    # Проверяем права доступа
+    if request.user.is_blocked:
+        messages.error(request, 'Ваш аккаунт заблокирован')
+        return redirect('users:login')
+    
+    job = get_user_job(request, pk)
+    
+    # HTMX опрашивает состояние задачи, пока она не завершится
+    if request.htmx:
+        return render(request, 'jobs/partials/job_progress.html', {'job': job})
+    return render(request, 'jobs/job_detail.html', {'job': job})
@@ -0,0 +1,135 @@
+import logging
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Job
+from .registry import JobFailed, get_task
+
+logger = logging.getLogger(__name__)
+
+
+# Задача без отметки активности дольше этого времени считается зависшей
+JOB_STALE_TIMEOUT = getattr(settings, 'JOB_STALE_TIMEOUT', 10 * 60)
+
+# Пауза перед повторной попыткой упавшей задачи (секунды, растет с попытками)
+JOB_RETRY_DELAY = 30
+
+
+def claim_job(queue, worker_name=''):
+    """
+    Забирает следующую готовую задачу очереди
+
+    Строка блокируется через SELECT ... FOR UPDATE SKIP LOCKED: параллельные
+    воркеры пропускают уже захваченные задачи и не ждут друг друга.
+
+    Args:
+        queue: Имя очереди
+        worker_name: Имя воркера для отображения в задаче
+
+    Returns:
+        Job: Захваченная задача в статусе running или None
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        job = (
+            Job.objects
+            .select_for_update(skip_locked=True)
+            .filter(status=Job.STATUS_PENDING, queue=queue, run_after__lte=now)
+            .order_by('run_after', 'id')
+            .first()
+        )
+        if job is None:
+            return None
+        job.status = Job.STATUS_RUNNING
+        job.attempts = F('attempts') + 1
+        job.worker = worker_name[:100]
+        job.started_at = now
+        job.heartbeat_at = now
+        job.save(update_fields=['status', 'attempts', 'worker', 'started_at', 'heartbeat_at'])
+    job.refresh_from_db(fields=['attempts'])
+    return job
+
+
+def execute_job(job_id):
+    """
+    Выполняет захваченную задачу и сохраняет результат
+
+    Args:
+        job_id: ID задачи в статусе running
+
+    Returns:
+        str: Итоговый статус задачи
+    """
+    job = Job.objects.get(pk=job_id)
+    func = get_task(job.task)
+    try:
+        if func is None:
+            raise LookupError(f'Задача {job.task} не зарегистрирована')
+        result = func(job, **job.params)
+    except JobFailed as error:
+        # Повтор не поможет: задача завершается с понятным сообщением
+        logger.warning('Job %s (%s) failed: %s', job.pk, job.task, error)
+        Job.objects.filter(pk=job.pk).update(
+            status=Job.STATUS_FAILED,
+            message=str(error)[:300],
+            error=str(error),
+            finished_at=timezone.now(),
+        )
+        return Job.STATUS_FAILED
+    except Exception:
+        logger.exception('Job %s (%s) failed', job.pk, job.task)
+        return _fail(job, traceback.format_exc())
+
+    Job.objects.filter(pk=job.pk).update(
+        status=Job.STATUS_DONE,
+        result=result,
+        finished_at=timezone.now(),
+        heartbeat_at=timezone.now(),
+    )
+    return Job.STATUS_DONE
+
+
+def _fail(job, error):
+    """Возвращает задачу в очередь или помечает ее упавшей"""
+    if job.attempts < job.max_attempts:
+        Job.objects.filter(pk=job.pk).update(
+            status=Job.STATUS_PENDING,
+            error=error,
+            run_after=timezone.now() + timedelta(seconds=JOB_RETRY_DELAY * job.attempts),
+        )
+        return Job.STATUS_PENDING
+
+    Job.objects.filter(pk=job.pk).update(
+        status=Job.STATUS_FAILED,
+        error=error,
+        finished_at=timezone.now(),
+    )
+    return Job.STATUS_FAILED
+
+
+def requeue_stale_jobs(timeout=JOB_STALE_TIMEOUT):
+    """
+    Возвращает в очередь задачи, воркер которых перестал отвечать
+
+    Задачи, исчерпавшие попытки, помечаются упавшими.
+
+    Returns:
+        int: Количество обработанных задач
+    """
+    stale = Job.objects.filter(
+        status=Job.STATUS_RUNNING,
+        heartbeat_at__lt=timezone.now() - timedelta(seconds=timeout)
+    )
+    error = 'Воркер перестал отвечать во время выполнения задачи'
+    requeued = stale.filter(attempts__lt=F('max_attempts')).update(
+        status=Job.STATUS_PENDING, error=error
+    )
+    failed = stale.update(
+        status=Job.STATUS_FAILED, error=error, finished_at=timezone.now()
+    )
+    return requeued + failed
@@ -0,0 +1,195 @@
+"""
+Замеры запросов: число SQL-запросов, время SQL, шаблонов и представления
+
+RequestInstrumentationMiddleware собирает метрики каждого запроса,
+отдает их в заголовке Server-Timing (видно во вкладке Network браузера),
+пишет строку лога в формате JSON в логгер softlex.requests и помечает
+запросы, превысившие бюджет. Бюджет запросов к базе объявляется у
+представления декоратором query_budget, иначе действует
+REQUEST_QUERY_BUDGET.
+"""
+import json
+import logging
+import time
+from contextlib import ExitStack
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+from django.dispatch import Signal
+from django.template.backends.django import DjangoTemplates, Template
+
+logger = logging.getLogger('softlex.requests')
+
+# Бюджеты по умолчанию: число SQL-запросов и время обработки (мс)
+REQUEST_QUERY_BUDGET = getattr(settings, 'REQUEST_QUERY_BUDGET', 50)
+REQUEST_TIME_BUDGET_MS = getattr(settings, 'REQUEST_TIME_BUDGET_MS', 500)
+SERVER_TIMING = getattr(settings, 'SERVER_TIMING', True)
+
+# Отправляется после каждого замеренного запроса: request, metrics
+request_measured = Signal()
+
+_current_metrics = ContextVar('request_metrics', default=None)
+
+
+def query_budget(limit):
+    """
+    Объявляет максимальное число SQL-запросов представления
+
+    Превышение помечается в логе, а в тестах проваливает тест
+    (фикстура query_budgets). Декоратор ставится над login_required.
+
+    Args:
+        limit: Допустимое число запросов
+    """
+    def decorator(view):
+        view.query_budget = limit
+        return view
+    return decorator
+
+
+class RequestMetrics:
+    """Метрики одного HTTP-запроса; время - в секундах"""
+
+    def __init__(self):
+        self.view = None
+        # Бюджет, объявленный у представления (query_budget), или None
+        self.query_budget = None
+        self.queries = 0
+        self.sql_time = 0.0
+        self.template_time = 0.0
+        self.view_time = 0.0
+        self.total_time = 0.0
+        self._view_started = None
+        self._template_depth = 0
+
+    def execute(self, execute, sql, params, many, context):
+        """Обертка выполнения SQL (connection.execute_wrapper)"""
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_time += time.perf_counter() - started
+            self.queries += 1
+
+    def over_budget(self):
+        """Превышенные бюджеты: 'queries' и/или 'time'"""
+        exceeded = []
+        budget = REQUEST_QUERY_BUDGET if self.query_budget is None else self.query_budget
+        if self.queries > budget:
+            exceeded.append('queries')
+        if self.total_time * 1000 > REQUEST_TIME_BUDGET_MS:
+            exceeded.append('time')
+        return exceeded
+
+    def server_timing(self):
+        """Значение заголовка Server-Timing"""
+        return ', '.join([
+            f'sql;dur={self.sql_time * 1000:.1f};desc="{self.queries} queries"',
+            f'tpl;dur={self.template_time * 1000:.1f}',
+            f'view;dur={self.view_time * 1000:.1f}',
+            f'total;dur={self.total_time * 1000:.1f}',
+        ])
+
+    def as_dict(self):
+        return {
+            'view': self.view,
+            'queries': self.queries,
+            'query_budget': self.query_budget,
+            'sql_ms': round(self.sql_time * 1000, 1),
+            'template_ms': round(self.template_time * 1000, 1),
+            'view_ms': round(self.view_time * 1000, 1),
+            'total_ms': round(self.total_time * 1000, 1),
+        }
+
+
+class TimedTemplate(Template):
+    """Шаблон, время отрисовки которого учитывается в метриках запроса"""
+
+    def render(self, context=None, request=None):
+        metrics = _current_metrics.get()
+        if metrics is None:
+            return super().render(context, request)
+        # Вложенная отрисовка (render_to_string внутри тега) уже учтена
+        metrics._template_depth += 1
+        started = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            metrics._template_depth -= 1
+            if not metrics._template_depth:
+                metrics.template_time += time.perf_counter() - started
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """
+    Бэкенд шаблонов Django с замером времени отрисовки
+
+    Время шаблона включает SQL-запросы, выполненные при его отрисовке
+    (ленивые выборки), они же учтены во времени SQL.
+    """
+
+    def from_string(self, template_code):
+        return TimedTemplate(super().from_string(template_code).template, self)
+
+    def get_template(self, template_name):
+        return TimedTemplate(super().get_template(template_name).template, self)
+
+
+class RequestInstrumentationMiddleware:
+    """
+    Замеряет запрос и отдает метрики в Server-Timing и лог
+
+    Время SQL считается оберткой выполнения запросов всех подключений,
+    время представления - от вызова представления до возврата ответа.
+    Запросы потоковых ответов, выполняемые после возврата, не учитываются.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        metrics = RequestMetrics()
+        token = _current_metrics.set(metrics)
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(metrics.execute))
+                response = self.get_response(request)
+        finally:
+            _current_metrics.reset(token)
+        finished = time.perf_counter()
+        metrics.total_time = finished - started
+        if metrics._view_started is not None:
+            metrics.view_time = finished - metrics._view_started
+
+        if SERVER_TIMING:
+            response['Server-Timing'] = metrics.server_timing()
+        self.log(request, response, metrics)
+        request_measured.send(sender=self.__class__, request=request, metrics=metrics)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        metrics = _current_metrics.get()
+        if metrics is None:
+            return None
+        metrics.view = f'{view_func.__module__}.{view_func.__name__}'
+        metrics.query_budget = getattr(view_func, 'query_budget', None)
+        metrics._view_started = time.perf_counter()
+        return None
+
+    def log(self, request, response, metrics):
+        """Строка лога в формате JSON; превышение бюджета - с уровнем WARNING"""
+        over_budget = metrics.over_budget()
+        record = {
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            **metrics.as_dict(),
+            'over_budget': over_budget,
+        }
+        logger.log(
+            logging.WARNING if over_budget else logging.INFO,
+            json.dumps(record, ensure_ascii=False)
+        )
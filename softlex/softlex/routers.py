@@ -0,0 +1,123 @@
+"""
+Маршрутизация чтения на реплику PostgreSQL
+
+Подключается настройкой POSTGRES_REPLICA_HOST (см. settings.py): чтения
+GET/HEAD-запросов уходят на реплику (алиас replica), запись и все
+остальное - на основную базу. После записи сессия на
+REPLICA_PIN_SECONDS закрепляется за основной базой, чтобы пользователь
+сразу видел сохраненные данные, даже если реплика отстает.
+"""
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.http import FileResponse
+
+
+REPLICA_DB_ALIAS = 'replica'
+
+# Cookie закрепления за основной базой и его срок: должен превышать
+# типичное отставание реплики
+REPLICA_PIN_COOKIE = 'db_primary'
+REPLICA_PIN_SECONDS = getattr(settings, 'REPLICA_PIN_SECONDS', 10)
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+class RoutingState:
+    """Маршрутизация текущего запроса: можно ли читать с реплики и была ли запись"""
+
+    def __init__(self, use_replica=False):
+        self.use_replica = use_replica
+        self.wrote = False
+
+
+# Состояние хранится в contextvar: у каждого потока и каждой задачи
+# asyncio оно свое. Вне HTTP-запроса (воркеры, команды) состояния нет и
+# все запросы идут в основную базу.
+_routing_state = ContextVar('db_routing_state', default=None)
+
+
+def _iterate_with_state(iterator, state):
+    """Итерирует потоковый ответ с маршрутизацией исходного запроса"""
+    iterator = iter(iterator)
+    while True:
+        token = _routing_state.set(state)
+        try:
+            chunk = next(iterator)
+        except StopIteration:
+            return
+        finally:
+            _routing_state.reset(token)
+        yield chunk
+
+
+class ReplicaRouter:
+    """
+    Роутер: чтение - на реплику, если текущий запрос это разрешает
+
+    Чтение остается на основной базе внутри транзакции и после первой
+    записи в запросе. Запись всегда идет в основную базу, даже для
+    объектов, прочитанных с реплики.
+    """
+
+    def db_for_read(self, model, **hints):
+        state = _routing_state.get()
+        if state is None or not state.use_replica:
+            return DEFAULT_DB_ALIAS
+        # Транзакция должна видеть собственные изменения
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return REPLICA_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        state = _routing_state.get()
+        if state is not None:
+            state.use_replica = False
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Реплика содержит те же данные, что и основная база
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Схема на реплику приходит репликацией
+        return db != REPLICA_DB_ALIAS
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Разрешает чтение с реплики безопасным запросам незакрепленной сессии
+
+    Запрос с другим методом или с записью в базу выставляет cookie,
+    закрепляющий следующие запросы за основной базой. Middleware стоит
+    перед SessionMiddleware, чтобы сохранение сессии тоже считалось записью.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        state = RoutingState(
+            use_replica=request.method in SAFE_METHODS and REPLICA_PIN_COOKIE not in request.COOKIES
+        )
+        token = _routing_state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _routing_state.reset(token)
+        if response.streaming and not response.is_async and not isinstance(response, FileResponse):
+            # Потоковый ответ (выгрузка отчета) читает данные уже после
+            # выхода из middleware - с той же маршрутизацией
+            response.streaming_content = _iterate_with_state(response.streaming_content, state)
+
+        if state.wrote or request.method not in SAFE_METHODS:
+            response.set_cookie(
+                REPLICA_PIN_COOKIE, '1',
+                max_age=REPLICA_PIN_SECONDS,
+                httponly=True,
+                samesite='Lax',
+                secure=request.is_secure(),
+            )
+        return response
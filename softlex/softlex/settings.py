@@ -13,6 +13,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 import os
 from pathlib import Path
 import environ
+from django.core.exceptions import ImproperlyConfigured
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -46,18 +47,26 @@ INSTALLED_APPS = [
     'django.contrib.contenttypes',
     'django.contrib.sessions',
     'django.contrib.messages',
+    # Статика в runserver раздается WhiteNoise, как и в production
+    'whitenoise.runserver_nostatic',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'django_htmx',
     'users',
     'testcases',
+    'jobs',
+    'api',
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'softlex.instrumentation.RequestInstrumentationMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'testcases.middleware.ProjectPermissionMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'django_htmx.middleware.HtmxMiddleware',
@@ -67,7 +76,8 @@ ROOT_URLCONF = 'softlex.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        # DjangoTemplates с замером времени отрисовки для Server-Timing
+        'BACKEND': 'softlex.instrumentation.TimedDjangoTemplates',
         'DIRS': [BASE_DIR / 'templates'],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -95,7 +105,120 @@ DATABASES = {
         'PASSWORD': env('POSTGRES_PASSWORD', default='password'),
         'HOST': env('POSTGRES_HOST', default='db'),
         'PORT': env('POSTGRES_PORT', default='5432'),
+        'OPTIONS': {
+            'connect_timeout': env.int('DB_CONNECT_TIMEOUT', default=5),
+        },
+    }
+}
+
+# Режим подключений к PostgreSQL (DB_CONN_MODE):
+#   none       - новое подключение на каждый запрос
+#   persistent - подключение потока переиспользуется DB_CONN_MAX_AGE секунд
+#                и проверяется перед первым запросом очередного HTTP-запроса
+#   pool       - пул подключений psycopg 3 в каждом процессе; всего к базе
+#                открывается до WEB_WORKERS x DB_POOL_MAX_SIZE подключений
+#                (плюс воркеры фоновых задач), что должно укладываться
+#                в max_connections PostgreSQL
+DB_CONN_MODE = env('DB_CONN_MODE', default='persistent')
+if DB_CONN_MODE == 'persistent':
+    DATABASES['default']['CONN_MAX_AGE'] = env.int('DB_CONN_MAX_AGE', default=60)
+    DATABASES['default']['CONN_HEALTH_CHECKS'] = True
+elif DB_CONN_MODE == 'pool':
+    # Подключение проверяется при выдаче из пула
+    DATABASES['default']['CONN_HEALTH_CHECKS'] = True
+    DATABASES['default']['OPTIONS']['pool'] = {
+        'min_size': env.int('DB_POOL_MIN_SIZE', default=2),
+        'max_size': env.int('DB_POOL_MAX_SIZE', default=10),
+        # Сколько запрос ждет свободное подключение, прежде чем упасть с ошибкой
+        'timeout': env.float('DB_POOL_TIMEOUT', default=10),
+        'max_lifetime': env.float('DB_POOL_MAX_LIFETIME', default=60 * 60),
+        'max_idle': env.float('DB_POOL_MAX_IDLE', default=10 * 60),
+    }
+elif DB_CONN_MODE != 'none':
+    raise ImproperlyConfigured(f'DB_CONN_MODE должен быть none, persistent или pool, получено: {DB_CONN_MODE}')
+
+# Реплика для чтения (необязательно). Чтения GET-запросов уходят на нее,
+# запись - в основную базу; после записи сессия на REPLICA_PIN_SECONDS
+# закрепляется за основной базой (softlex/routers.py). Для проверки
+# локально репликой может служить тот же сервер: POSTGRES_REPLICA_HOST=db.
+REPLICA_PIN_SECONDS = env.int('REPLICA_PIN_SECONDS', default=10)
+if env('POSTGRES_REPLICA_HOST', default=''):
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'NAME': env('POSTGRES_REPLICA_DB', default=DATABASES['default']['NAME']),
+        'HOST': env('POSTGRES_REPLICA_HOST'),
+        'PORT': env('POSTGRES_REPLICA_PORT', default=DATABASES['default']['PORT']),
+        'OPTIONS': dict(DATABASES['default']['OPTIONS']),
+        # В тестах реплика - та же тестовая база
+        'TEST': {'MIRROR': 'default'},
     }
+    DATABASE_ROUTERS = ['softlex.routers.ReplicaRouter']
+    # Перед SessionMiddleware: сохранение сессии тоже запись
+    MIDDLEWARE.insert(
+        MIDDLEWARE.index('django.contrib.sessions.middleware.SessionMiddleware'),
+        'softlex.routers.ReplicaRoutingMiddleware'
+    )
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+# По умолчанию локальный кэш процесса; для нескольких процессов
+# укажите общий кэш, например CACHE_URL=redis://redis:6379/1
+CACHES = {
+    'default': env.cache('CACHE_URL', default='locmemcache://'),
+}
+
+# Версия выкладки (например, хэш коммита): входит в ETag страниц и ключи
+# кэша карточек, чтобы после обновления шаблонов не отдавать старую разметку
+RELEASE_VERSION = env('RELEASE_VERSION', default='')
+
+# Время жизни отрисованных карточек проектов и тест-кейсов в списках
+CARD_CACHE_TIMEOUT = env.int('CARD_CACHE_TIMEOUT', default=24 * 60 * 60)
+
+# Время жизни закэшированной карты ролей пользователя в проектах
+PROJECT_ROLES_CACHE_TIMEOUT = env.int('PROJECT_ROLES_CACHE_TIMEOUT', default=60 * 60)
+
+# Фоновые задачи (manage.py run_workers)
+# Лимиты одновременно выполняемых задач по очередям, например JOB_QUEUES=default=2,imports=1
+JOB_QUEUES = {
+    name: int(limit)
+    for name, limit in env.dict('JOB_QUEUES', default={'default': '2', 'imports': '1'}).items()
+}
+JOB_WORKERS = env.int('JOB_WORKERS', default=None)
+JOB_STALE_TIMEOUT = env.int('JOB_STALE_TIMEOUT', default=10 * 60)
+
+# JSON API (/api/v1/)
+# Время жизни закэшированного соответствия токена пользователю (только при
+# общем кэше CACHE_URL: с локальным кэшем токен проверяется на каждый запрос)
+API_TOKEN_CACHE_TIMEOUT = env.int('API_TOKEN_CACHE_TIMEOUT', default=5 * 60)
+# Максимальное количество элементов в одном пакетном запросе
+API_BATCH_LIMIT = env.int('API_BATCH_LIMIT', default=500)
+
+
+# Замеры запросов (softlex/instrumentation.py): заголовок Server-Timing и
+# строки лога softlex.requests в JSON. Запрос, превысивший бюджет SQL-запросов
+# (по умолчанию или объявленный у представления) или времени, логируется
+# с уровнем WARNING.
+SERVER_TIMING = env.bool('SERVER_TIMING', default=True)
+REQUEST_QUERY_BUDGET = env.int('REQUEST_QUERY_BUDGET', default=50)
+REQUEST_TIME_BUDGET_MS = env.int('REQUEST_TIME_BUDGET_MS', default=500)
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'softlex.requests': {
+            'handlers': ['console'],
+            'level': env('REQUEST_LOG_LEVEL', default='INFO'),
+            'propagate': False,
+        },
+    },
 }
 
 
@@ -135,10 +258,23 @@ USE_TZ = True
 
 STATIC_URL = 'static/'
 STATICFILES_DIRS = [
-    BASE_DIR / 'static',
+    BASE_DIR.parent / 'static',
 ]
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 
+# collectstatic записывает файлы с хэшем содержимого в имени (манифест
+# staticfiles.json) и рядом сжатые копии .gz и .br. WhiteNoise отдает их
+# приложением: файлы с хэшем - с Cache-Control immutable на год и более,
+# сжатую копию - по Accept-Encoding клиента.
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'whitenoise.storage.CompressedManifestStaticFilesStorage',
+    },
+}
+
 # Media files
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
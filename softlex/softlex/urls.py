@@ -23,10 +23,11 @@ from django.conf.urls.static import static
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('user/', include('users.urls')),
+    path('jobs/', include('jobs.urls')),
+    path('api/v1/', include('api.urls')),
     path('', include('testcases.urls')),
 ]
 
-# Подключение статических файлов в режиме разработки
+# Подключение медиафайлов в режиме разработки; статику раздает WhiteNoise
 if settings.DEBUG:
-    urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
     urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
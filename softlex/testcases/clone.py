@@ -0,0 +1,142 @@
+from django.db import connection, transaction
+
+from .models import Project, ProjectMember, Section, TestCase
+from .permissions import invalidate_project_roles
+from .stats import adjust_project_stats
+
+
+# Временная таблица соответствия старых и новых ID секций
+SECTION_MAP_TABLE = 'clone_section_map'
+
+
+def _copied_columns(model, exclude):
+    """Колонки модели, значения которых копируются как есть"""
+    return [
+        field.column
+        for field in model._meta.concrete_fields
+        if not field.primary_key
+        and not getattr(field, 'generated', False)
+        and field.name not in exclude
+    ]
+
+
+def _columns_sql(columns, alias=None):
+    quote = connection.ops.quote_name
+    prefix = f'{alias}.' if alias else ''
+    return ', '.join(prefix + quote(column) for column in columns)
+
+
+def _copy_sections(cursor, source_id, project_id):
+    """
+    Копирует дерево секций
+
+    Новые ID выделяются заранее из последовательности таблицы, поэтому
+    ссылки на родителей и материализованные пути пересобираются в том
+    же INSERT ... SELECT через таблицу соответствия.
+    """
+    table = connection.ops.quote_name(Section._meta.db_table)
+    columns = _copied_columns(Section, exclude={'project', 'parent', 'path', 'created_at'})
+    cursor.execute(
+        f'CREATE TEMP TABLE {SECTION_MAP_TABLE} ON COMMIT DROP AS '
+        f'SELECT id AS old_id, nextval(pg_get_serial_sequence(%s, %s)) AS new_id '
+        f'FROM {table} WHERE project_id = %s',
+        [Section._meta.db_table, 'id', source_id]
+    )
+    cursor.execute(
+        f'''
+        INSERT INTO {table} (id, project_id, parent_id, path, created_at, {_columns_sql(columns)})
+        SELECT
+            map.new_id,
+            %s,
+            parent_map.new_id,
+            COALESCE((
+                SELECT string_agg(path_map.new_id::text || %s, '' ORDER BY part.depth)
+                FROM unnest(string_to_array(rtrim(section.path, %s), %s))
+                    WITH ORDINALITY AS part (id, depth)
+                JOIN {SECTION_MAP_TABLE} path_map ON path_map.old_id = part.id::bigint
+            ), ''),
+            now(),
+            {_columns_sql(columns, 'section')}
+        FROM {table} section
+        JOIN {SECTION_MAP_TABLE} map ON map.old_id = section.id
+        LEFT JOIN {SECTION_MAP_TABLE} parent_map ON parent_map.old_id = section.parent_id
+        ''',
+        [project_id] + [Section.PATH_SEPARATOR] * 3
+    )
+    return cursor.rowcount
+
+
+def _copy_test_cases(cursor, source_id, project_id):
+    """Копирует тест-кейсы, переназначая секции по таблице соответствия"""
+    table = connection.ops.quote_name(TestCase._meta.db_table)
+    columns = _copied_columns(TestCase, exclude={'project', 'section', 'created_at', 'updated_at'})
+    cursor.execute(
+        f'''
+        INSERT INTO {table} (project_id, section_id, created_at, updated_at, {_columns_sql(columns)})
+        SELECT %s, map.new_id, now(), now(), {_columns_sql(columns, 'test_case')}
+        FROM {table} test_case
+        LEFT JOIN {SECTION_MAP_TABLE} map ON map.old_id = test_case.section_id
+        WHERE test_case.project_id = %s
+        ''',
+        [project_id, source_id]
+    )
+    return cursor.rowcount
+
+
+def _copy_members(cursor, source_id, project_id, added_by_id):
+    """Копирует участников (кроме уже добавленного создателя копии)"""
+    table = connection.ops.quote_name(ProjectMember._meta.db_table)
+    cursor.execute(
+        f'''
+        INSERT INTO {table} (project_id, user_id, role, added_at, added_by_id)
+        SELECT %s, user_id, role, now(), %s
+        FROM {table}
+        WHERE project_id = %s
+        ON CONFLICT (project_id, user_id) DO NOTHING
+        RETURNING user_id
+        ''',
+        [project_id, added_by_id, source_id]
+    )
+    return [user_id for user_id, in cursor.fetchall()]
+
+
+def clone_project(source, name, user, include_members=False):
+    """
+    Создает копию проекта с деревом секций и тест-кейсами
+
+    Данные копируются на стороне PostgreSQL запросами INSERT ... SELECT
+    в одной транзакции, без загрузки объектов в Python. Массовая вставка
+    не вызывает сигналы, поэтому счетчики и кэш ролей обновляются явно.
+
+    Args:
+        source: Копируемый проект
+        name: Название нового проекта
+        user: Создатель копии (становится ее администратором)
+        include_members: Скопировать участников исходного проекта
+
+    Returns:
+        tuple: (новый проект, {'sections': ..., 'test_cases': ..., 'members': ...})
+    """
+    with transaction.atomic():
+        project = Project.objects.create(
+            name=name,
+            description=source.description,
+            created_by=user,
+        )
+        ProjectMember.objects.create(project=project, user=user, role='admin', added_by=user)
+
+        with connection.cursor() as cursor:
+            sections = _copy_sections(cursor, source.pk, project.pk)
+            test_cases = _copy_test_cases(cursor, source.pk, project.pk)
+            members = _copy_members(cursor, source.pk, project.pk, user.pk) if include_members else []
+            cursor.execute(f'DROP TABLE {SECTION_MAP_TABLE}')
+
+        adjust_project_stats(
+            project.pk,
+            section_count=sections,
+            test_case_count=test_cases,
+            member_count=len(members),
+        )
+        invalidate_project_roles(members)
+
+    return project, {'sections': sections, 'test_cases': test_cases, 'members': len(members)}
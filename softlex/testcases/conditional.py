@@ -0,0 +1,79 @@
+import hashlib
+
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+
+
+# Версия выкладки: входит в ETag, чтобы после обновления шаблонов браузер
+# не получил 304 на разметку, отрисованную прежней версией
+RELEASE_VERSION = getattr(settings, 'RELEASE_VERSION', '')
+
+# Заголовки HTMX, от которых зависит, страница или фрагмент будет в ответе
+HTMX_VARY_HEADERS = ('HX-Request', 'HX-Target')
+
+
+class PageValidators:
+    """
+    Валидаторы условного GET для страницы
+
+    ETag строится из версий данных страницы (updated_at объектов и счетчиков)
+    и того, что зависит от зрителя: пользователя, его роли в проекте,
+    CSRF-секрета в формах и вида ответа (страница или HTMX-фрагмент).
+    Last-Modified - самая поздняя из дат изменения данных; роль в нее не
+    входит, поэтому клиенты с ETag проверяются по нему (If-None-Match
+    имеет приоритет над If-Modified-Since).
+
+    Страница с непоказанными flash-сообщениями всегда отрисовывается
+    заново и не получает валидаторов, иначе сообщение осталось бы в кэше
+    браузера.
+    """
+
+    def __init__(self, request, timestamps, *parts):
+        """
+        Args:
+            request: HTTP-запрос
+            timestamps: Даты изменения данных страницы (None пропускаются)
+            parts: Прочие значения, от которых зависит разметка (роль и т.п.)
+        """
+        self.request = request
+        timestamps = [value for value in timestamps if value is not None]
+        self.last_modified = int(max(timestamps).timestamp()) if timestamps else None
+        key = [
+            RELEASE_VERSION,
+            request.user.pk,
+            request.META.get('CSRF_COOKIE', ''),
+            *(request.headers.get(header, '') for header in HTMX_VARY_HEADERS),
+            *(value.isoformat() for value in timestamps),
+            *parts,
+        ]
+        self.etag = 'W/"%s"' % hashlib.sha256(repr(key).encode()).hexdigest()[:32]
+        # Хранилище сообщений загружается без пометки о прочтении
+        self.enabled = request.method in ('GET', 'HEAD') and not len(get_messages(request))
+
+    def not_modified(self):
+        """
+        Ответ 304, если у клиента актуальная версия страницы
+
+        Вызывается до тяжелых запросов и отрисовки шаблона.
+
+        Returns:
+            HttpResponse или None, если страницу нужно отрисовать
+        """
+        if not self.enabled:
+            return None
+        return get_conditional_response(self.request, etag=self.etag, last_modified=self.last_modified)
+
+    def apply(self, response):
+        """Проставляет валидаторы в ответ и требует перепроверки кэша браузера"""
+        patch_vary_headers(response, HTMX_VARY_HEADERS)
+        if not self.enabled or response.status_code != 200:
+            return response
+        response.headers['ETag'] = self.etag
+        if self.last_modified is not None:
+            response.headers['Last-Modified'] = http_date(self.last_modified)
+        # private: страница зависит от пользователя; no-cache: браузер
+        # хранит ее, но перед показом спрашивает сервер
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
@@ -1,7 +1,9 @@
 from django import forms
 from django.contrib.auth import get_user_model
+from django.db import transaction
 import json
-from .models import Project, TestCase, ProjectMember
+from .models import Project, ProjectMember, Section, TestCase, TestResult, TestRun
+from .members import MEMBER_ROLES, parse_member_list, sync_project_members
 from .utils import get_accessible_projects
 
 User = get_user_model()
@@ -91,8 +93,10 @@ class ProjectForm(forms.ModelForm):
         if self.user:
             project.created_by = self.user
         if commit:
-            project.save()
-            self.save_members(project)
+            # Проект, участники и счетчики статистики сохраняются атомарно
+            with transaction.atomic():
+                project.save()
+                self.save_members(project)
         return project
     
     def save_members(self, project):
@@ -114,46 +118,69 @@ class ProjectForm(forms.ModelForm):
         except (json.JSONDecodeError, TypeError):
             members = []
         
-        # Получаем текущих участников (кроме создателя)
-        current_members = ProjectMember.objects.filter(project=project).exclude(user=project.created_by)
-        current_member_ids = set(current_members.values_list('user_id', flat=True))
-        
-        # Получаем ID пользователей из формы
-        form_member_ids = set()
-        for member in members:
-            if member.get('user_id'):
-                form_member_ids.add(int(member['user_id']))
-        
-        # Удаляем участников, которых нет в форме
-        members_to_remove = current_member_ids - form_member_ids
-        ProjectMember.objects.filter(
-            project=project,
-            user_id__in=members_to_remove
-        ).delete()
+        # Синхронизируем состав одним upsert и одним удалением
+        return sync_project_members(project, members, added_by=self.user)
+
+
+class BulkMembersForm(forms.Form):
+    """Форма массового добавления участников из CSV или списка"""
+    
+    # Максимальный размер загружаемого CSV файла (байты)
+    MAX_FILE_SIZE = 1024 * 1024
+    
+    members_text = forms.CharField(
+        label='Список участников',
+        required=False,
+        widget=forms.Textarea(attrs={
+            'class': 'form-control',
+            'rows': 8,
+            'placeholder': 'user1@example.com\nuser2@example.com;editor'
+        }),
+        help_text='Email через запятую, точку с запятой или с новой строки. '
+                  'Роль можно указать в той же строке.'
+    )
+    members_file = forms.FileField(
+        label='CSV файл',
+        required=False,
+        widget=forms.ClearableFileInput(attrs={
+            'class': 'form-control',
+            'accept': '.csv,.txt'
+        })
+    )
+    role = forms.ChoiceField(
+        label='Роль по умолчанию',
+        choices=list(MEMBER_ROLES.items()),
+        initial='viewer',
+        widget=forms.Select(attrs={'class': 'form-select'})
+    )
+    
+    def clean_members_file(self):
+        members_file = self.cleaned_data.get('members_file')
+        if members_file and members_file.size > self.MAX_FILE_SIZE:
+            raise forms.ValidationError('Размер файла не должен превышать 1 МБ')
+        return members_file
+    
+    def clean(self):
+        cleaned_data = super().clean()
+        text = cleaned_data.get('members_text') or ''
+        members_file = cleaned_data.get('members_file')
+        if members_file:
+            try:
+                text += '\n' + members_file.read().decode('utf-8-sig')
+            except UnicodeDecodeError:
+                raise forms.ValidationError('Файл должен быть в кодировке UTF-8')
         
-        # Добавляем или обновляем участников из формы
-        for member_data in members:
-            user_id = member_data.get('user_id')
-            user_email = member_data.get('user_email')
-            role = member_data.get('role', 'viewer')
-            
-            # Если user_id не указан, ищем пользователя по email
-            if not user_id and user_email:
-                try:
-                    user = User.objects.get(email=user_email)
-                    user_id = user.id
-                except User.DoesNotExist:
-                    continue  # Пропускаем несуществующих пользователей
-            
-            if user_id:
-                ProjectMember.objects.update_or_create(
-                    project=project,
-                    user_id=user_id,
-                    defaults={
-                        'role': role,
-                        'added_by': self.user
-                    }
-                )
+        members = parse_member_list(text, default_role=cleaned_data.get('role') or 'viewer')
+        if not members and not self.errors:
+            raise forms.ValidationError('Укажите хотя бы один email')
+        cleaned_data['members'] = members
+        return cleaned_data
+    
+    def save(self, project, added_by):
+        """Добавляет участников в проект, не удаляя существующих"""
+        return sync_project_members(
+            project, self.cleaned_data['members'], added_by=added_by, replace=False
+        )
 
 
 class TestCaseForm(forms.ModelForm):
@@ -161,7 +188,7 @@ class TestCaseForm(forms.ModelForm):
     
     class Meta:
         model = TestCase
-        fields = ['title', 'description', 'preconditions', 'steps', 'expected_result', 'project']
+        fields = ['title', 'description', 'preconditions', 'steps', 'expected_result', 'automation_key', 'project']
         widgets = {
             'title': forms.TextInput(attrs={
                 'class': 'form-control',
@@ -187,6 +214,10 @@ class TestCaseForm(forms.ModelForm):
                 'rows': 3,
                 'placeholder': 'Введите ожидаемый результат'
             }),
+            'automation_key': forms.TextInput(attrs={
+                'class': 'form-control',
+                'placeholder': 'Например: tests.test_auth.LoginTest.test_valid_password'
+            }),
             'project': forms.Select(attrs={
                 'class': 'form-select'
             }),
@@ -210,6 +241,9 @@ class TestCaseForm(forms.ModelForm):
                 'required': 'Поле ожидаемый результат обязательно для заполнения',
                 'max_length': 'Ожидаемый результат не должен превышать 1000 символов'
             },
+            'automation_key': {
+                'max_length': 'Ключ автоматизации не должен превышать 500 символов'
+            },
             'project': {
                 'required': 'Поле проект обязательно для заполнения'
             }
@@ -228,5 +262,175 @@ class TestCaseForm(forms.ModelForm):
         if self.user:
             test_case.created_by = self.user
         if commit:
-            test_case.save()
+            with transaction.atomic():
+                test_case.save()
         return test_case
+
+
+class TestCaseRowForm(TestCaseForm):
+    """Проверка строки импорта по правилам формы тест-кейса (без проекта)"""
+    
+    class Meta(TestCaseForm.Meta):
+        fields = ['title', 'description', 'preconditions', 'steps', 'expected_result', 'automation_key']
+
+
+class TestCaseImportForm(forms.Form):
+    """Форма загрузки файла Excel для импорта тест-кейсов"""
+    
+    # Максимальный размер загружаемого файла (байты)
+    MAX_FILE_SIZE = 50 * 1024 * 1024
+    
+    file = forms.FileField(
+        label='Файл Excel (.xlsx)',
+        widget=forms.ClearableFileInput(attrs={
+            'class': 'form-control',
+            'accept': '.xlsx'
+        }),
+        error_messages={'required': 'Выберите файл для импорта'}
+    )
+    dry_run = forms.BooleanField(
+        label='Только проверить файл (ничего не сохранять)',
+        required=False,
+        initial=True,
+        widget=forms.CheckboxInput(attrs={'class': 'form-check-input'})
+    )
+    
+    def clean_file(self):
+        uploaded = self.cleaned_data['file']
+        if not uploaded.name.lower().endswith('.xlsx'):
+            raise forms.ValidationError('Поддерживаются только файлы .xlsx')
+        if uploaded.size > self.MAX_FILE_SIZE:
+            raise forms.ValidationError('Размер файла не должен превышать 50 МБ')
+        return uploaded
+
+
+class JUnitUploadForm(forms.Form):
+    """Форма загрузки отчета JUnit XML в прогон"""
+    
+    # Максимальный размер загружаемого отчета (байты)
+    MAX_FILE_SIZE = 200 * 1024 * 1024
+    
+    file = forms.FileField(
+        label='Отчет JUnit XML',
+        widget=forms.ClearableFileInput(attrs={
+            'class': 'form-control',
+            'accept': '.xml'
+        }),
+        error_messages={'required': 'Выберите файл отчета'}
+    )
+    run = forms.ModelChoiceField(
+        label='Прогон',
+        queryset=TestRun.objects.none(),
+        required=False,
+        empty_label='Новый прогон',
+        widget=forms.Select(attrs={'class': 'form-select'})
+    )
+    run_name = forms.CharField(
+        label='Название нового прогона',
+        max_length=200,
+        required=False,
+        widget=forms.TextInput(attrs={
+            'class': 'form-control',
+            'placeholder': 'Например: CI #1024'
+        }),
+        error_messages={'max_length': 'Название прогона не должно превышать 200 символов'}
+    )
+    create_missing = forms.BooleanField(
+        label='Создать тест-кейсы для автотестов, которых нет в проекте',
+        required=False,
+        widget=forms.CheckboxInput(attrs={'class': 'form-check-input'})
+    )
+    
+    def __init__(self, *args, **kwargs):
+        project = kwargs.pop('project')
+        super().__init__(*args, **kwargs)
+        self.fields['run'].queryset = TestRun.objects.filter(project=project).order_by('-created_at', '-id')
+    
+    def clean_file(self):
+        uploaded = self.cleaned_data['file']
+        if not uploaded.name.lower().endswith('.xml'):
+            raise forms.ValidationError('Поддерживаются только файлы .xml')
+        if uploaded.size > self.MAX_FILE_SIZE:
+            raise forms.ValidationError('Размер файла не должен превышать 200 МБ')
+        return uploaded
+    
+    def clean(self):
+        cleaned_data = super().clean()
+        if not cleaned_data.get('run') and not cleaned_data.get('run_name'):
+            self.add_error('run_name', 'Выберите прогон или укажите название нового')
+        return cleaned_data
+
+
+class ProjectCloneForm(forms.Form):
+    """Форма копирования проекта"""
+    
+    name = forms.CharField(
+        label='Название нового проекта',
+        max_length=200,
+        widget=forms.TextInput(attrs={'class': 'form-control'}),
+        error_messages={
+            'required': 'Поле название проекта обязательно для заполнения',
+            'max_length': 'Название проекта не должно превышать 200 символов'
+        }
+    )
+    include_members = forms.BooleanField(
+        label='Скопировать участников проекта',
+        required=False,
+        widget=forms.CheckboxInput(attrs={'class': 'form-check-input'})
+    )
+
+
+class TestRunForm(forms.Form):
+    """Форма создания прогона"""
+    
+    name = forms.CharField(
+        label='Название прогона',
+        max_length=200,
+        widget=forms.TextInput(attrs={
+            'class': 'form-control',
+            'placeholder': 'Например: Регресс 2.4'
+        }),
+        error_messages={
+            'required': 'Поле название прогона обязательно для заполнения',
+            'max_length': 'Название прогона не должно превышать 200 символов'
+        }
+    )
+    section = forms.ModelChoiceField(
+        label='Секция',
+        queryset=Section.objects.none(),
+        required=False,
+        empty_label='Весь проект',
+        widget=forms.Select(attrs={'class': 'form-select'})
+    )
+    
+    def __init__(self, *args, **kwargs):
+        project = kwargs.pop('project')
+        super().__init__(*args, **kwargs)
+        # Секции в порядке дерева, с отступом по уровню вложенности
+        self.fields['section'].queryset = Section.objects.filter(project=project).order_by('path')
+        self.fields['section'].label_from_instance = lambda section: '— ' * section.level + section.name
+
+
+class RunResultsForm(forms.Form):
+    """Форма установки статуса для выбранных тест-кейсов прогона"""
+    
+    test_case = forms.Field(
+        widget=forms.MultipleHiddenInput,
+        error_messages={'required': 'Выберите тест-кейсы'}
+    )
+    status = forms.ChoiceField(
+        label='Статус',
+        choices=TestResult.STATUS_CHOICES,
+        widget=forms.Select(attrs={'class': 'form-select'})
+    )
+    comment = forms.CharField(
+        label='Комментарий',
+        required=False,
+        widget=forms.TextInput(attrs={'class': 'form-control'})
+    )
+    
+    def clean_test_case(self):
+        try:
+            return {int(pk) for pk in self.cleaned_data['test_case']}
+        except (TypeError, ValueError):
+            raise forms.ValidationError('Неверный список тест-кейсов')
@@ -0,0 +1,295 @@
+from django.db import transaction
+from openpyxl import load_workbook
+
+from .forms import TestCaseRowForm
+from .models import Section, TestCase
+from .stats import adjust_project_stats
+
+
+# Заголовки колонок файла -> поле тест-кейса. Формат совместим с экспортом.
+IMPORT_HEADERS = {
+    'секция': 'section',
+    'раздел': 'section',
+    'section': 'section',
+    'название': 'title',
+    'title': 'title',
+    'описание': 'description',
+    'description': 'description',
+    'предусловия': 'preconditions',
+    'preconditions': 'preconditions',
+    'шаги выполнения': 'steps',
+    'шаги': 'steps',
+    'steps': 'steps',
+    'ожидаемый результат': 'expected_result',
+    'expected result': 'expected_result',
+    'expected_result': 'expected_result',
+    'ключ автоматизации': 'automation_key',
+    'automation key': 'automation_key',
+    'automation_key': 'automation_key',
+}
+
+REQUIRED_HEADERS = {'title', 'steps', 'expected_result'}
+
+# Количество строк, проверяемых и записываемых за один раз
+IMPORT_BATCH_SIZE = 1000
+
+# Разделитель уровней в пути секции: "Auth/Login/SSO"
+SECTION_PATH_SEPARATOR = '/'
+
+# Сколько ошибок по строкам сохранять в отчете
+IMPORT_ERRORS_LIMIT = 1000
+
+SECTION_NAME_MAX_LENGTH = Section._meta.get_field('name').max_length
+
+
+class ImportFileError(Exception):
+    """Файл не может быть импортирован целиком (нет листа, колонок и т.п.)"""
+
+
+def read_rows(file):
+    """
+    Читает строки первого листа файла в режиме read-only
+
+    Args:
+        file: Путь или файловый объект .xlsx
+
+    Yields:
+        tuple: (номер строки, {поле: значение}); пустые строки пропускаются
+
+    Raises:
+        ImportFileError: Если файл не читается или нет обязательных колонок
+    """
+    try:
+        workbook = load_workbook(file, read_only=True, data_only=True)
+    except Exception:
+        raise ImportFileError('Не удалось прочитать файл. Загрузите файл Excel (.xlsx)')
+
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = next(rows, None) or ()
+        columns = {}
+        for index, title in enumerate(header):
+            field = IMPORT_HEADERS.get(str(title or '').strip().lower())
+            if field and field not in columns.values():
+                columns[index] = field
+
+        missing = REQUIRED_HEADERS - set(columns.values())
+        if missing:
+            raise ImportFileError(
+                'В первой строке не найдены колонки: ' + ', '.join(sorted(missing))
+            )
+
+        for row_number, values in enumerate(rows, start=2):
+            row = {
+                field: _cell_text(values[index]) if index < len(values) else ''
+                for index, field in columns.items()
+            }
+            if any(row.values()):
+                yield row_number, row
+    finally:
+        workbook.close()
+
+
+def _cell_text(value):
+    """Приводит значение ячейки к строке"""
+    if value is None:
+        return ''
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip()
+
+
+def parse_section_path(path):
+    """
+    Разбирает путь секции на уровни
+
+    Returns:
+        tuple: Названия секций от корня; пустой кортеж - без секции
+
+    Raises:
+        ValueError: Если название какого-то уровня слишком длинное
+    """
+    names = tuple(name.strip() for name in path.split(SECTION_PATH_SEPARATOR) if name.strip())
+    for name in names:
+        if len(name) > SECTION_NAME_MAX_LENGTH:
+            raise ValueError(
+                f'Название секции не должно превышать {SECTION_NAME_MAX_LENGTH} символов'
+            )
+    return names
+
+
+class SectionResolver:
+    """
+    Сопоставляет пути секций с ID, создавая недостающие секции
+
+    Существующее дерево проекта загружается одним запросом (пути названий
+    строятся по материализованным путям), новые секции создаются
+    bulk_create по уровням для всей пачки строк.
+    """
+
+    def __init__(self, project):
+        self.project = project
+        self.created = 0
+        self.paths = {}
+        self.db_paths = {}
+        sections = Section.objects.filter(project=project).values_list('pk', 'name', 'path')
+        names = {}
+        for pk, name, path in sections:
+            names[pk] = name
+            self.db_paths[pk] = path
+        for pk, path in self.db_paths.items():
+            ids = [int(part) for part in path.split(Section.PATH_SEPARATOR) if part]
+            self.paths.setdefault(tuple(names[part] for part in ids), pk)
+
+    def resolve(self, paths):
+        """
+        Создает недостающие секции для путей пачки
+
+        Args:
+            paths: Пути секций (кортежи названий)
+        """
+        missing = set()
+        for path in paths:
+            for depth in range(1, len(path) + 1):
+                if path[:depth] not in self.paths:
+                    missing.add(path[:depth])
+
+        # Родитель создается раньше потомков: идем по уровням вложенности
+        for depth in sorted({len(path) for path in missing}):
+            level = sorted(path for path in missing if len(path) == depth)
+            created = Section.objects.bulk_create([
+                Section(
+                    project=self.project,
+                    name=path[-1],
+                    parent_id=self.paths.get(path[:-1]),
+                )
+                for path in level
+            ])
+            # bulk_create не вызывает save(): материализованные пути
+            # проставляются отдельным UPDATE для всего уровня
+            for path, section in zip(level, created):
+                section.path = Section.build_path(self.db_paths.get(section.parent_id, ''), section.pk)
+                self.paths[path] = section.pk
+                self.db_paths[section.pk] = section.path
+            Section.objects.bulk_update(created, ['path'])
+            self.created += len(created)
+
+    def get_id(self, path):
+        return self.paths.get(path) if path else None
+
+
+def import_test_cases(file, project, user, dry_run=False, progress=None):
+    """
+    Импортирует тест-кейсы из .xlsx файла в проект
+
+    Строки проверяются пачками по правилам TestCaseForm, корректные
+    записываются через bulk_create. Импорт выполняется в одной транзакции:
+    если запись какой-то пачки упадет, файл не будет импортирован частично.
+    Строки с ошибками пропускаются и попадают в отчет. При dry_run
+    транзакция откатывается, а отчет показывает, что было бы импортировано.
+
+    Функция progress вызывается внутри транзакции импорта; задача передает
+    ее вместе с Job.progress_connection(), чтобы прогресс был виден сразу.
+
+    Args:
+        file: Путь или файловый объект .xlsx
+        project: Проект, в который импортируются тест-кейсы
+        user: Автор создаваемых тест-кейсов
+        dry_run: Только проверить файл, ничего не сохраняя
+        progress: Функция progress(обработано строк) для отчета о ходе
+
+    Returns:
+        dict: Отчет: rows, created, sections_created, error_count,
+        errors [{'row': номер, 'messages': [...]}], dry_run
+
+    Raises:
+        ImportFileError: Если файл не может быть импортирован
+    """
+    report = {
+        'rows': 0,
+        'created': 0,
+        'sections_created': 0,
+        'error_count': 0,
+        'errors': [],
+        'dry_run': dry_run,
+    }
+
+    with transaction.atomic():
+        sections = SectionResolver(project)
+        # Ключи автоматизации уже принятых строк файла
+        keys = set()
+        batch = []
+        for row_number, row in read_rows(file):
+            batch.append((row_number, row))
+            if len(batch) >= IMPORT_BATCH_SIZE:
+                _import_batch(batch, project, user, sections, keys, report)
+                batch = []
+                if progress:
+                    progress(report['rows'])
+        if batch:
+            _import_batch(batch, project, user, sections, keys, report)
+            if progress:
+                progress(report['rows'])
+
+        # bulk_create не вызывает сигналы - обновляем счетчики проекта явно
+        adjust_project_stats(
+            project.pk,
+            test_case_count=report['created'],
+            section_count=sections.created,
+        )
+        if dry_run:
+            transaction.set_rollback(True)
+
+    report['sections_created'] = sections.created
+    return report
+
+
+def _import_batch(batch, project, user, sections, keys, report):
+    """Проверяет и записывает одну пачку строк"""
+    # Уникальность ключей автоматизации проверяется одним запросом на пачку
+    batch_keys = {row['automation_key'] for _, row in batch if row.get('automation_key')}
+    existing_keys = set(
+        TestCase.objects
+        .filter(project=project, automation_key__in=batch_keys)
+        .values_list('automation_key', flat=True)
+    ) if batch_keys else set()
+
+    valid = []
+    for row_number, row in batch:
+        report['rows'] += 1
+        form = TestCaseRowForm(data=row)
+        messages = []
+        if not form.is_valid():
+            for field, errors in form.errors.items():
+                label = form.fields[field].label if field in form.fields else ''
+                messages.extend(f'{label}: {error}' if label else error for error in errors)
+        try:
+            path = parse_section_path(row.get('section', ''))
+        except ValueError as error:
+            messages.append(f'Секция: {error}')
+        key = row.get('automation_key', '')
+        if key in existing_keys:
+            messages.append('Ключ автоматизации: Тест-кейс с таким ключом автоматизации уже есть в проекте')
+        elif key and key in keys:
+            messages.append('Ключ автоматизации: Ключ повторяется в файле')
+
+        if messages:
+            report['error_count'] += 1
+            if len(report['errors']) < IMPORT_ERRORS_LIMIT:
+                report['errors'].append({'row': row_number, 'messages': messages})
+            continue
+        if key:
+            keys.add(key)
+        valid.append((form.cleaned_data, path))
+
+    sections.resolve({path for _, path in valid if path})
+    TestCase.objects.bulk_create([
+        TestCase(
+            project=project,
+            section_id=sections.get_id(path),
+            created_by=user,
+            **data
+        )
+        for data, path in valid
+    ])
+    report['created'] += len(valid)
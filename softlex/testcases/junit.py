@@ -0,0 +1,217 @@
+from xml.etree.ElementTree import ParseError, iterparse
+
+from django.db import connection, transaction
+
+from .models import TestCase, TestResult
+from .runs import upsert_results
+from .stats import adjust_project_stats
+
+
+# Количество тест-кейсов отчета, сопоставляемых и записываемых за один раз
+JUNIT_BATCH_SIZE = 1000
+
+# Максимальная длина сообщения об ошибке, сохраняемого в комментарий
+JUNIT_MESSAGE_LIMIT = 2000
+
+# Сколько несопоставленных ключей перечислять в отчете
+JUNIT_UNKNOWN_LIMIT = 100
+
+# Текст обязательных полей тест-кейсов, созданных по отчету
+AUTOMATED_STEPS = 'Автоматический тест'
+AUTOMATED_EXPECTED_RESULT = 'Тест завершается успешно'
+
+TITLE_MAX_LENGTH = TestCase._meta.get_field('title').max_length
+KEY_MAX_LENGTH = TestCase._meta.get_field('automation_key').max_length
+
+
+class JUnitFileError(Exception):
+    """Отчет не может быть разобран"""
+
+
+def junit_key(classname, name):
+    """Ключ автоматизации тест-кейса отчета: "classname.name" """
+    classname = (classname or '').strip()
+    name = (name or '').strip()
+    return f'{classname}.{name}' if classname else name
+
+
+def _local_name(tag):
+    """Имя тега без пространства имен"""
+    return tag.rsplit('}', 1)[-1]
+
+
+def _parse_case(element):
+    """Статус и сообщение элемента <testcase>"""
+    status = TestResult.STATUS_PASSED
+    message = ''
+    for child in element:
+        tag = _local_name(child.tag)
+        if tag in ('failure', 'error'):
+            status = TestResult.STATUS_FAILED
+            message = child.get('message') or (child.text or '')
+            break
+        if tag == 'skipped':
+            status = TestResult.STATUS_SKIPPED
+            message = child.get('message') or ''
+    return status, message.strip()[:JUNIT_MESSAGE_LIMIT]
+
+
+def iter_junit_cases(file):
+    """
+    Читает тест-кейсы отчета JUnit XML потоком
+
+    Документ разбирается iterparse, обработанные элементы сразу
+    очищаются и отцепляются от родителя, поэтому память не растет с
+    размером отчета.
+
+    Args:
+        file: Путь или файловый объект отчета
+
+    Yields:
+        tuple: (ключ автоматизации, название, статус, сообщение)
+
+    Raises:
+        JUnitFileError: Если файл не является корректным XML
+    """
+    # Открытые элементы от корня до текущего
+    stack = []
+    try:
+        for event, element in iterparse(file, events=('start', 'end')):
+            if event == 'start':
+                stack.append(element)
+                continue
+            stack.pop()
+            tag = _local_name(element.tag)
+            if tag == 'testcase':
+                name = element.get('name', '')
+                key = junit_key(element.get('classname'), name)
+                if key:
+                    yield (key[:KEY_MAX_LENGTH], name, *_parse_case(element))
+                element.clear()
+                if stack:
+                    # Уже обработанные соседние элементы больше не нужны
+                    del stack[-1][:]
+            elif tag in ('system-out', 'system-err'):
+                element.clear()
+    except ParseError as error:
+        raise JUnitFileError(f'Файл не является корректным JUnit XML: {error}')
+
+
+def import_junit(file, run, user, create_missing=False, progress=None):
+    """
+    Записывает результаты отчета JUnit XML в прогон
+
+    Тест-кейсы отчета сопоставляются с тест-кейсами проекта по ключу
+    автоматизации. Каждая пачка из JUNIT_BATCH_SIZE тест-кейсов
+    сопоставляется одним запросом и записывается upsert-ом в своей
+    транзакции, поэтому повторная загрузка того же отчета безопасна.
+
+    Args:
+        file: Путь или файловый объект отчета
+        run: Прогон, в который записываются результаты
+        user: Пользователь, от имени которого записываются результаты
+        create_missing: Создавать тест-кейсы для неизвестных ключей
+        progress: Функция progress(обработано тест-кейсов)
+
+    Returns:
+        dict: Отчет: cases, recorded, created, unknown, unknown_keys и
+        statuses {статус: количество}
+
+    Raises:
+        JUnitFileError: Если отчет не может быть разобран
+    """
+    report = {
+        'cases': 0,
+        'recorded': 0,
+        'created': 0,
+        'unknown': 0,
+        'unknown_keys': [],
+        'statuses': {},
+    }
+    batch = {}
+    for key, name, status, message in iter_junit_cases(file):
+        report['cases'] += 1
+        report['statuses'][status] = report['statuses'].get(status, 0) + 1
+        # Повтор ключа в отчете (перезапуск теста) - побеждает последний
+        batch[key] = (name, status, message)
+        if len(batch) >= JUNIT_BATCH_SIZE:
+            _import_batch(batch, run, user, create_missing, report)
+            batch = {}
+            if progress:
+                progress(report['cases'])
+    if batch:
+        _import_batch(batch, run, user, create_missing, report)
+        if progress:
+            progress(report['cases'])
+    return report
+
+
+def _create_test_cases(run, user, titles):
+    """
+    Создает тест-кейсы для ключей отчета, которых нет в проекте
+
+    INSERT ... ON CONFLICT DO NOTHING RETURNING возвращает только строки,
+    вставленные этим запросом: ключи, которые успел создать параллельный
+    импорт, пропускаются и не попадают в счетчики проекта.
+
+    Args:
+        run: Прогон, в проект которого добавляются тест-кейсы
+        user: Автор тест-кейсов
+        titles: {ключ автоматизации: название из отчета}
+
+    Returns:
+        dict: {ключ автоматизации: ID созданного тест-кейса}
+    """
+    table = connection.ops.quote_name(TestCase._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'''
+            INSERT INTO {table} (
+                project_id, created_by_id, automation_key, title, description,
+                preconditions, steps, expected_result, created_at, updated_at
+            )
+            SELECT %s, %s, row.key, row.title, '', '', %s, %s, now(), now()
+            FROM unnest(%s::text[], %s::text[]) AS row (key, title)
+            ON CONFLICT DO NOTHING
+            RETURNING automation_key, id
+            ''',
+            [
+                run.project_id,
+                user.pk,
+                AUTOMATED_STEPS,
+                AUTOMATED_EXPECTED_RESULT,
+                list(titles),
+                [(title or key)[:TITLE_MAX_LENGTH] for key, title in titles.items()],
+            ]
+        )
+        return dict(cursor.fetchall())
+
+
+def _import_batch(batch, run, user, create_missing, report):
+    """Сопоставляет и записывает одну пачку тест-кейсов отчета"""
+    project_cases = TestCase.objects.filter(project_id=run.project_id).exclude(automation_key='')
+
+    with transaction.atomic():
+        ids = dict(project_cases.filter(automation_key__in=list(batch)).values_list('automation_key', 'pk'))
+        missing = [key for key in batch if key not in ids]
+
+        if missing and create_missing:
+            created = _create_test_cases(run, user, {key: batch[key][0] for key in missing})
+            report['created'] += len(created)
+            adjust_project_stats(run.project_id, test_case_count=len(created))
+            # Остальные ключи мог уже создать параллельный импорт
+            ids.update(created)
+            ids.update(project_cases.filter(
+                automation_key__in=[key for key in missing if key not in created]
+            ).values_list('automation_key', 'pk'))
+            missing = [key for key in missing if key not in ids]
+
+        report['recorded'] += upsert_results(
+            run,
+            [(ids[key], status, message) for key, (_, status, message) in batch.items() if key in ids],
+            user,
+        )
+
+    report['unknown'] += len(missing)
+    free = JUNIT_UNKNOWN_LIMIT - len(report['unknown_keys'])
+    report['unknown_keys'].extend(missing[:max(free, 0)])
@@ -0,0 +1,57 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from testcases.junit import JUnitFileError, import_junit
+from testcases.models import Project, TestRun
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Загружает результаты автотестов из отчета JUnit XML в прогон проекта'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Путь к отчету JUnit XML')
+        parser.add_argument('--project', type=int, required=True, help='ID проекта')
+        run = parser.add_mutually_exclusive_group(required=True)
+        run.add_argument('--run', type=int, help='ID существующего прогона')
+        run.add_argument('--run-name', help='Название нового прогона')
+        parser.add_argument('--user', required=True, help='Email пользователя, от имени которого записываются результаты')
+        parser.add_argument(
+            '--create-missing',
+            action='store_true',
+            help='Создавать тест-кейсы для автотестов, которых нет в проекте'
+        )
+
+    def handle(self, *args, **options):
+        project = Project.objects.active().filter(pk=options['project']).first()
+        if project is None:
+            raise CommandError(f'Проект {options["project"]} не найден')
+        user = User.objects.filter(email=options['user']).first()
+        if user is None:
+            raise CommandError(f'Пользователь {options["user"]} не найден')
+
+        if options['run']:
+            run = TestRun.objects.filter(project=project, pk=options['run']).first()
+            if run is None:
+                raise CommandError(f'Прогон {options["run"]} не найден в проекте')
+        else:
+            run = TestRun.objects.create(name=options['run_name'], project=project, created_by=user)
+
+        try:
+            report = import_junit(options['path'], run, user, create_missing=options['create_missing'])
+        except (JUnitFileError, OSError) as error:
+            raise CommandError(str(error))
+
+        self.stdout.write(
+            f'Прогон {run.pk}: тест-кейсов в отчете {report["cases"]}, '
+            f'записано результатов {report["recorded"]}, создано тест-кейсов {report["created"]}'
+        )
+        if report['unknown']:
+            self.stdout.write(self.style.WARNING(
+                f'Нет тест-кейсов с ключами автоматизации: {report["unknown"]}'
+            ))
+            for key in report['unknown_keys']:
+                self.stdout.write(f'  {key}')
+        else:
+            self.stdout.write(self.style.SUCCESS('Все автотесты сопоставлены'))
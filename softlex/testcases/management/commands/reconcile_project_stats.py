@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from testcases.stats import refresh_project_stats
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает денормализованную статистику проектов и исправляет расхождения'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--project',
+            type=int,
+            action='append',
+            dest='project_ids',
+            help='ID проекта для пересчета (можно указать несколько раз)'
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            fixed = refresh_project_stats(options['project_ids'])
+
+        if fixed:
+            self.stdout.write(self.style.WARNING(f'Исправлено расхождений: {fixed}'))
+        else:
+            self.stdout.write(self.style.SUCCESS('Статистика проектов актуальна'))
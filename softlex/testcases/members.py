@@ -0,0 +1,162 @@
+import re
+
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.db.models import Q
+
+from .models import ProjectMember
+from .permissions import invalidate_project_roles
+from .stats import adjust_project_stats
+
+User = get_user_model()
+
+
+# Допустимые роли участников; в списках можно указывать и русские названия
+MEMBER_ROLES = dict(ProjectMember.ROLE_CHOICES)
+ROLE_ALIASES = {
+    **{role: role for role in MEMBER_ROLES},
+    **{label.lower(): role for role, label in MEMBER_ROLES.items()},
+}
+
+# Разделители значений в CSV и вставленных списках
+MEMBER_LIST_SEPARATORS = re.compile(r'[,;\s]+')
+
+
+def parse_member_list(text, default_role='viewer'):
+    """
+    Разбирает список участников из CSV или вставленного текста
+
+    Каждая строка может содержать один или несколько email и
+    необязательную роль: "user@example.com;editor". Строки без email
+    (например, заголовок CSV) пропускаются.
+
+    Args:
+        text: Содержимое CSV файла или текстового поля
+        default_role: Роль для строк, где она не указана
+
+    Returns:
+        list: Записи участников вида {'user_email': ..., 'role': ...}
+    """
+    members = {}
+    for line in text.splitlines():
+        tokens = [token.strip('"\'') for token in MEMBER_LIST_SEPARATORS.split(line.strip())]
+        emails = [token.lower() for token in tokens if '@' in token]
+        roles = [ROLE_ALIASES[token.lower()] for token in tokens if token.lower() in ROLE_ALIASES]
+        role = roles[0] if roles else default_role
+        for email in emails:
+            members[email] = {'user_email': email, 'role': role}
+    return list(members.values())
+
+
+def resolve_members(members):
+    """
+    Сопоставляет записи участников с пользователями одним запросом
+
+    Пользователи ищутся по id, а записи без id - по email через IN
+    (в исходном написании и в нижнем регистре).
+
+    Args:
+        members: Записи вида {'user_id': ..., 'user_email': ..., 'role': ...}
+
+    Returns:
+        tuple: ({user_id: role}, [email, ...] ненайденных пользователей)
+    """
+    ids = set()
+    emails = set()
+    for member in members:
+        if member.get('user_id'):
+            ids.add(int(member['user_id']))
+        elif member.get('user_email'):
+            emails.update({member['user_email'], member['user_email'].lower()})
+
+    known_ids = set()
+    id_by_email = {}
+    if ids or emails:
+        found = User.objects.filter(Q(pk__in=ids) | Q(email__in=emails)).values_list('pk', 'email')
+        for pk, email in found:
+            known_ids.add(pk)
+            id_by_email[email.lower()] = pk
+
+    roles = {}
+    unknown = []
+    for member in members:
+        role = member.get('role', 'viewer')
+        if member.get('user_id'):
+            if int(member['user_id']) in known_ids:
+                roles[int(member['user_id'])] = role
+        elif member.get('user_email'):
+            user_id = id_by_email.get(member['user_email'].lower())
+            if user_id:
+                roles[user_id] = role
+            else:
+                unknown.append(member['user_email'])
+    return roles, unknown
+
+
+def sync_project_members(project, members, added_by=None, replace=True):
+    """
+    Приводит состав участников проекта к заданному списку
+
+    Разница с текущим составом считается в памяти, изменения применяются
+    одним upsert (INSERT ... ON CONFLICT DO UPDATE) и одним DELETE.
+    Массовые операции не вызывают сигналы, поэтому счетчик участников и
+    кэш ролей обновляются здесь явно. Создатель проекта не затрагивается.
+
+    Args:
+        project: Проект
+        members: Записи вида {'user_id': ..., 'user_email': ..., 'role': ...}
+        added_by: Пользователь, выполняющий изменение
+        replace: Удалять участников, которых нет в списке
+
+    Returns:
+        dict: Количество added, updated, removed и список unknown
+        ненайденных email
+    """
+    roles, unknown = resolve_members(members)
+    roles.pop(project.created_by_id, None)
+
+    with transaction.atomic():
+        current = dict(
+            ProjectMember.objects
+            .filter(project=project)
+            .exclude(user_id=project.created_by_id)
+            .values_list('user_id', 'role')
+        )
+
+        to_add = roles.keys() - current.keys()
+        to_update = {user_id for user_id in roles.keys() & current.keys() if roles[user_id] != current[user_id]}
+        to_remove = current.keys() - roles.keys() if replace else set()
+
+        removed = 0
+        if to_remove:
+            # DELETE без выборки объектов и сигналов: счетчики и роли
+            # обновляются ниже для всех изменений сразу
+            table = connection.ops.quote_name(ProjectMember._meta.db_table)
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f'DELETE FROM {table} WHERE project_id = %s AND user_id = ANY(%s)',
+                    [project.pk, list(to_remove)]
+                )
+                removed = cursor.rowcount
+
+        changed = to_add | to_update
+        if changed:
+            ProjectMember.objects.bulk_create(
+                [
+                    ProjectMember(project=project, user_id=user_id, role=roles[user_id], added_by=added_by)
+                    for user_id in changed
+                ],
+                update_conflicts=True,
+                unique_fields=['project', 'user'],
+                update_fields=['role', 'added_by'],
+            )
+
+        adjust_project_stats(project.pk, member_count=len(to_add) - removed)
+        invalidate_project_roles(changed | to_remove)
+
+    return {
+        'added': len(to_add),
+        'updated': len(to_update),
+        'removed': removed,
+        'unknown': unknown,
+    }
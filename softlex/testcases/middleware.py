@@ -0,0 +1,21 @@
+from django.utils.functional import SimpleLazyObject
+
+from .permissions import get_project_permissions
+
+
+class ProjectPermissionMiddleware:
+    """
+    Добавляет в запрос резолвер прав на проекты (request.project_permissions)
+
+    Роли пользователя загружаются одним запросом при первой проверке,
+    остальные проверки в представлениях и шаблонах не обращаются к БД.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.project_permissions = SimpleLazyObject(
+            lambda: get_project_permissions(request.user)
+        )
+        return self.get_response(request)
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:32
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('testcases', '0004_auto_20251015_1932'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['-created_at', '-id'], name='project_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['-updated_at', '-id'], name='project_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['name', 'id'], name='project_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='testcase',
+            index=models.Index(fields=['project', '-created_at', '-id'], name='testcase_project_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='testcase',
+            index=models.Index(fields=['project', 'title', 'id'], name='testcase_project_title_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='testcase',
+            index=models.Index(fields=['-created_at', '-id'], name='testcase_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='testcase',
+            index=models.Index(fields=['title', 'id'], name='testcase_title_idx'),
+        ),
+    ]
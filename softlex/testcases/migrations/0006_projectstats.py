@@ -0,0 +1,58 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:33
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def fill_project_stats(apps, schema_editor):
+    """Заполняет статистику для существующих проектов"""
+    Project = apps.get_model('testcases', 'Project')
+    ProjectStats = apps.get_model('testcases', 'ProjectStats')
+    TestCase = apps.get_model('testcases', 'TestCase')
+    Section = apps.get_model('testcases', 'Section')
+    ProjectMember = apps.get_model('testcases', 'ProjectMember')
+    
+    def counts(model):
+        return dict(
+            model.objects.order_by().values_list('project_id').annotate(total=Count('pk'))
+        )
+    
+    test_cases = counts(TestCase)
+    sections = counts(Section)
+    members = counts(ProjectMember)
+    
+    ProjectStats.objects.bulk_create([
+        ProjectStats(
+            project_id=pk,
+            test_case_count=test_cases.get(pk, 0),
+            section_count=sections.get(pk, 0),
+            member_count=members.get(pk, 0),
+        )
+        for pk in Project.objects.values_list('pk', flat=True)
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('testcases', '0005_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjectStats',
+            fields=[
+                ('project', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='testcases.project', verbose_name='Проект')),
+                ('test_case_count', models.PositiveIntegerField(default=0, verbose_name='Тест-кейсов')),
+                ('section_count', models.PositiveIntegerField(default=0, verbose_name='Секций')),
+                ('member_count', models.PositiveIntegerField(default=0, verbose_name='Участников')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Обновлена')),
+            ],
+            options={
+                'verbose_name': 'Статистика проекта',
+                'verbose_name_plural': 'Статистика проектов',
+            },
+        ),
+        migrations.RunPython(fill_project_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:17
+
+from django.db import migrations, models
+
+
+# Заполняет пути существующих секций рекурсивным обходом от корней
+FILL_SECTION_PATHS = """
+WITH RECURSIVE tree (id, path) AS (
+    SELECT id, id::text || '/'
+    FROM testcases_section
+    WHERE parent_id IS NULL
+    UNION ALL
+    SELECT section.id, tree.path || section.id::text || '/'
+    FROM testcases_section section
+    JOIN tree ON section.parent_id = tree.id
+)
+UPDATE testcases_section
+SET path = tree.path
+FROM tree
+WHERE testcases_section.id = tree.id
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('testcases', '0007_testcase_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='section',
+            name='path',
+            field=models.CharField(blank=True, default='', editable=False, max_length=255, verbose_name='Путь'),
+        ),
+        migrations.AddIndex(
+            model_name='section',
+            index=models.Index(fields=['path'], name='section_path_idx', opclasses=['varchar_pattern_ops']),
+        ),
+        migrations.RunSQL(FILL_SECTION_PATHS, migrations.RunSQL.noop),
+    ]
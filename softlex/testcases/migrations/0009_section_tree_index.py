@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:20
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('testcases', '0008_section_path'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='testcase',
+            index=models.Index(fields=['section', 'title', 'id'], name='testcase_section_title_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('testcases', '0009_section_tree_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='is_deleted',
+            field=models.BooleanField(default=False, verbose_name='Удален'),
+        ),
+    ]
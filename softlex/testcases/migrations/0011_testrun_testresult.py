@@ -0,0 +1,65 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:30
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('testcases', '0010_project_is_deleted'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TestRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=200, verbose_name='Название')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Создан')),
+                ('created_by', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='created_runs', to=settings.AUTH_USER_MODEL, verbose_name='Создатель')),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='runs', to='testcases.project', verbose_name='Проект')),
+                ('section', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='runs', to='testcases.section', verbose_name='Секция')),
+            ],
+            options={
+                'verbose_name': 'Прогон',
+                'verbose_name_plural': 'Прогоны',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='TestResult',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('untested', 'Не выполнен'), ('passed', 'Пройден'), ('failed', 'Провален'), ('blocked', 'Заблокирован'), ('skipped', 'Пропущен')], default='untested', max_length=10, verbose_name='Статус')),
+                ('comment', models.TextField(blank=True, default='', verbose_name='Комментарий')),
+                ('updated_at', models.DateTimeField(blank=True, null=True, verbose_name='Изменен')),
+                ('test_case', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='results', to='testcases.testcase', verbose_name='Тест-кейс')),
+                ('updated_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='updated_results', to=settings.AUTH_USER_MODEL, verbose_name='Изменен пользователем')),
+                ('run', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='results', to='testcases.testrun', verbose_name='Прогон')),
+            ],
+            options={
+                'verbose_name': 'Результат',
+                'verbose_name_plural': 'Результаты',
+                'ordering': ['id'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='testrun',
+            index=models.Index(fields=['project', '-created_at', '-id'], name='testrun_project_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='testresult',
+            index=models.Index(fields=['run', 'status'], name='testresult_run_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='testresult',
+            index=models.Index(fields=['run', 'id'], name='testresult_run_id_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='testresult',
+            constraint=models.UniqueConstraint(fields=('run', 'test_case'), name='testresult_run_case_unique'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:35
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('testcases', '0011_testrun_testresult'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='testcase',
+            name='automation_key',
+            field=models.CharField(blank=True, default='', max_length=500, verbose_name='Ключ автоматизации'),
+        ),
+        migrations.AddConstraint(
+            model_name='testcase',
+            constraint=models.UniqueConstraint(condition=models.Q(('automation_key', ''), _negated=True), fields=('project', 'automation_key'), name='testcase_automation_key_unique', violation_error_message='Тест-кейс с таким ключом автоматизации уже есть в проекте'),
+        ),
+    ]
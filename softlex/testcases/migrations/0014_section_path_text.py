@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('testcases', '0013_testcase_project_updated_idx'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='section',
+            name='section_path_idx',
+        ),
+        migrations.AlterField(
+            model_name='section',
+            name='path',
+            field=models.TextField(blank=True, default='', editable=False, verbose_name='Путь'),
+        ),
+        migrations.AddIndex(
+            model_name='section',
+            index=models.Index(fields=['path'], name='section_path_idx', opclasses=['text_pattern_ops']),
+        ),
+    ]
@@ -1,9 +1,46 @@
 from django.db import models
 from django.contrib.auth import get_user_model
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
+from django.db.models import Value
+from django.db.models.functions import Concat, Length, Substr
 
 User = get_user_model()
 
 
+def build_search_vector():
+    """
+    Выражение поискового вектора тест-кейса
+
+    Каждое поле индексируется в конфигурациях russian (морфология) и
+    simple (точные токены: коды, идентификаторы, английские слова).
+    Вес определяет вклад совпадения в ранжирование: название (A) выше
+    описания и предусловий (B), а они выше шагов и ожидаемого
+    результата (C).
+    """
+    weighted_fields = [
+        ('title', 'A'),
+        ('description', 'B'),
+        ('preconditions', 'B'),
+        ('steps', 'C'),
+        ('expected_result', 'C'),
+    ]
+    vector = None
+    for field, weight in weighted_fields:
+        for config in ('russian', 'simple'):
+            part = SearchVector(field, config=config, weight=weight)
+            vector = part if vector is None else vector + part
+    return vector
+
+
+class ProjectQuerySet(models.QuerySet):
+    """Выборки проектов"""
+    
+    def active(self):
+        """Проекты, не помеченные на удаление"""
+        return self.filter(is_deleted=False)
+
+
 class Project(models.Model):
     """Модель проекта"""
     
@@ -17,11 +54,21 @@ class Project(models.Model):
         related_name='created_projects',
         verbose_name='Создатель'
     )
+    # Удаленный проект сразу скрывается, данные удаляет фоновая задача
+    is_deleted = models.BooleanField(default=False, verbose_name='Удален')
+    
+    objects = ProjectQuerySet.as_manager()
     
     class Meta:
         verbose_name = 'Проект'
         verbose_name_plural = 'Проекты'
         ordering = ['-created_at']
+        indexes = [
+            # Индексы под курсорную пагинацию списка проектов
+            models.Index(fields=['-created_at', '-id'], name='project_created_idx'),
+            models.Index(fields=['-updated_at', '-id'], name='project_updated_idx'),
+            models.Index(fields=['name', 'id'], name='project_name_idx'),
+        ]
     
     def __str__(self):
         return self.name
@@ -30,6 +77,9 @@ class Project(models.Model):
 class Section(models.Model):
     """Модель секции для группировки тест-кейсов"""
     
+    # Разделитель ID в материализованном пути: "12/34/56/"
+    PATH_SEPARATOR = '/'
+    
     name = models.CharField(max_length=200, verbose_name='Название')
     project = models.ForeignKey(
         Project, 
@@ -48,13 +98,104 @@ class Section(models.Model):
     order = models.PositiveIntegerField(default=0, verbose_name='Порядок')
     created_at = models.DateTimeField(auto_now_add=True, verbose_name='Создана')
     
+    # Материализованный путь: ID всех предков и самой секции. Поддерево
+    # выбирается одним запросом по префиксу (path LIKE '12/34/%').
+    # TextField: глубина дерева не ограничена, перенос поддерева под
+    # глубокого родителя не упирается в длину колонки.
+    path = models.TextField(
+        blank=True,
+        default='',
+        editable=False,
+        verbose_name='Путь'
+    )
+    
     class Meta:
         verbose_name = 'Секция'
         verbose_name_plural = 'Секции'
         ordering = ['order', 'name']
+        indexes = [
+            # text_pattern_ops позволяет использовать индекс для LIKE 'префикс%'
+            models.Index(fields=['path'], name='section_path_idx', opclasses=['text_pattern_ops']),
+        ]
     
     def __str__(self):
         return f"{self.project.name} - {self.name}"
+    
+    @classmethod
+    def build_path(cls, parent_path, pk):
+        """Путь секции по пути родителя ('' для корневой) и ее ID"""
+        return f'{parent_path}{pk}{cls.PATH_SEPARATOR}'
+    
+    @property
+    def ancestor_ids(self):
+        """ID предков от корня, без самой секции"""
+        return [int(pk) for pk in self.path.split(self.PATH_SEPARATOR)[:-2]]
+    
+    @property
+    def level(self):
+        """Уровень вложенности: 0 для корневой секции"""
+        return max(self.path.count(self.PATH_SEPARATOR) - 1, 0)
+    
+    def get_ancestors(self):
+        """Предки секции от корня (для хлебных крошек) одним запросом"""
+        return Section.objects.filter(pk__in=self.ancestor_ids).order_by(Length('path'))
+    
+    def get_descendants(self, include_self=False):
+        """Вложенные секции на любой глубине одним запросом по префиксу пути"""
+        descendants = Section.objects.filter(path__startswith=self.path)
+        if not include_self:
+            descendants = descendants.exclude(pk=self.pk)
+        return descendants
+    
+    def save(self, *args, **kwargs):
+        """
+        Сохраняет секцию и поддерживает материализованный путь
+        
+        При создании путь дописывается после INSERT (нужен ID). При
+        переносе в другую ветку пути секции и всех ее потомков
+        переписываются одним UPDATE по префиксу.
+        
+        Raises:
+            ValueError: Если секцию переносят внутрь нее самой
+        """
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'parent' not in update_fields and 'parent_id' not in update_fields:
+            return super().save(*args, **kwargs)
+        
+        paths = {}
+        if not self._state.adding:
+            paths = dict(
+                Section.objects.filter(pk__in=[self.pk, self.parent_id]).values_list('pk', 'path')
+            )
+            old_path = paths.get(self.pk, '')
+            if old_path and paths.get(self.parent_id, '').startswith(old_path):
+                raise ValueError('Секцию нельзя перенести внутрь нее самой')
+        
+        super().save(*args, **kwargs)
+        
+        if self.parent_id is not None and self.parent_id not in paths:
+            paths[self.parent_id] = (
+                Section.objects.filter(pk=self.parent_id).values_list('path', flat=True).first() or ''
+            )
+        old_path = paths.get(self.pk, '')
+        new_path = self.build_path(paths.get(self.parent_id, ''), self.pk)
+        if new_path == old_path:
+            self.path = new_path
+            return
+        
+        if old_path:
+            Section.objects.filter(path__startswith=old_path).update(
+                path=Concat(Value(new_path), Substr('path', len(old_path) + 1))
+            )
+        else:
+            Section.objects.filter(pk=self.pk).update(path=new_path)
+        self.path = new_path
+    
+    def delete(self, *args, **kwargs):
+        """Удаляет секцию вместе с поддеревом, выбранным по префиксу пути"""
+        if not self.path:
+            return super().delete(*args, **kwargs)
+        return self.get_descendants(include_self=True).delete()
 
 
 class TestCase(models.Model):
@@ -88,17 +229,63 @@ class TestCase(models.Model):
         verbose_name='Создатель'
     )
     
+    # Стабильный ключ автотеста (например, "tests.auth.LoginTest.test_sso"),
+    # по которому сопоставляются результаты из отчетов CI
+    automation_key = models.CharField(
+        max_length=500,
+        blank=True,
+        default='',
+        verbose_name='Ключ автоматизации'
+    )
+    
     # Временные метки
     created_at = models.DateTimeField(auto_now_add=True, verbose_name='Создан')
     updated_at = models.DateTimeField(auto_now=True, verbose_name='Обновлен')
     
+    # Полнотекстовый поиск (вычисляется PostgreSQL при записи)
+    search_vector = models.GeneratedField(
+        expression=build_search_vector(),
+        output_field=SearchVectorField(),
+        db_persist=True,
+        verbose_name='Поисковый вектор'
+    )
+    
     class Meta:
         verbose_name = 'Тест-кейс'
         verbose_name_plural = 'Тест-кейсы'
         ordering = ['-created_at']
+        indexes = [
+            # Индексы под курсорную пагинацию списков тест-кейсов
+            models.Index(fields=['project', '-created_at', '-id'], name='testcase_project_created_idx'),
+            models.Index(fields=['project', 'title', 'id'], name='testcase_project_title_idx'),
+            # Дата последнего изменения тест-кейсов проекта для условного GET
+            models.Index(fields=['project', '-updated_at'], name='testcase_project_updated_idx'),
+            models.Index(fields=['-created_at', '-id'], name='testcase_created_idx'),
+            models.Index(fields=['title', 'id'], name='testcase_title_idx'),
+            # Тест-кейсы узла дерева секций
+            models.Index(fields=['section', 'title', 'id'], name='testcase_section_title_idx'),
+            GinIndex(fields=['search_vector'], name='testcase_search_idx'),
+        ]
+        constraints = [
+            # Частичный уникальный индекс: ключ задан не у всех тест-кейсов
+            models.UniqueConstraint(
+                fields=['project', 'automation_key'],
+                condition=~models.Q(automation_key=''),
+                name='testcase_automation_key_unique',
+                violation_error_message='Тест-кейс с таким ключом автоматизации уже есть в проекте'
+            ),
+        ]
     
     def __str__(self):
         return self.title
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Проект на момент загрузки: сигналы счетчиков учитывают перенос
+        # тест-кейса без повторного чтения строки перед сохранением
+        instance._loaded_project_id = instance.__dict__.get('project_id')
+        return instance
 
 
 class ProjectMember(models.Model):
@@ -144,4 +331,130 @@ class ProjectMember(models.Model):
         ordering = ['-added_at']
     
     def __str__(self):
-        return f"{self.user.email} - {self.project.name} ({self.get_role_display()})"
\ No newline at end of file
+        return f"{self.user.email} - {self.project.name} ({self.get_role_display()})"
+
+
+class ProjectStats(models.Model):
+    """Денормализованные счетчики проекта для списков"""
+    
+    project = models.OneToOneField(
+        Project,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='stats',
+        verbose_name='Проект'
+    )
+    test_case_count = models.PositiveIntegerField(default=0, verbose_name='Тест-кейсов')
+    section_count = models.PositiveIntegerField(default=0, verbose_name='Секций')
+    member_count = models.PositiveIntegerField(default=0, verbose_name='Участников')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='Обновлена')
+    
+    class Meta:
+        verbose_name = 'Статистика проекта'
+        verbose_name_plural = 'Статистика проектов'
+    
+    def __str__(self):
+        return f"{self.project_id}: {self.test_case_count} / {self.section_count} / {self.member_count}"
+
+
+class TestRun(models.Model):
+    """Прогон: выполнение набора тест-кейсов проекта или секции"""
+    
+    name = models.CharField(max_length=200, verbose_name='Название')
+    project = models.ForeignKey(
+        Project,
+        on_delete=models.CASCADE,
+        related_name='runs',
+        verbose_name='Проект'
+    )
+    # Секция, с поддеревом которой создан прогон (None - весь проект)
+    section = models.ForeignKey(
+        Section,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='runs',
+        verbose_name='Секция'
+    )
+    created_by = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='created_runs',
+        verbose_name='Создатель'
+    )
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='Создан')
+    
+    class Meta:
+        verbose_name = 'Прогон'
+        verbose_name_plural = 'Прогоны'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['project', '-created_at', '-id'], name='testrun_project_created_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.project.name} - {self.name}"
+
+
+class TestResult(models.Model):
+    """Результат выполнения тест-кейса в прогоне"""
+    
+    STATUS_UNTESTED = 'untested'
+    STATUS_PASSED = 'passed'
+    STATUS_FAILED = 'failed'
+    STATUS_BLOCKED = 'blocked'
+    STATUS_SKIPPED = 'skipped'
+    STATUS_CHOICES = [
+        (STATUS_UNTESTED, 'Не выполнен'),
+        (STATUS_PASSED, 'Пройден'),
+        (STATUS_FAILED, 'Провален'),
+        (STATUS_BLOCKED, 'Заблокирован'),
+        (STATUS_SKIPPED, 'Пропущен'),
+    ]
+    
+    run = models.ForeignKey(
+        TestRun,
+        on_delete=models.CASCADE,
+        related_name='results',
+        verbose_name='Прогон'
+    )
+    test_case = models.ForeignKey(
+        TestCase,
+        on_delete=models.CASCADE,
+        related_name='results',
+        verbose_name='Тест-кейс'
+    )
+    status = models.CharField(
+        max_length=10,
+        choices=STATUS_CHOICES,
+        default=STATUS_UNTESTED,
+        verbose_name='Статус'
+    )
+    comment = models.TextField(blank=True, default='', verbose_name='Комментарий')
+    updated_by = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='updated_results',
+        verbose_name='Изменен пользователем'
+    )
+    updated_at = models.DateTimeField(null=True, blank=True, verbose_name='Изменен')
+    
+    class Meta:
+        verbose_name = 'Результат'
+        verbose_name_plural = 'Результаты'
+        ordering = ['id']
+        constraints = [
+            # Цель upsert статусов: INSERT ... ON CONFLICT (run_id, test_case_id)
+            models.UniqueConstraint(fields=['run', 'test_case'], name='testresult_run_case_unique'),
+        ]
+        indexes = [
+            # Сводка прогона по статусам читается только из индекса
+            models.Index(fields=['run', 'status'], name='testresult_run_status_idx'),
+            # Постраничный вывод результатов прогона
+            models.Index(fields=['run', 'id'], name='testresult_run_id_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.run_id}: {self.test_case_id} ({self.get_status_display()})"
@@ -0,0 +1,161 @@
+import base64
+import binascii
+import json
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+
+
+# Количество элементов на одной странице списков
+PAGE_SIZE = 30
+
+# Допустимые сортировки: ключ из GET-параметра sort -> поля order_by.
+# Последнее поле всегда id, чтобы порядок был строгим и курсор однозначным.
+TESTCASE_ORDERINGS = {
+    'created': ('-created_at', '-id'),
+    'title': ('title', 'id'),
+}
+
+PROJECT_ORDERINGS = {
+    'created': ('-created_at', '-id'),
+    'name': ('name', 'id'),
+    'updated': ('-updated_at', '-id'),
+}
+
+
+class KeysetPage:
+    """Страница результатов курсорной пагинации"""
+
+    def __init__(self, object_list, next_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __bool__(self):
+        return bool(self.object_list)
+
+
+def _parse_ordering(ordering):
+    """Возвращает список пар (имя поля, по убыванию)"""
+    return [(name.lstrip('-'), name.startswith('-')) for name in ordering]
+
+
+def encode_cursor(obj, ordering):
+    """
+    Кодирует позицию объекта в курсор
+
+    Args:
+        obj: Последний объект текущей страницы
+        ordering: Поля сортировки
+
+    Returns:
+        str: Курсор в формате urlsafe base64
+    """
+    values = []
+    for name, _ in _parse_ordering(ordering):
+        value = getattr(obj, name)
+        if hasattr(value, 'isoformat'):
+            value = value.isoformat()
+        values.append(value)
+    raw = json.dumps(values, ensure_ascii=False).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor, model, ordering):
+    """
+    Декодирует курсор в значения полей сортировки
+
+    Args:
+        cursor: Курсор из GET-параметра
+        model: Модель, для которой строится выборка
+        ordering: Поля сортировки
+
+    Returns:
+        list: Значения полей или None, если курсор поврежден
+    """
+    fields = _parse_ordering(ordering)
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except (ValueError, TypeError, binascii.Error, UnicodeError):
+        return None
+
+    if not isinstance(values, list) or len(values) != len(fields):
+        return None
+
+    try:
+        return [
+            _field_to_python(model, name, value)
+            for (name, _), value in zip(fields, values)
+        ]
+    except ValidationError:
+        return None
+
+
+def _field_to_python(model, name, value):
+    """Приводит значение из курсора к типу поля модели"""
+    try:
+        field = model._meta.get_field(name)
+    except FieldDoesNotExist:
+        # Аннотация выборки (например, релевантность поиска) -
+        # значение из JSON используется как есть
+        return value
+    return field.to_python(value)
+
+
+def keyset_filter(ordering, values):
+    """
+    Строит условие "строго после курсора" для заданной сортировки
+
+    Для сортировки (a DESC, b DESC) и значений (x, y) получается
+    a < x OR (a = x AND b < y).
+    """
+    fields = _parse_ordering(ordering)
+    condition = Q()
+    for index, (name, descending) in enumerate(fields):
+        lookup = 'lt' if descending else 'gt'
+        step = Q(**{f'{name}__{lookup}': values[index]})
+        for prev_index, (prev_name, _) in enumerate(fields[:index]):
+            step &= Q(**{prev_name: values[prev_index]})
+        condition |= step
+    return condition
+
+
+def paginate_keyset(queryset, ordering, cursor=None, per_page=PAGE_SIZE):
+    """
+    Возвращает страницу выборки, начиная с позиции курсора
+
+    Вместо OFFSET и COUNT(*) используется условие по полям сортировки,
+    поэтому стоимость запроса не зависит от номера страницы.
+
+    Args:
+        queryset: Исходная выборка
+        ordering: Поля сортировки (последним должен идти id); кроме полей
+            модели допускаются аннотации выборки
+        cursor: Курсор из предыдущей страницы
+        per_page: Размер страницы
+
+    Returns:
+        KeysetPage: Страница с элементами и курсором следующей страницы
+    """
+    if cursor:
+        values = decode_cursor(cursor, queryset.model, ordering)
+        if values is not None:
+            queryset = queryset.filter(keyset_filter(ordering, values))
+
+    items = list(queryset.order_by(*ordering)[:per_page + 1])
+    next_cursor = None
+    if len(items) > per_page:
+        items = items[:per_page]
+        next_cursor = encode_cursor(items[-1], ordering)
+
+    return KeysetPage(items, next_cursor)
@@ -0,0 +1,135 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import F
+
+from .models import ProjectMember
+
+
+# Уровни ролей в проекте: чем больше, тем больше прав
+ROLE_HIERARCHY = {'viewer': 1, 'editor': 2, 'admin': 3}
+
+# Время жизни карты ролей в кэше (секунды)
+ROLES_CACHE_TIMEOUT = getattr(settings, 'PROJECT_ROLES_CACHE_TIMEOUT', 60 * 60)
+
+
+def invalidate_project_roles(user_ids):
+    """
+    Сбрасывает закэшированные карты ролей пользователей
+
+    Версия карты хранится в строке пользователя и увеличивается в той же
+    транзакции, что и изменение участия. Пользователь загружается заново
+    на каждый запрос, поэтому все процессы (воркеры gunicorn, фоновые
+    задачи) видят новую версию сразу после фиксации, а до нее - старую
+    версию вместе со старыми данными.
+
+    Args:
+        user_ids: ID пользователей, чье участие в проектах изменилось
+    """
+    user_ids = {user_id for user_id in user_ids if user_id}
+    if user_ids:
+        get_user_model().objects.filter(pk__in=user_ids).update(roles_version=F('roles_version') + 1)
+
+
+class ProjectPermissionResolver:
+    """
+    Права пользователя во всех проектах в рамках одного запроса
+
+    Карта {project_id: role} берется из кэша по версии ролей пользователя
+    (User.roles_version), а при промахе загружается одним запросом. Все
+    последующие проверки в запросе отвечают из памяти.
+    """
+
+    def __init__(self, user):
+        self.user = user
+        self._roles = None
+
+    @property
+    def is_admin(self):
+        return bool(getattr(self.user, 'is_admin', False))
+
+    @property
+    def roles(self):
+        """Роли пользователя в проектах: {project_id: role}"""
+        if self._roles is None:
+            if self.is_admin or not self.user.is_authenticated:
+                self._roles = {}
+            else:
+                self._roles = self._load_roles()
+        return self._roles
+
+    def _load_roles(self):
+        """Загружает карту ролей из кэша или из БД"""
+        key = f'project_roles:{self.user.pk}:{self.user.roles_version}'
+        roles = cache.get(key)
+        if roles is None:
+            # Только из основной базы: с отстающей реплики под новой версией
+            # закэшировалась бы карта ролей до изменения
+            roles = dict(
+                ProjectMember.objects.using(DEFAULT_DB_ALIAS)
+                .filter(user=self.user).values_list('project_id', 'role')
+            )
+            cache.set(key, roles, ROLES_CACHE_TIMEOUT)
+        return roles
+
+    def reset(self):
+        """Сбрасывает загруженную карту ролей"""
+        self._roles = None
+
+    def get_role(self, project):
+        """
+        Возвращает роль пользователя в проекте
+
+        Args:
+            project: Проект или его ID
+
+        Returns:
+            str: Роль пользователя или None если нет доступа
+        """
+        # Системные администраторы имеют роль администратора во всех проектах
+        if self.is_admin:
+            return 'admin'
+        project_id = getattr(project, 'pk', project)
+        return self.roles.get(project_id)
+
+    def has_access(self, project, min_role=None):
+        """
+        Проверяет, есть ли у пользователя доступ к проекту
+
+        Args:
+            project: Проект или его ID
+            min_role: Минимальная требуемая роль ('viewer', 'editor', 'admin')
+
+        Returns:
+            bool: True если есть доступ, False иначе
+        """
+        role = self.get_role(project)
+        if role is None:
+            return False
+        if min_role is None:
+            return True
+        return ROLE_HIERARCHY.get(role, 0) >= ROLE_HIERARCHY.get(min_role, 0)
+
+    def can_view_project(self, project):
+        return self.has_access(project, min_role='viewer')
+
+    def can_edit_project(self, project):
+        return self.has_access(project, min_role='admin')
+
+    def can_edit_testcases(self, project):
+        return self.has_access(project, min_role='editor')
+
+
+def get_project_permissions(user):
+    """
+    Возвращает резолвер прав для пользователя
+
+    Резолвер хранится на объекте пользователя, а он создается заново на
+    каждый запрос, поэтому кэш ролей живет ровно один запрос.
+    """
+    resolver = getattr(user, '_project_permissions', None)
+    if resolver is None:
+        resolver = ProjectPermissionResolver(user)
+        user._project_permissions = resolver
+    return resolver
@@ -0,0 +1,103 @@
+from django.db import connection, transaction
+
+from .models import Project, ProjectMember, ProjectStats, Section, TestCase, TestResult, TestRun
+from .permissions import invalidate_project_roles
+
+
+# Количество строк, удаляемых одним DELETE. Каждая пачка - отдельная
+# короткая транзакция, поэтому блокировки не держатся долго.
+PURGE_BATCH_SIZE = 5000
+
+
+def mark_project_deleted(project):
+    """
+    Помечает проект удаленным
+
+    Проект сразу пропадает из списков и становится недоступен, а его
+    данные удаляет фоновая задача purge_project.
+
+    Args:
+        project: Проект
+    """
+    with transaction.atomic():
+        Project.objects.filter(pk=project.pk).update(is_deleted=True)
+        invalidate_project_roles(
+            list(ProjectMember.objects.filter(project=project).values_list('user_id', flat=True))
+        )
+    project.is_deleted = True
+
+
+def _purge_steps():
+    """
+    Таблицы в порядке удаления: (модель, условие отбора, ORDER BY)
+
+    Результаты прогонов удаляются раньше тест-кейсов, на которые
+    ссылаются. Секции удаляются от самых глубоких к корневым, чтобы
+    в пачку не попал родитель без своих потомков.
+    """
+    runs_table = connection.ops.quote_name(TestRun._meta.db_table)
+    return [
+        (TestResult, f'run_id IN (SELECT id FROM {runs_table} WHERE project_id = %s)', ''),
+        (TestRun, 'project_id = %s', ''),
+        (TestCase, 'project_id = %s', ''),
+        (Section, 'project_id = %s', 'ORDER BY char_length(path) DESC'),
+        (ProjectMember, 'project_id = %s', ''),
+    ]
+
+
+def _delete_batch(model, where, order_by, project_id, batch_size):
+    """Удаляет одну пачку строк проекта и возвращает их количество"""
+    table = connection.ops.quote_name(model._meta.db_table)
+    sql = (
+        f'DELETE FROM {table} WHERE id IN ('
+        f'SELECT id FROM {table} WHERE {where} {order_by} LIMIT %s)'
+    )
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(sql, [project_id, batch_size])
+        return cursor.rowcount
+
+
+def purge_project(project_id, batch_size=PURGE_BATCH_SIZE, progress=None):
+    """
+    Удаляет данные проекта пачками и затем сам проект
+
+    В отличие от project.delete() объекты не загружаются в память и
+    сигналы не вызываются: строки удаляются SQL-запросами DELETE по
+    batch_size штук. Удаляются только проекты, помеченные удаленными.
+
+    Args:
+        project_id: ID проекта
+        batch_size: Количество строк в одном DELETE
+        progress: Функция progress(удалено строк в пачке)
+
+    Returns:
+        int: Количество удаленных строк
+    """
+    if not Project.objects.filter(pk=project_id, is_deleted=True).exists():
+        return 0
+
+    deleted = 0
+    for model, where, order_by in _purge_steps():
+        while True:
+            count = _delete_batch(model, where, order_by, project_id, batch_size)
+            deleted += count
+            if progress and count:
+                progress(count)
+            if count < batch_size:
+                break
+
+    # Связанных строк не осталось - каскад затронет только статистику
+    Project.objects.filter(pk=project_id).delete()
+    return deleted
+
+
+def get_purge_total(project_id):
+    """Ожидаемое количество удаляемых строк по счетчикам проекта"""
+    stats = ProjectStats.objects.filter(project_id=project_id).first()
+    if stats is None:
+        return None
+    runs = TestRun.objects.filter(project_id=project_id)
+    return (
+        stats.test_case_count + stats.section_count + stats.member_count
+        + runs.count() + TestResult.objects.filter(run__in=runs).count()
+    )
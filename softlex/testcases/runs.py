@@ -0,0 +1,178 @@
+from django.db import connection, transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from .models import TestCase, TestResult, TestRun
+
+
+# Количество результатов в одном INSERT ... ON CONFLICT при смене статусов
+RESULTS_BATCH_SIZE = 1000
+
+STATUS_LABELS = dict(TestResult.STATUS_CHOICES)
+
+
+def create_run(project, name, user, section=None):
+    """
+    Создает прогон и результаты для всех его тест-кейсов
+
+    Строки результатов вставляются одним INSERT ... SELECT по выборке
+    тест-кейсов проекта (или поддерева секции) без загрузки в Python.
+    Порядок ID результатов повторяет порядок секций и названий.
+
+    Args:
+        project: Проект
+        name: Название прогона
+        user: Создатель прогона
+        section: Секция, тест-кейсы поддерева которой входят в прогон
+
+    Returns:
+        tuple: (прогон, количество результатов)
+    """
+    test_cases = TestCase.objects.filter(project=project)
+    if section is not None:
+        test_cases = test_cases.filter(section__path__startswith=section.path)
+    select_sql, select_params = (
+        test_cases
+        .order_by('section__path', 'title', 'id')
+        .values_list('pk', flat=True)
+        .query.sql_with_params()
+    )
+    table = connection.ops.quote_name(TestResult._meta.db_table)
+
+    with transaction.atomic():
+        run = TestRun.objects.create(name=name, project=project, section=section, created_by=user)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'INSERT INTO {table} (run_id, test_case_id, status, comment) '
+                f'SELECT %s, test_cases.id, %s, %s FROM ({select_sql}) AS test_cases (id)',
+                [run.pk, TestResult.STATUS_UNTESTED, '', *select_params]
+            )
+            count = cursor.rowcount
+    return run, count
+
+
+def update_results(run, statuses, user, comment=None):
+    """
+    Устанавливает статусы многих тест-кейсов прогона
+
+    Изменения записываются upsert-ом (INSERT ... ON CONFLICT DO UPDATE)
+    пачками по RESULTS_BATCH_SIZE. Тест-кейсы проекта, добавленные после
+    создания прогона, получают новую строку результата; ID не из проекта
+    прогона пропускаются.
+
+    Args:
+        run: Прогон
+        statuses: Словарь {ID тест-кейса: статус}
+        user: Пользователь, выставивший статусы
+        comment: Комментарий (None - не менять существующий)
+
+    Returns:
+        int: Количество записанных результатов
+
+    Raises:
+        ValueError: Если передан неизвестный статус
+    """
+    unknown = set(statuses.values()) - STATUS_LABELS.keys()
+    if unknown:
+        raise ValueError(f'Неизвестный статус: {", ".join(sorted(unknown))}')
+
+    case_ids = TestCase.objects.filter(
+        project_id=run.project_id, pk__in=list(statuses)
+    ).values_list('pk', flat=True)
+    return upsert_results(
+        run,
+        [(case_id, statuses[case_id], comment or '') for case_id in case_ids],
+        user,
+        update_comment=comment is not None,
+    )
+
+
+def upsert_results(run, rows, user, update_comment=True):
+    """
+    Записывает результаты прогона через INSERT ... ON CONFLICT DO UPDATE
+
+    Args:
+        run: Прогон
+        rows: Строки (ID тест-кейса, статус, комментарий); тест-кейсы
+            должны принадлежать проекту прогона
+        user: Пользователь, выставивший статусы
+        update_comment: Перезаписывать комментарий существующих результатов
+
+    Returns:
+        int: Количество записанных результатов
+    """
+    now = timezone.now()
+    update_fields = ['status', 'updated_by', 'updated_at']
+    if update_comment:
+        update_fields.append('comment')
+
+    results = TestResult.objects.bulk_create(
+        [
+            TestResult(
+                run=run,
+                test_case_id=case_id,
+                status=status,
+                comment=comment,
+                updated_by=user,
+                updated_at=now,
+            )
+            for case_id, status, comment in rows
+        ],
+        update_conflicts=True,
+        unique_fields=['run', 'test_case'],
+        update_fields=update_fields,
+        batch_size=RESULTS_BATCH_SIZE,
+    )
+    return len(results)
+
+
+def _summarize(counts):
+    """Сводка по словарю {статус: количество}"""
+    total = sum(counts.values())
+    done = total - counts.get(TestResult.STATUS_UNTESTED, 0)
+    return {
+        'total': total,
+        'done': done,
+        'percent': done * 100 // total if total else 0,
+        'statuses': [(status, label, counts.get(status, 0)) for status, label in TestResult.STATUS_CHOICES],
+    }
+
+
+def get_run_summary(run):
+    """
+    Сводка прогона по статусам одним агрегирующим запросом
+
+    Returns:
+        dict: total, done (выполненные), percent и statuses - список
+        (статус, название, количество) в порядке STATUS_CHOICES
+    """
+    counts = dict(
+        TestResult.objects
+        .filter(run=run)
+        .order_by()
+        .values_list('status')
+        .annotate(total=Count('id'))
+    )
+    return _summarize(counts)
+
+
+def attach_run_summaries(runs):
+    """
+    Добавляет сводку (атрибут summary) к каждому прогону списка
+
+    Количество результатов по статусам для всех прогонов считается
+    одним запросом по индексу (run_id, status).
+    """
+    counts = {run.pk: {} for run in runs}
+    rows = (
+        TestResult.objects
+        .filter(run_id__in=list(counts))
+        .order_by()
+        .values_list('run_id', 'status')
+        .annotate(total=Count('id'))
+    )
+    for run_id, status, total in rows:
+        counts[run_id][status] = total
+    for run in runs:
+        run.summary = _summarize(counts[run.pk])
+    return runs
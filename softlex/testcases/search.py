@@ -0,0 +1,80 @@
+from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank
+from django.db.models import F, TextField, Value
+from django.db.models.functions import Concat
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+
+# Максимальное количество результатов поиска на странице
+SEARCH_RESULTS_LIMIT = 50
+
+# Маркеры подсветки. PostgreSQL возвращает фрагменты без экранирования,
+# поэтому подсветка ставится служебными символами и превращается
+# в <mark> уже после экранирования текста.
+HIGHLIGHT_START = '\x02'
+HIGHLIGHT_STOP = '\x03'
+
+
+def build_search_query(text):
+    """
+    Строит запрос к поисковому вектору тест-кейса
+
+    Поддерживает синтаксис веб-поиска: "фраза", -исключение, OR.
+    Совпадение ищется и с учетом морфологии, и по точным токенам.
+    """
+    return (
+        SearchQuery(text, config='russian', search_type='websearch')
+        | SearchQuery(text, config='simple', search_type='websearch')
+    )
+
+
+def search_test_cases(queryset, text, limit=SEARCH_RESULTS_LIMIT):
+    """
+    Ищет тест-кейсы по полнотекстовому индексу
+
+    Args:
+        queryset: Тест-кейсы, среди которых выполняется поиск
+        text: Поисковый запрос пользователя
+        limit: Максимальное количество результатов
+
+    Returns:
+        list: Тест-кейсы по убыванию релевантности с атрибутами
+        rank, title_snippet и text_snippet
+    """
+    query = build_search_query(text)
+    highlight = {
+        'config': 'russian',
+        'start_sel': HIGHLIGHT_START,
+        'stop_sel': HIGHLIGHT_STOP,
+    }
+    results = (
+        queryset
+        .filter(search_vector=query)
+        .annotate(
+            rank=SearchRank(F('search_vector'), query),
+            title_snippet=SearchHeadline('title', query, highlight_all=True, **highlight),
+            text_snippet=SearchHeadline(
+                Concat(
+                    'description', Value(' '),
+                    'preconditions', Value(' '),
+                    'steps', Value(' '),
+                    'expected_result',
+                    output_field=TextField()
+                ),
+                query,
+                max_fragments=2,
+                fragment_delimiter=' … ',
+                **highlight
+            ),
+        )
+        .order_by('-rank', '-id')
+    )
+    return list(results[:limit])
+
+
+def render_highlight(snippet):
+    """Экранирует фрагмент и заменяет маркеры подсветки на <mark>"""
+    escaped = escape(snippet or '')
+    return mark_safe(
+        escaped.replace(HIGHLIGHT_START, '<mark>').replace(HIGHLIGHT_STOP, '</mark>')
+    )
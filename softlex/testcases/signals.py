@@ -0,0 +1,59 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Project, ProjectMember, ProjectStats, Section, TestCase
+from .permissions import invalidate_project_roles
+from .stats import adjust_project_stats
+
+
+# Модель -> счетчик в ProjectStats
+COUNTER_FIELDS = {
+    TestCase: 'test_case_count',
+    Section: 'section_count',
+    ProjectMember: 'member_count',
+}
+
+
+@receiver(post_save, sender=Project)
+def create_project_stats(sender, instance, created, **kwargs):
+    """Создает строку статистики для нового проекта"""
+    if created and not kwargs.get('raw'):
+        ProjectStats.objects.get_or_create(project=instance)
+
+
+def counted_object_saved(sender, instance, created, **kwargs):
+    """Увеличивает счетчик проекта при создании объекта"""
+    if kwargs.get('raw'):
+        return
+    field = COUNTER_FIELDS[sender]
+    if created:
+        adjust_project_stats(instance.project_id, **{field: 1})
+        instance._loaded_project_id = instance.project_id
+        return
+
+    # Исходный проект запоминает TestCase.from_db
+    previous_project_id = getattr(instance, '_loaded_project_id', None)
+    instance._loaded_project_id = instance.project_id
+    if previous_project_id and previous_project_id != instance.project_id:
+        adjust_project_stats(previous_project_id, **{field: -1})
+        adjust_project_stats(instance.project_id, **{field: 1})
+
+
+def counted_object_deleted(sender, instance, origin=None, **kwargs):
+    """Уменьшает счетчик проекта при удалении объекта"""
+    # При удалении самого проекта его статистика удаляется каскадом
+    if isinstance(origin, Project):
+        return
+    adjust_project_stats(instance.project_id, **{COUNTER_FIELDS[sender]: -1})
+
+
+for model in COUNTER_FIELDS:
+    post_save.connect(counted_object_saved, sender=model, dispatch_uid=f'stats_saved_{model.__name__}')
+    post_delete.connect(counted_object_deleted, sender=model, dispatch_uid=f'stats_deleted_{model.__name__}')
+
+
+@receiver(post_save, sender=ProjectMember)
+@receiver(post_delete, sender=ProjectMember)
+def membership_changed(sender, instance, **kwargs):
+    """Сбрасывает закэшированные роли пользователя при изменении участия"""
+    invalidate_project_roles([instance.user_id])
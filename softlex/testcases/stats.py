@@ -0,0 +1,92 @@
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import Project, ProjectMember, ProjectStats, Section, TestCase
+
+
+# Поле счетчика -> модель, строки которой он считает
+COUNTED_MODELS = {
+    'test_case_count': TestCase,
+    'section_count': Section,
+    'member_count': ProjectMember,
+}
+
+
+def adjust_project_stats(project_id, **deltas):
+    """
+    Изменяет счетчики проекта на заданные величины
+
+    Выполняется одним UPDATE в текущей транзакции, поэтому счетчик
+    фиксируется или откатывается вместе с самой записью.
+
+    Args:
+        project_id: ID проекта
+        **deltas: Изменения счетчиков, например test_case_count=1
+    """
+    updates = {field: F(field) + delta for field, delta in deltas.items() if delta}
+    if not updates or project_id is None:
+        return
+
+    updated = ProjectStats.objects.filter(project_id=project_id).update(
+        updated_at=timezone.now(),
+        **updates
+    )
+    if not updated:
+        # Строки статистики нет (например, проект создан до ее появления) -
+        # пересчитываем проект целиком
+        refresh_project_stats([project_id])
+
+
+def _actual_count(model):
+    """Подзапрос с фактическим числом строк модели для проекта"""
+    counts = (
+        model.objects
+        .filter(project_id=OuterRef('project_id'))
+        .order_by()
+        .values('project_id')
+        .annotate(total=Count('pk'))
+        .values('total')
+    )
+    return Coalesce(Subquery(counts, output_field=IntegerField()), Value(0))
+
+
+def refresh_project_stats(project_ids=None):
+    """
+    Пересчитывает счетчики проектов по фактическим данным
+
+    Отсутствующие строки статистики создаются, расхождения исправляются
+    одним UPDATE с коррелированными подзапросами.
+
+    Args:
+        project_ids: ID проектов или None для всех проектов
+
+    Returns:
+        int: Количество исправленных строк статистики
+    """
+    projects = Project.objects.all()
+    if project_ids is not None:
+        projects = projects.filter(pk__in=project_ids)
+
+    missing = projects.filter(stats__isnull=True).values_list('pk', flat=True)
+    ProjectStats.objects.bulk_create(
+        [ProjectStats(project_id=pk) for pk in missing],
+        ignore_conflicts=True
+    )
+
+    stats = ProjectStats.objects.all()
+    if project_ids is not None:
+        stats = stats.filter(project_id__in=project_ids)
+
+    actual = {f'actual_{field}': _actual_count(model) for field, model in COUNTED_MODELS.items()}
+    drift = Q()
+    for field in COUNTED_MODELS:
+        drift |= ~Q(**{field: F(f'actual_{field}')})
+    drifted_ids = list(stats.annotate(**actual).filter(drift).values_list('project_id', flat=True))
+
+    if drifted_ids:
+        ProjectStats.objects.filter(project_id__in=drifted_ids).update(
+            updated_at=timezone.now(),
+            **{field: _actual_count(model) for field, model in COUNTED_MODELS.items()}
+        )
+    return len(drifted_ids)
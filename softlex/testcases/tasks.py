@@ -0,0 +1,151 @@
+from django.contrib.auth import get_user_model
+from django.core.files.storage import default_storage
+from django.urls import reverse
+
+from jobs.registry import JobFailed, job_task
+
+from .clone import clone_project
+from .importer import ImportFileError, import_test_cases
+from .junit import JUnitFileError, import_junit
+from .models import Project, TestResult, TestRun
+from .purge import get_purge_total, purge_project
+
+User = get_user_model()
+
+# Сколько несопоставленных ключей отчета JUnit показывать в итогах задачи
+JUNIT_UNKNOWN_SAMPLE = 10
+
+
+def get_active_project(project_id):
+    """Проект задачи; проект могли удалить, пока задача ждала в очереди"""
+    try:
+        return Project.objects.active().get(pk=project_id)
+    except Project.DoesNotExist:
+        raise JobFailed('Проект удален или не существует')
+
+
+def get_active_run(run_id):
+    """Прогон задачи из проекта, не помеченного на удаление"""
+    try:
+        return TestRun.objects.get(pk=run_id, project__in=Project.objects.active())
+    except TestRun.DoesNotExist:
+        raise JobFailed('Прогон удален или не существует')
+
+
+@job_task('testcases.import_test_cases', queue='imports')
+def import_test_cases_task(job, path, project_id, user_id, dry_run=True):
+    """Импорт тест-кейсов из загруженного файла Excel"""
+    action = 'Проверка' if dry_run else 'Импорт'
+    try:
+        project = get_active_project(project_id)
+        user = User.objects.get(pk=user_id)
+        job.set_progress(0, message=f'{action} файла...')
+        # Импорт идет одной транзакцией: прогресс пишется через отдельное соединение
+        with default_storage.open(path, 'rb') as file, job.progress_connection():
+            report = import_test_cases(
+                file, project, user,
+                dry_run=dry_run,
+                progress=lambda rows: job.set_progress(rows, message=f'{action}: обработано строк {rows}')
+            )
+    except ImportFileError as error:
+        return {'summary': [str(error)], 'errors': []}
+    finally:
+        default_storage.delete(path)
+
+    verb = 'Будет создано' if dry_run else 'Создано'
+    summary = [
+        f'Строк в файле: {report["rows"]}',
+        f'{verb} тест-кейсов: {report["created"]}, секций: {report["sections_created"]}',
+    ]
+    if report['error_count']:
+        summary.append(f'Строк с ошибками (пропущены): {report["error_count"]}')
+    job.set_progress(report['rows'], message='Проверка завершена' if dry_run else 'Импорт завершен')
+    # После проверки - вернуться к загрузке файла, после импорта - к проекту
+    url_name = 'testcases:testcase_import' if dry_run else 'testcases:project_detail'
+    return {
+        'summary': summary,
+        'errors': report['errors'],
+        'url': reverse(url_name, args=[project.pk]),
+        'url_label': 'Импортировать файл' if dry_run else 'Перейти к проекту',
+    }
+
+
+@job_task('testcases.purge_project')
+def purge_project_task(job, project_id, project_name=''):
+    """Удаление данных проекта, помеченного удаленным"""
+    job.set_progress(0, total=get_purge_total(project_id), message=f'Удаление проекта "{project_name}"...')
+    deleted = purge_project(
+        project_id,
+        progress=lambda count: job.add_progress(count, message=f'Удаление проекта "{project_name}"...')
+    )
+    job.set_progress(job.progress, message='Проект удален')
+    return {
+        'summary': [f'Проект "{project_name}" удален', f'Удалено записей: {deleted}'],
+        'errors': [],
+        'url': reverse('testcases:project_list'),
+        'url_label': 'К списку проектов',
+    }
+
+
+@job_task('testcases.clone_project')
+def clone_project_task(job, project_id, user_id, name, include_members=False):
+    """Копирование проекта с секциями и тест-кейсами"""
+    source = get_active_project(project_id)
+    user = User.objects.get(pk=user_id)
+    job.set_progress(0, message=f'Копирование проекта "{source.name}"...')
+    project, copied = clone_project(source, name, user, include_members=include_members)
+    job.set_progress(1, total=1, message='Проект скопирован')
+    summary = [
+        f'Создан проект "{project.name}"',
+        f'Скопировано секций: {copied["sections"]}, тест-кейсов: {copied["test_cases"]}',
+    ]
+    if include_members:
+        summary.append(f'Скопировано участников: {copied["members"]}')
+    return {
+        'summary': summary,
+        'errors': [],
+        'url': reverse('testcases:project_detail', args=[project.pk]),
+        'url_label': 'Перейти к проекту',
+    }
+
+
+@job_task('testcases.import_junit', queue='imports')
+def import_junit_task(job, path, run_id, user_id, create_missing=False):
+    """Загрузка результатов автотестов из отчета JUnit XML в прогон"""
+    try:
+        run = get_active_run(run_id)
+        user = User.objects.get(pk=user_id)
+        job.set_progress(0, message=f'Загрузка отчета в прогон "{run.name}"...')
+        with default_storage.open(path, 'rb') as file:
+            report = import_junit(
+                file, run, user,
+                create_missing=create_missing,
+                progress=lambda cases: job.set_progress(cases, message=f'Обработано тест-кейсов отчета: {cases}')
+            )
+    except JUnitFileError as error:
+        return {'summary': [str(error)], 'errors': []}
+    finally:
+        default_storage.delete(path)
+
+    labels = dict(TestResult.STATUS_CHOICES)
+    summary = [
+        f'Тест-кейсов в отчете: {report["cases"]}',
+        'По статусам: ' + ', '.join(
+            f'{labels[status].lower()} {count}' for status, count in report['statuses'].items()
+        ) if report['statuses'] else 'В отчете нет тест-кейсов',
+        f'Записано результатов: {report["recorded"]}',
+    ]
+    if report['created']:
+        summary.append(f'Создано тест-кейсов: {report["created"]}')
+    if report['unknown']:
+        summary.append(
+            f'Нет тест-кейсов с ключами автоматизации (пропущены): {report["unknown"]}, например: '
+            + ', '.join(report['unknown_keys'][:JUNIT_UNKNOWN_SAMPLE])
+        )
+    job.set_progress(report['cases'], message='Загрузка завершена')
+    return {
+        'summary': summary,
+        'errors': [],
+        'url': reverse('testcases:run_detail', args=[run.pk]),
+        'url_label': 'Перейти к прогону',
+    }
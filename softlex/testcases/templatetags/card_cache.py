@@ -0,0 +1,84 @@
+from django import template
+from django.conf import settings
+from django.core.cache import cache
+from django.core.cache.utils import make_template_fragment_key
+from django.utils.safestring import mark_safe
+
+from testcases.conditional import RELEASE_VERSION
+from testcases.models import Project
+from testcases.permissions import get_project_permissions
+
+register = template.Library()
+
+# Время жизни отрисованной карточки; устаревшие версии вытесняются сами,
+# так как ключ меняется вместе с данными
+CARD_CACHE_TIMEOUT = getattr(settings, 'CARD_CACHE_TIMEOUT', 24 * 60 * 60)
+
+
+def card_version(obj, user, show_project=False):
+    """
+    Значения, от которых зависит разметка карточки объекта
+
+    Роль зрителя определяет кнопки редактирования и удаления, даты
+    изменения - содержимое карточки. Счетчики проекта меняют дату
+    изменения его статистики.
+
+    Args:
+        obj: Проект или тест-кейс
+        user: Пользователь, для которого рисуется карточка
+        show_project: Выводится ли в карточке тест-кейса название проекта
+
+    Returns:
+        list: Значения для ключа кэша
+    """
+    permissions = get_project_permissions(user)
+    if isinstance(obj, Project):
+        stats = getattr(obj, 'stats', None)
+        return [obj.updated_at, stats and stats.updated_at, permissions.get_role(obj)]
+    version = [obj.updated_at, permissions.get_role(obj.project_id), show_project]
+    if show_project:
+        version.append(obj.project.updated_at)
+    return version
+
+
+@register.simple_tag(takes_context=True)
+def cached_cards(context, objects, template_name, name):
+    """
+    Рендерит карточки объектов страницы, кэшируя каждую отдельно
+
+    Ключ карточки - ID объекта и его версия (card_version). Все карточки
+    страницы читаются из кэша одним get_many, отсутствующие рисуются
+    шаблоном и записываются одним set_many.
+
+    Использование:
+        {% cached_cards page 'testcases/partials/testcase_card.html' 'test_case' %}
+
+    Args:
+        objects: Объекты страницы
+        template_name: Шаблон одной карточки
+        name: Имя переменной объекта в шаблоне карточки
+    """
+    objects = list(objects)
+    user = context['user']
+    show_project = bool(context.get('show_project'))
+    keys = [
+        make_template_fragment_key(
+            template_name, [RELEASE_VERSION, obj.pk, *card_version(obj, user, show_project)]
+        )
+        for obj in objects
+    ]
+    cached = cache.get_many(keys) if keys else {}
+
+    card_template = context.template.engine.get_template(template_name)
+    rendered = {}
+    cards = []
+    for key, obj in zip(keys, objects):
+        card = cached.get(key)
+        if card is None:
+            with context.push(**{name: obj}):
+                card = card_template.render(context)
+            rendered[key] = card
+        cards.append(card)
+    if rendered:
+        cache.set_many(rendered, CARD_CACHE_TIMEOUT)
+    return mark_safe(''.join(cards))
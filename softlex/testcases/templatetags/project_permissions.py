@@ -0,0 +1,23 @@
+from django import template
+
+from testcases.permissions import get_project_permissions
+
+register = template.Library()
+
+
+@register.filter
+def project_role(project, user):
+    """Роль пользователя в проекте: {{ project|project_role:user }}"""
+    return get_project_permissions(user).get_role(project)
+
+
+@register.filter
+def can_edit_testcases(project, user):
+    """Может ли пользователь изменять тест-кейсы проекта"""
+    return get_project_permissions(user).can_edit_testcases(project)
+
+
+@register.filter
+def can_edit_project(project, user):
+    """Может ли пользователь изменять и удалять проект"""
+    return get_project_permissions(user).can_edit_project(project)
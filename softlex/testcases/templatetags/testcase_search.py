@@ -0,0 +1,11 @@
+from django import template
+
+from testcases.search import render_highlight
+
+register = template.Library()
+
+
+@register.filter
+def highlight(snippet):
+    """Фрагмент с подсветкой совпадений: {{ test_case.text_snippet|highlight }}"""
+    return render_highlight(snippet)
@@ -0,0 +1,19 @@
+from django import template
+
+register = template.Library()
+
+
+# Цвет Bootstrap для статуса результата
+STATUS_COLORS = {
+    'untested': 'secondary',
+    'passed': 'success',
+    'failed': 'danger',
+    'blocked': 'warning',
+    'skipped': 'info',
+}
+
+
+@register.filter
+def status_color(status):
+    """Класс цвета Bootstrap для статуса результата прогона"""
+    return STATUS_COLORS.get(status, 'secondary')
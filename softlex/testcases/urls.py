@@ -7,9 +7,20 @@ urlpatterns = [
     path('', views.home_view, name='home'),
     path('projects/', views.project_list, name='project_list'),
     path('projects/<int:pk>/', views.project_detail, name='project_detail'),
+    path('projects/<int:pk>/export/', views.project_export, name='project_export'),
+    path('projects/<int:pk>/sections/<int:section_pk>/children/', views.section_children, name='section_children'),
+    path('projects/<int:pk>/sections/<int:section_pk>/export/', views.project_export, name='section_export'),
+    path('projects/<int:pk>/import/', views.testcase_import, name='testcase_import'),
+    path('projects/<int:pk>/clone/', views.project_clone, name='project_clone'),
     path('projects/<int:pk>/edit/', views.project_edit, name='project_edit'),
+    path('projects/<int:pk>/members/bulk/', views.project_members_bulk, name='project_members_bulk'),
     path('projects/<int:pk>/delete/', views.project_delete, name='project_delete'),
+    path('projects/<int:pk>/runs/', views.run_list, name='run_list'),
+    path('projects/<int:pk>/junit/', views.junit_upload, name='junit_upload'),
+    path('runs/<int:pk>/', views.run_detail, name='run_detail'),
+    path('runs/<int:pk>/results/', views.run_results_update, name='run_results_update'),
     path('testcases/', views.testcase_list, name='testcase_list'),
+    path('testcases/search/', views.testcase_search, name='testcase_search'),
     path('testcases/<int:pk>/', views.testcase_detail, name='testcase_detail'),
     path('testcases/<int:pk>/edit/', views.testcase_edit, name='testcase_edit'),
     path('testcases/<int:pk>/delete/', views.testcase_delete, name='testcase_delete'),
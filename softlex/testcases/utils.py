@@ -1,5 +1,7 @@
-from django.db.models import Q
-from .models import Project, ProjectMember
+from django.db.models import Count, IntegerField, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+from .models import Project, Section, TestCase
+from .permissions import get_project_permissions
 
 
 def has_project_access(user, project, min_role=None):
@@ -14,26 +16,7 @@ def has_project_access(user, project, min_role=None):
     Returns:
         bool: True если есть доступ, False иначе
     """
-    # Системные администраторы имеют полный доступ ко всем проектам
-    if user.is_admin:
-        return True
-    
-    # Проверяем, есть ли пользователь в участниках проекта
-    try:
-        membership = ProjectMember.objects.get(project=project, user=user)
-        
-        if min_role is None:
-            return True
-        
-        # Проверяем уровень доступа
-        role_hierarchy = {'viewer': 1, 'editor': 2, 'admin': 3}
-        user_level = role_hierarchy.get(membership.role, 0)
-        required_level = role_hierarchy.get(min_role, 0)
-        
-        return user_level >= required_level
-        
-    except ProjectMember.DoesNotExist:
-        return False
+    return get_project_permissions(user).has_access(project, min_role=min_role)
 
 
 def get_user_project_role(user, project):
@@ -47,15 +30,7 @@ def get_user_project_role(user, project):
     Returns:
         str: Роль пользователя или None если нет доступа
     """
-    # Системные администраторы имеют роль администратора во всех проектах
-    if user.is_admin:
-        return 'admin'
-    
-    try:
-        membership = ProjectMember.objects.get(project=project, user=user)
-        return membership.role
-    except ProjectMember.DoesNotExist:
-        return None
+    return get_project_permissions(user).get_role(project)
 
 
 def get_accessible_projects(user):
@@ -70,10 +45,11 @@ def get_accessible_projects(user):
     """
     # Системные администраторы видят все проекты
     if user.is_admin:
-        return Project.objects.all()
+        return Project.objects.active()
     
-    # Получаем проекты, где пользователь является участником
-    return Project.objects.filter(members__user=user).distinct()
+    # Получаем проекты, где пользователь является участником,
+    # по уже загруженной (и закэшированной) карте ролей
+    return Project.objects.active().filter(pk__in=list(get_project_permissions(user).roles))
 
 
 def can_edit_project(user, project):
@@ -116,3 +92,70 @@ def can_view_project(user, project):
         bool: True если может просматривать, False иначе
     """
     return has_project_access(user, project, min_role='viewer')
+
+
+def get_section_tree(project):
+    """
+    Получает дерево секций проекта одним запросом
+    
+    Секции выбираются в порядке материализованного пути, дочерние
+    узлы раскладываются по родителям в памяти.
+    
+    Args:
+        project: Проект
+    
+    Returns:
+        list: Корневые секции; у каждой секции в tree_children лежат
+        дочерние секции в порядке order, name
+    """
+    sections = list(Section.objects.filter(project=project).order_by('path'))
+    by_id = {section.pk: section for section in sections}
+    roots = []
+    for section in sections:
+        section.tree_children = []
+        parent = by_id.get(section.parent_id)
+        (parent.tree_children if parent else roots).append(section)
+    
+    for siblings in [roots] + [section.tree_children for section in sections]:
+        siblings.sort(key=lambda section: (section.order, section.name))
+    return roots
+
+
+def _count_subquery(queryset, field):
+    """Количество строк queryset, у которых field ссылается на текущую секцию"""
+    counts = (
+        queryset
+        .filter(**{field: OuterRef('pk')})
+        .order_by()
+        .values(field)
+        .annotate(total=Count('pk'))
+        .values('total')
+    )
+    return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+
+def get_section_nodes(project, parent=None):
+    """
+    Получает один уровень дерева секций со счетчиками
+    
+    Счетчики считаются коррелированными подзапросами по индексам
+    parent_id и section_id, поэтому стоимость не зависит от размера
+    остального дерева.
+    
+    Args:
+        project: Проект
+        parent: Родительская секция или None для корневого уровня
+    
+    Returns:
+        QuerySet: Секции уровня с атрибутами children_count (дочерние
+        секции) и case_count (тест-кейсы непосредственно в секции)
+    """
+    return (
+        Section.objects
+        .filter(project=project, parent=parent)
+        .annotate(
+            children_count=_count_subquery(Section.objects.all(), 'parent'),
+            case_count=_count_subquery(TestCase.objects.all(), 'section'),
+        )
+        .order_by('order', 'name')
+    )
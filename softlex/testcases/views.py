@@ -1,16 +1,40 @@
+import uuid
+
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.http import JsonResponse
+from django.http import HttpResponseBadRequest, JsonResponse, StreamingHttpResponse
+from django.utils.http import content_disposition_header
 from django.views.decorators.http import require_http_methods
 from django.views.decorators.csrf import csrf_exempt
 from django.template.loader import render_to_string
 from django.core.exceptions import PermissionDenied
-from .models import Project, TestCase
-from .forms import ProjectForm, TestCaseForm
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import Max
+from jobs.registry import enqueue
+from softlex.instrumentation import query_budget
+from .models import Project, Section, TestCase, TestResult, TestRun
+from .conditional import PageValidators
+from .export import export_filename, stream_test_cases_xlsx
+from .forms import (
+    BulkMembersForm,
+    JUnitUploadForm,
+    ProjectCloneForm,
+    ProjectForm,
+    RunResultsForm,
+    TestCaseForm,
+    TestCaseImportForm,
+    TestRunForm,
+)
 from .mixins import UserPermissionMixin
+from .pagination import PROJECT_ORDERINGS, TESTCASE_ORDERINGS, paginate_keyset
+from .purge import mark_project_deleted
+from .runs import attach_run_summaries, create_run, get_run_summary, update_results
+from .search import search_test_cases
 from .utils import (
     get_accessible_projects, 
+    get_section_nodes,
     has_project_access, 
     can_edit_project, 
     can_edit_testcase,
@@ -19,11 +43,70 @@ from .utils import (
 )
 
 
+TESTCASE_SORT_CHOICES = [
+    ('created', 'По дате создания'),
+    ('title', 'По названию'),
+]
+
+PROJECT_SORT_CHOICES = [
+    ('created', 'По дате создания'),
+    ('name', 'По названию'),
+    ('updated', 'По дате обновления'),
+]
+
+# Количество тест-кейсов, подгружаемых в узел дерева секций за раз
+SECTION_TESTCASES_PAGE_SIZE = 50
+
+# Сортировка и размер страниц прогонов и их результатов
+RUN_ORDERING = ('-created_at', '-id')
+RUN_RESULTS_ORDERING = ('id',)
+RUN_RESULTS_PAGE_SIZE = 100
+
+
+def get_list_params(request, orderings):
+    """
+    Извлекает параметры поиска, сортировки и вида списка из GET-запроса
+    
+    Args:
+        request: HTTP-запрос
+        orderings: Словарь допустимых сортировок
+    
+    Returns:
+        dict: search, sort, view_mode
+    """
+    sort = request.GET.get('sort', 'created')
+    if sort not in orderings:
+        sort = 'created'
+    view_mode = request.GET.get('view', 'grid')
+    if view_mode not in ('grid', 'list'):
+        view_mode = 'grid'
+    return {
+        'search': request.GET.get('search', '').strip(),
+        'sort': sort,
+        'view_mode': view_mode,
+    }
+
+
+def render_list(request, template_name, context, results_template, items_template):
+    """
+    Рендерит страницу списка или ее HTMX-фрагмент
+    
+    Запрос следующей страницы (с курсором) получает только новые элементы,
+    запрос с изменёнными фильтрами — блок результатов целиком.
+    """
+    if request.htmx and request.method == 'GET':
+        if request.GET.get('cursor'):
+            return render(request, items_template, context)
+        return render(request, results_template, context)
+    return render(request, template_name, context)
+
+
 def home_view(request):
     """Главная страница"""
     return render(request, 'home.html')
 
 
+@query_budget(8)
 @login_required
 def project_list(request):
     """Список проектов"""
@@ -32,8 +115,6 @@ def project_list(request):
         messages.error(request, 'Ваш аккаунт заблокирован')
         return redirect('users:login')
     
-    projects = get_accessible_projects(request.user).prefetch_related('test_cases')
-    
     # Обработка создания проекта
     if request.method == 'POST':
         form = ProjectForm(request.POST, user=request.user)
@@ -46,18 +127,23 @@ def project_list(request):
     else:
         form = ProjectForm(user=request.user)
     
-    # Получаем список всех пользователей для выбора в форме создания проекта
-    from django.contrib.auth import get_user_model
-    User = get_user_model()
-    all_users = User.objects.filter(is_active=True).exclude(id=request.user.id)
+    # Фильтрация и курсорная пагинация на стороне сервера
+    params = get_list_params(request, PROJECT_ORDERINGS)
+    projects = get_accessible_projects(request.user).select_related('created_by', 'stats')
+    if params['search']:
+        projects = projects.filter(name__icontains=params['search'])
+    page = paginate_keyset(projects, PROJECT_ORDERINGS[params['sort']], request.GET.get('cursor'))
     
-    return render(request, 'testcases/project_list.html', {
-        'projects': projects,
+    return render_list(request, 'testcases/project_list.html', {
+        'page': page,
+        'filters_active': bool(params['search']),
+        'sort_choices': PROJECT_SORT_CHOICES,
         'form': form,
-        'all_users': all_users
-    })
+        **params,
+    }, 'testcases/partials/project_results.html', 'testcases/partials/project_items.html')
 
 
+@query_budget(16)
 @login_required
 def project_detail(request, pk):
     """Детальная страница проекта"""
@@ -66,14 +152,17 @@ def project_detail(request, pk):
         messages.error(request, 'Ваш аккаунт заблокирован')
         return redirect('users:login')
     
-    project = get_object_or_404(Project, pk=pk)
+    project = get_object_or_404(Project.objects.active().select_related('stats', 'created_by'), pk=pk)
     
     # Проверяем доступ к проекту
     if not can_view_project(request.user, project):
         raise PermissionDenied("У вас нет доступа к этому проекту")
-    test_cases = TestCase.objects.filter(project=project)
+    
+    # Получаем роль пользователя в проекте
+    user_role = get_user_project_role(request.user, project)
     
     # Обработка создания тест-кейса
+    validators = None
     if request.method == 'POST':
         form = TestCaseForm(request.POST, user=request.user)
         if form.is_valid():
@@ -83,19 +172,153 @@ def project_detail(request, pk):
         else:
             messages.error(request, 'Ошибка при создании тест-кейса. Проверьте данные.')
     else:
+        # Условный GET: при неизменных данных и роли ответ 304 отдается до
+        # выборки тест-кейсов, дерева секций и отрисовки шаблона
+        validators = PageValidators(request, [
+            project.updated_at,
+            getattr(project, 'stats', None) and project.stats.updated_at,
+            TestCase.objects.filter(project=project).aggregate(updated_at=Max('updated_at'))['updated_at'],
+        ], user_role)
+        not_modified = validators.not_modified()
+        if not_modified is not None:
+            return not_modified
         form = TestCaseForm(user=request.user, initial={'project': project})
     
-    # Получаем роль пользователя в проекте
-    user_role = get_user_project_role(request.user, project)
+    # Фильтрация и курсорная пагинация на стороне сервера
+    params = get_list_params(request, TESTCASE_ORDERINGS)
+    test_cases = TestCase.objects.filter(project=project).select_related('created_by')
+    if params['search']:
+        test_cases = test_cases.filter(title__icontains=params['search'])
+    
+    # Фильтр по секции включает все вложенные секции (префикс пути)
+    current_section = None
+    section_pk = request.GET.get('section', '')
+    if section_pk.isdigit():
+        current_section = get_object_or_404(Section, pk=section_pk, project=project)
+        test_cases = test_cases.filter(section__path__startswith=current_section.path)
+    page = paginate_keyset(test_cases, TESTCASE_ORDERINGS[params['sort']], request.GET.get('cursor'))
     
-    return render(request, 'testcases/project_detail.html', {
+    response = render_list(request, 'testcases/project_detail.html', {
         'project': project,
-        'test_cases': test_cases,
+        'page': page,
+        'filters_active': bool(params['search'] or current_section),
+        # Дерево секций: при первой отрисовке только корневой уровень
+        'sections': get_section_nodes(project),
+        'current_section': current_section,
+        'sort_choices': TESTCASE_SORT_CHOICES,
+        'show_project': False,
+        'form': form,
+        'user_role': user_role,
+        **params,
+    }, 'testcases/partials/testcase_results.html', 'testcases/partials/testcase_items.html')
+    return validators.apply(response) if validators is not None else response
+
+
+@query_budget(10)
+@login_required
+def section_children(request, pk, section_pk):
+    """
+    HTMX-фрагмент узла дерева секций
+    
+    Возвращает дочерние секции узла со счетчиками и первую страницу
+    тест-кейсов, лежащих непосредственно в секции. Запрос с курсором
+    получает только следующую страницу тест-кейсов.
+    """
+    # Проверяем права доступа
+    if request.user.is_blocked:
+        messages.error(request, 'Ваш аккаунт заблокирован')
+        return redirect('users:login')
+    
+    project = get_object_or_404(Project.objects.active(), pk=pk)
+    
+    # Проверяем доступ к проекту
+    if not can_view_project(request.user, project):
+        raise PermissionDenied("У вас нет доступа к этому проекту")
+    
+    section = get_object_or_404(Section, pk=section_pk, project=project)
+    cursor = request.GET.get('cursor')
+    page = paginate_keyset(
+        TestCase.objects.filter(section=section).only('id', 'title', 'section_id'),
+        TESTCASE_ORDERINGS['title'],
+        cursor,
+        per_page=SECTION_TESTCASES_PAGE_SIZE,
+    )
+    context = {'project': project, 'section': section, 'page': page}
+    if cursor:
+        return render(request, 'testcases/partials/section_testcases.html', context)
+    context['sections'] = get_section_nodes(project, parent=section)
+    return render(request, 'testcases/partials/section_children.html', context)
+
+
+@query_budget(8)
+@login_required
+def project_export(request, pk, section_pk=None):
+    """Выгрузка тест-кейсов проекта или секции в Excel"""
+    # Проверяем права доступа
+    if request.user.is_blocked:
+        messages.error(request, 'Ваш аккаунт заблокирован')
+        return redirect('users:login')
+    
+    project = get_object_or_404(Project.objects.active(), pk=pk)
+    
+    # Проверяем доступ к проекту
+    if not can_view_project(request.user, project):
+        raise PermissionDenied("У вас нет доступа к этому проекту")
+    
+    test_cases = TestCase.objects.filter(project=project)
+    section = None
+    if section_pk is not None:
+        section = get_object_or_404(Section, pk=section_pk, project=project)
+        test_cases = test_cases.filter(section__path__startswith=section.path)
+    
+    # Файл формируется по мере чтения тест-кейсов и сразу отдается клиенту
+    response = StreamingHttpResponse(
+        stream_test_cases_xlsx(test_cases),
+        content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+    )
+    response['Content-Disposition'] = content_disposition_header(
+        as_attachment=True, filename=export_filename(project, section)
+    )
+    return response
+
+
+@query_budget(8)
+@login_required
+def testcase_import(request, pk):
+    """Импорт тест-кейсов в проект из файла Excel"""
+    # Проверяем права доступа
+    if request.user.is_blocked:
+        messages.error(request, 'Ваш аккаунт заблокирован')
+        return redirect('users:login')
+    
+    project = get_object_or_404(Project.objects.active(), pk=pk)
+    
+    # Импортировать тест-кейсы может редактор проекта
+    if not has_project_access(request.user, project, min_role='editor'):
+        raise PermissionDenied("У вас нет прав для создания тест-кейсов в этом проекте")
+    
+    if request.method == 'POST':
+        form = TestCaseImportForm(request.POST, request.FILES)
+        if form.is_valid():
+            # Файл обрабатывается фоновой задачей, которая удалит его по завершении
+            path = default_storage.save(f'imports/{uuid.uuid4().hex}.xlsx', form.cleaned_data['file'])
+            job = enqueue('testcases.import_test_cases', {
+                'path': path,
+                'project_id': project.pk,
+                'user_id': request.user.pk,
+                'dry_run': form.cleaned_data['dry_run'],
+            }, user=request.user)
+            return redirect('jobs:job_detail', pk=job.pk)
+    else:
+        form = TestCaseImportForm()
+    
+    return render(request, 'testcases/testcase_import.html', {
         'form': form,
-        'user_role': user_role
+        'project': project
     })
 
 
+@query_budget(12)
 @login_required
 def project_edit(request, pk):
     """Редактирование проекта"""
@@ -104,7 +327,7 @@ def project_edit(request, pk):
         messages.error(request, 'Ваш аккаунт заблокирован')
         return redirect('users:login')
     
-    project = get_object_or_404(Project, pk=pk)
+    project = get_object_or_404(Project.objects.active(), pk=pk)
     
     # Проверяем права на редактирование проекта
     if not can_edit_project(request.user, project):
@@ -128,18 +351,89 @@ def project_edit(request, pk):
     else:
         form = ProjectForm(instance=project, user=request.user)
     
-    # Получаем список всех пользователей для выбора
-    from django.contrib.auth import get_user_model
-    User = get_user_model()
-    all_users = User.objects.filter(is_active=True).exclude(id=request.user.id)
-    
     return render(request, 'testcases/project_edit.html', {
         'form': form,
+        'project': project
+    })
+
+
+@query_budget(14)
+@login_required
+def project_members_bulk(request, pk):
+    """Массовое добавление участников проекта из CSV или списка"""
+    # Проверяем права доступа
+    if request.user.is_blocked:
+        messages.error(request, 'Ваш аккаунт заблокирован')
+        return redirect('users:login')
+    
+    project = get_object_or_404(Project.objects.active(), pk=pk)
+    
+    # Управлять участниками может только администратор проекта
+    if not can_edit_project(request.user, project):
+        raise PermissionDenied("У вас нет прав для редактирования этого проекта")
+    
+    if request.method == 'POST':
+        form = BulkMembersForm(request.POST, request.FILES)
+        if form.is_valid():
+            result = form.save(project, added_by=request.user)
+            messages.success(
+                request,
+                f'Добавлено участников: {result["added"]}, изменена роль: {result["updated"]}'
+            )
+            if result['unknown']:
+                unknown = ', '.join(result['unknown'][:10])
+                if len(result['unknown']) > 10:
+                    unknown += f' и еще {len(result["unknown"]) - 10}'
+                messages.warning(request, f'Пользователи не найдены: {unknown}')
+            return redirect('testcases:project_edit', pk=project.pk)
+    else:
+        form = BulkMembersForm()
+    
+    return render(request, 'testcases/project_members_bulk.html', {
+        'form': form,
+        'project': project
+    })
+
+
+@query_budget(10)
+@login_required
+def project_clone(request, pk):
+    """Копирование проекта (выполняется фоновой задачей)"""
+    # Проверяем права доступа
+    if request.user.is_blocked:
+        messages.error(request, 'Ваш аккаунт заблокирован')
+        return redirect('users:login')
+    
+    project = get_object_or_404(Project.objects.active(), pk=pk)
+    
+    # Копировать проект могут участники с правом редактирования
+    if not has_project_access(request.user, project, min_role='editor'):
+        raise PermissionDenied("У вас нет прав для копирования этого проекта")
+    
+    if request.method == 'POST':
+        form = ProjectCloneForm(request.POST)
+        if form.is_valid():
+            job = enqueue(
+                'testcases.clone_project',
+                {
+                    'project_id': project.pk,
+                    'user_id': request.user.pk,
+                    'name': form.cleaned_data['name'],
+                    'include_members': form.cleaned_data['include_members'],
+                },
+                user=request.user
+            )
+            return redirect('jobs:job_detail', pk=job.pk)
+    else:
+        form = ProjectCloneForm(initial={'name': f'{project.name} (копия)'[:200]})
+    
+    return render(request, 'testcases/project_clone.html', {
         'project': project,
-        'all_users': all_users
+        'form': form,
     })
 
 
+@query_budget(14)
 @login_required
 def project_delete(request, pk):
     """Удаление проекта"""
@@ -148,23 +442,30 @@ def project_delete(request, pk):
         messages.error(request, 'Ваш аккаунт заблокирован')
         return redirect('users:login')
     
-    project = get_object_or_404(Project, pk=pk)
+    project = get_object_or_404(Project.objects.active(), pk=pk)
     
     # Проверяем права на удаление проекта
     if not can_edit_project(request.user, project):
         raise PermissionDenied("У вас нет прав для удаления этого проекта")
     
     if request.method == 'POST':
-        project_name = project.name
-        project.delete()
-        messages.success(request, f'Проект "{project_name}" успешно удален!')
-        return redirect('testcases:project_list')
+        # Проект сразу скрывается, данные удаляются в фоне пачками
+        with transaction.atomic():
+            mark_project_deleted(project)
+            job = enqueue(
+                'testcases.purge_project',
+                {'project_id': project.pk, 'project_name': project.name},
+                user=request.user
+            )
+        messages.success(request, f'Проект "{project.name}" успешно удален!')
+        return redirect('jobs:job_detail', pk=job.pk)
     
     return render(request, 'testcases/project_confirm_delete.html', {
         'project': project
     })
 
 
+@query_budget(10)
 @login_required
 def testcase_list(request):
     """Список тест-кейсов"""
@@ -175,7 +476,6 @@ def testcase_list(request):
     
     # Получаем тест-кейсы из доступных проектов
     accessible_projects = get_accessible_projects(request.user)
-    test_cases = TestCase.objects.filter(project__in=accessible_projects)
     
     # Обработка создания тест-кейса
     if request.method == 'POST':
@@ -189,12 +489,64 @@ def testcase_list(request):
     else:
         form = TestCaseForm(user=request.user)
     
-    return render(request, 'testcases/testcase_list.html', {
-        'test_cases': test_cases,
-        'form': form
-    })
+    # Фильтрация и курсорная пагинация на стороне сервера
+    params = get_list_params(request, TESTCASE_ORDERINGS)
+    project_filter = request.GET.get('project', '')
+    test_cases = TestCase.objects.filter(
+        project__in=accessible_projects
+    ).select_related('project', 'created_by')
+    if params['search']:
+        test_cases = test_cases.filter(title__icontains=params['search'])
+    if project_filter.isdigit():
+        test_cases = test_cases.filter(project_id=project_filter)
+    page = paginate_keyset(test_cases, TESTCASE_ORDERINGS[params['sort']], request.GET.get('cursor'))
+    
+    return render_list(request, 'testcases/testcase_list.html', {
+        'page': page,
+        'projects': accessible_projects.only('id', 'name').order_by('name'),
+        'project_filter': project_filter,
+        'filters_active': bool(params['search'] or project_filter),
+        'sort_choices': TESTCASE_SORT_CHOICES,
+        'show_project': True,
+        'form': form,
+        **params,
+    }, 'testcases/partials/testcase_results.html', 'testcases/partials/testcase_items.html')
+
+
+@query_budget(8)
+@login_required
+def testcase_search(request):
+    """Полнотекстовый поиск по тест-кейсам доступных проектов"""
+    # Проверяем права доступа
+    if request.user.is_blocked:
+        messages.error(request, 'Ваш аккаунт заблокирован')
+        return redirect('users:login')
+    
+    query = request.GET.get('q', '').strip()
+    project_filter = request.GET.get('project', '')
+    accessible_projects = get_accessible_projects(request.user)
+    
+    results = []
+    if query:
+        test_cases = TestCase.objects.filter(
+            project__in=accessible_projects
+        ).select_related('project')
+        if project_filter.isdigit():
+            test_cases = test_cases.filter(project_id=project_filter)
+        results = search_test_cases(test_cases, query)
+    
+    context = {
+        'query': query,
+        'results': results,
+        'projects': accessible_projects.only('id', 'name').order_by('name'),
+        'project_filter': project_filter,
+    }
+    if request.htmx:
+        return render(request, 'testcases/partials/search_results.html', context)
+    return render(request, 'testcases/testcase_search.html', context)
 
 
+@query_budget(8)
 @login_required
 def testcase_detail(request, pk):
     """Детальная страница тест-кейса"""
@@ -203,16 +555,35 @@ def testcase_detail(request, pk):
         messages.error(request, 'Ваш аккаунт заблокирован')
         return redirect('users:login')
     
-    test_case = get_object_or_404(TestCase, pk=pk)
+    # Для проверки доступа и условного GET хватает дат изменения - текст
+    # тест-кейса загружается, только если страницу нужно отрисовать
+    versions = get_object_or_404(
+        TestCase.objects.filter(project__is_deleted=False).values(
+            'project_id', 'updated_at', 'project__updated_at', 'project__stats__updated_at'
+        ),
+        pk=pk
+    )
     
     # Проверяем доступ к проекту тест-кейса
-    if not can_view_project(request.user, test_case.project):
+    if not can_view_project(request.user, versions['project_id']):
         raise PermissionDenied("У вас нет доступа к этому тест-кейсу")
-    return render(request, 'testcases/testcase_detail.html', {
+    
+    validators = PageValidators(request, [
+        versions['updated_at'],
+        versions['project__updated_at'],
+        versions['project__stats__updated_at'],
+    ], get_user_project_role(request.user, versions['project_id']))
+    not_modified = validators.not_modified()
+    if not_modified is not None:
+        return not_modified
+    
+    test_case = get_object_or_404(TestCase.objects.select_related('project', 'created_by'), pk=pk)
+    return validators.apply(render(request, 'testcases/testcase_detail.html', {
         'test_case': test_case
-    })
+    }))
 
 
+@query_budget(12)
 @login_required
 def testcase_edit(request, pk):
     """Редактирование тест-кейса"""
@@ -221,7 +592,7 @@ def testcase_edit(request, pk):
         messages.error(request, 'Ваш аккаунт заблокирован')
         return redirect('users:login')
     
-    test_case = get_object_or_404(TestCase, pk=pk)
+    test_case = get_object_or_404(TestCase, pk=pk, project__is_deleted=False)
     
     # Проверяем права на редактирование тест-кейса
     if not can_edit_testcase(request.user, test_case):
@@ -244,6 +615,7 @@ def testcase_edit(request, pk):
     })
 
 
+@query_budget(10)
 @login_required
 def testcase_delete(request, pk):
     """Удаление тест-кейса"""
@@ -252,7 +624,7 @@ def testcase_delete(request, pk):
         messages.error(request, 'Ваш аккаунт заблокирован')
         return redirect('users:login')
     
-    test_case = get_object_or_404(TestCase, pk=pk)
+    test_case = get_object_or_404(TestCase, pk=pk, project__is_deleted=False)
     
     # Проверяем права на удаление тест-кейса
     if not can_edit_testcase(request.user, test_case):
@@ -269,3 +641,172 @@ def testcase_delete(request, pk):
         'test_case': test_case
     })
 
+
+
+@query_budget(12)
+@login_required
+def run_list(request, pk):
+    """Прогоны проекта и создание нового прогона"""
+    # Проверяем права доступа
+    if request.user.is_blocked:
+        messages.error(request, 'Ваш аккаунт заблокирован')
+        return redirect('users:login')
+    
+    project = get_object_or_404(Project.objects.active(), pk=pk)
+    
+    # Проверяем доступ к проекту
+    if not can_view_project(request.user, project):
+        raise PermissionDenied("У вас нет доступа к этому проекту")
+    
+    can_run = has_project_access(request.user, project, min_role='editor')
+    if request.method == 'POST':
+        if not can_run:
+            raise PermissionDenied("У вас нет прав для создания прогонов в этом проекте")
+        form = TestRunForm(request.POST, project=project)
+        if form.is_valid():
+            run, count = create_run(
+                project, form.cleaned_data['name'], request.user, section=form.cleaned_data['section']
+            )
+            messages.success(request, f'Прогон "{run.name}" создан: тест-кейсов {count}')
+            return redirect('testcases:run_detail', pk=run.pk)
+    else:
+        form = TestRunForm(project=project)
+    
+    runs = TestRun.objects.filter(project=project).select_related('section', 'created_by')
+    page = paginate_keyset(runs, RUN_ORDERING, request.GET.get('cursor'))
+    attach_run_summaries(page.object_list)
+    
+    return render_list(request, 'testcases/run_list.html', {
+        'project': project,
+        'page': page,
+        'form': form,
+        'can_run': can_run,
+        'view_mode': 'list',
+    }, 'testcases/partials/run_table.html', 'testcases/partials/run_rows.html')
+
+
+@query_budget(12)
+@login_required
+def junit_upload(request, pk):
+    """Загрузка результатов автотестов из отчета JUnit XML"""
+    # Проверяем права доступа
+    if request.user.is_blocked:
+        messages.error(request, 'Ваш аккаунт заблокирован')
+        return redirect('users:login')
+    
+    project = get_object_or_404(Project.objects.active(), pk=pk)
+    
+    # Записывать результаты прогонов может редактор проекта
+    if not has_project_access(request.user, project, min_role='editor'):
+        raise PermissionDenied("У вас нет прав для загрузки результатов в этом проекте")
+    
+    if request.method == 'POST':
+        form = JUnitUploadForm(request.POST, request.FILES, project=project)
+        if form.is_valid():
+            with transaction.atomic():
+                run = form.cleaned_data['run'] or TestRun.objects.create(
+                    name=form.cleaned_data['run_name'], project=project, created_by=request.user
+                )
+                # Отчет обрабатывается фоновой задачей, которая удалит файл по завершении
+                path = default_storage.save(f'imports/{uuid.uuid4().hex}.xml', form.cleaned_data['file'])
+                job = enqueue('testcases.import_junit', {
+                    'path': path,
+                    'run_id': run.pk,
+                    'user_id': request.user.pk,
+                    'create_missing': form.cleaned_data['create_missing'],
+                }, user=request.user)
+            return redirect('jobs:job_detail', pk=job.pk)
+    else:
+        form = JUnitUploadForm(project=project, initial={'run': request.GET.get('run')})
+    
+    return render(request, 'testcases/junit_upload.html', {
+        'form': form,
+        'project': project
+    })
+
+
+@query_budget(8)
+@login_required
+def run_detail(request, pk):
+    """Страница прогона: сводка и результаты по тест-кейсам"""
+    # Проверяем права доступа
+    if request.user.is_blocked:
+        messages.error(request, 'Ваш аккаунт заблокирован')
+        return redirect('users:login')
+    
+    run = get_object_or_404(
+        TestRun.objects.select_related('project', 'section'), pk=pk, project__is_deleted=False
+    )
+    
+    # Проверяем доступ к проекту прогона
+    if not can_view_project(request.user, run.project):
+        raise PermissionDenied("У вас нет доступа к этому прогону")
+    
+    results = TestResult.objects.filter(run=run).select_related('test_case', 'updated_by')
+    status = request.GET.get('status', '')
+    if status in dict(TestResult.STATUS_CHOICES):
+        results = results.filter(status=status)
+    else:
+        status = ''
+    cursor = request.GET.get('cursor')
+    page = paginate_keyset(results, RUN_RESULTS_ORDERING, cursor, per_page=RUN_RESULTS_PAGE_SIZE)
+    
+    return render_list(request, 'testcases/run_detail.html', {
+        'run': run,
+        'project': run.project,
+        'page': page,
+        # Сводка нужна только при полной отрисовке, не при подгрузке страниц
+        'summary': None if cursor else get_run_summary(run),
+        'status': status,
+        'status_choices': TestResult.STATUS_CHOICES,
+        'can_edit': has_project_access(request.user, run.project, min_role='editor'),
+        'view_mode': 'list',
+    }, 'testcases/partials/result_table.html', 'testcases/partials/result_rows.html')
+
+
+@query_budget(10)
+@login_required
+@require_http_methods(['POST'])
+def run_results_update(request, pk):
+    """Установка статуса для одного или многих тест-кейсов прогона"""
+    # Проверяем права доступа
+    if request.user.is_blocked:
+        messages.error(request, 'Ваш аккаунт заблокирован')
+        return redirect('users:login')
+    
+    run = get_object_or_404(TestRun.objects.select_related('project'), pk=pk, project__is_deleted=False)
+    
+    # Выставлять статусы могут участники с правом редактирования
+    if not has_project_access(request.user, run.project, min_role='editor'):
+        raise PermissionDenied("У вас нет прав для изменения результатов этого прогона")
+    
+    form = RunResultsForm(request.POST)
+    if not form.is_valid():
+        if request.htmx:
+            return HttpResponseBadRequest('Неверные данные')
+        messages.error(request, 'Выберите тест-кейсы и статус')
+        return redirect('testcases:run_detail', pk=run.pk)
+    
+    test_case_ids = form.cleaned_data['test_case']
+    updated = update_results(
+        run,
+        dict.fromkeys(test_case_ids, form.cleaned_data['status']),
+        request.user,
+        comment=form.cleaned_data['comment'] or None,
+    )
+    
+    # Смена статуса в строке таблицы возвращает только эту строку
+    if request.htmx and len(test_case_ids) == 1:
+        result = get_object_or_404(
+            TestResult.objects.select_related('test_case', 'updated_by'),
+            run=run, test_case_id=next(iter(test_case_ids))
+        )
+        return render(request, 'testcases/partials/result_row.html', {
+            'run': run,
+            'result': result,
+            'status_choices': TestResult.STATUS_CHOICES,
+            'can_edit': True,
+        })
+    
+    messages.success(request, f'Статус обновлен для тест-кейсов: {updated}')
+    return redirect('testcases:run_detail', pk=run.pk)
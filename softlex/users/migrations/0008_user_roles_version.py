@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0007_user_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='roles_version',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Версия ролей в проектах'),
+        ),
+    ]
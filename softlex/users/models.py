@@ -1,5 +1,7 @@
 from django.contrib.auth.models import AbstractUser, BaseUserManager
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.db import models
+from django.db.models.functions import Upper
 
 
 class UserManager(BaseUserManager):
@@ -50,6 +52,13 @@ class User(AbstractUser):
         blank=True, 
         verbose_name='Дата последней авторизации'
     )
+    # Версия карты ролей в проектах (testcases.permissions): увеличивается
+    # в транзакции, меняющей участие пользователя в проектах
+    roles_version = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Версия ролей в проектах'
+    )
     
     # Убираем username, используем email
     username = None
@@ -62,9 +71,29 @@ class User(AbstractUser):
     class Meta:
         verbose_name = 'Пользователь'
         verbose_name_plural = 'Пользователи'
+        indexes = [
+            # Триграммные индексы по UPPER(...) обслуживают поиск icontains
+            # (Django строит его как UPPER(поле) LIKE UPPER(...))
+            GinIndex(OpClass(Upper('email'), name='gin_trgm_ops'), name='user_email_trgm_idx'),
+            GinIndex(OpClass(Upper('first_name'), name='gin_trgm_ops'), name='user_first_name_trgm_idx'),
+            GinIndex(OpClass(Upper('last_name'), name='gin_trgm_ops'), name='user_last_name_trgm_idx'),
+            models.Index(fields=['-date_joined', '-id'], name='user_date_joined_idx'),
+        ]
     
     def __str__(self):
         return self.email
+
+    def save(self, *args, **kwargs):
+        # roles_version меняется только через invalidate_project_roles:
+        # сохранение загруженного ранее объекта не должно откатить версию
+        # Отложенные (.only()/.defer()) поля не загружены и тоже не пишутся
+        if not self._state.adding and kwargs.get('update_fields') is None and not kwargs.get('force_insert'):
+            deferred = self.get_deferred_fields()
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != 'roles_version' and field.attname not in deferred
+            ]
+        super().save(*args, **kwargs)
     
     @property
     def is_admin(self):
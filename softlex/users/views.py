@@ -3,13 +3,62 @@ from django.contrib.auth import login, logout
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.views.decorators.http import require_http_methods
+from django.http import HttpResponseForbidden
 from django.utils import timezone
-from django.core.paginator import Paginator
-from django.db.models import Q
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.db.models import FloatField, Q
+from django.db.models.functions import Cast, Greatest
+from softlex.instrumentation import query_budget
+from testcases.pagination import paginate_keyset
 from .forms import LoginForm, RegistrationForm, UserEditForm
 from .models import User
 
 
+# Размер страницы списка пользователей
+USERS_PAGE_SIZE = 20
+
+# Сортировка списка без поиска и по релевантности при поиске
+USER_ORDERING = ('-date_joined', '-id')
+USER_SEARCH_ORDERING = ('-rank', '-id')
+
+# Подсказки при выборе участника проекта. Префикс короче трех символов
+# дает только триграммы начала слова ('  a', ' ab'), которые есть почти у
+# всех строк: триграммный индекс не сужает выборку и запрос читает таблицу
+USER_LOOKUP_LIMIT = 10
+USER_LOOKUP_MIN_LENGTH = 3
+
+
+def search_users(queryset, search):
+    """
+    Фильтрует пользователей по email, имени и фамилии
+    
+    Условие icontains обслуживается триграммными GIN-индексами,
+    релевантность - наибольшее сходство запроса с одним из полей.
+    
+    Args:
+        queryset: Исходная выборка пользователей
+        search: Поисковая строка
+    
+    Returns:
+        QuerySet: Выборка с аннотацией rank
+    """
+    rank = Greatest(
+        TrigramWordSimilarity(search, 'email'),
+        TrigramWordSimilarity(search, 'first_name'),
+        TrigramWordSimilarity(search, 'last_name'),
+    )
+    return queryset.filter(
+        Q(email__icontains=search) |
+        Q(first_name__icontains=search) |
+        Q(last_name__icontains=search)
+    ).annotate(
+        # real -> double precision, чтобы значение точно совпадало
+        # со значением из курсора при сравнении на равенство
+        rank=Cast(rank, output_field=FloatField())
+    )
+
+
+@query_budget(12)
 def login_view(request):
     """Вход в систему"""
     if request.user.is_authenticated:
@@ -35,6 +84,7 @@ def login_view(request):
     return render(request, 'users/login.html', {'form': form})
 
 
+@query_budget(6)
 def logout_view(request):
     """Выход из системы"""
     logout(request)
@@ -42,6 +92,7 @@ def logout_view(request):
     return redirect('users:login')
 
 
+@query_budget(14)
 def register_view(request):
     """Регистрация"""
     # Если пользователь не аутентифицирован, показываем обычную регистрацию
@@ -76,6 +127,7 @@ def register_view(request):
     return render(request, 'users/register.html', {'form': form})
 
 
+@query_budget(6)
 @login_required
 def user_list_view(request):
     """Список всех пользователей"""
@@ -89,23 +141,21 @@ def user_list_view(request):
     role_filter = request.GET.get('role', '')
     
     # Базовый запрос
-    users = User.objects.all().order_by('-date_joined')
+    users = User.objects.all()
+    ordering = USER_ORDERING
     
     # Применяем фильтры
     if search:
-        users = users.filter(
-            Q(email__icontains=search) | 
-            Q(first_name__icontains=search) | 
-            Q(last_name__icontains=search)
-        )
+        users = search_users(users, search)
+        ordering = USER_SEARCH_ORDERING
     
     if role_filter:
         users = users.filter(role=role_filter)
     
-    # Пагинация
-    paginator = Paginator(users, 20)  # 20 пользователей на страницу
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    # Курсорная пагинация без OFFSET и COUNT(*)
+    page_obj = paginate_keyset(
+        users, ordering, request.GET.get('cursor'), per_page=USERS_PAGE_SIZE
+    )
     
     context = {
         'page_obj': page_obj,
@@ -114,9 +164,43 @@ def user_list_view(request):
         'role_choices': User.ROLE_CHOICES,
     }
     
+    # Следующая страница подгружается через HTMX только строками таблицы
+    if request.htmx and request.GET.get('cursor'):
+        return render(request, 'users/partials/user_rows.html', context)
     return render(request, 'users/user_list.html', context)
 
 
+@query_budget(5)
+@login_required
+def user_lookup_view(request):
+    """Подсказки пользователей для выбора участников проекта (HTMX)"""
+    if request.user.is_blocked:
+        return HttpResponseForbidden()
+    
+    query = request.GET.get('q', '').strip()
+    users = User.objects.none()
+    # Короткие префиксы не используют индекс и совпадают почти со всеми
+    if len(query) >= USER_LOOKUP_MIN_LENGTH:
+        users = (
+            User.objects
+            .filter(is_active=True)
+            .filter(
+                Q(email__istartswith=query) |
+                Q(first_name__istartswith=query) |
+                Q(last_name__istartswith=query)
+            )
+            .exclude(pk=request.user.pk)
+            .only('id', 'email', 'first_name', 'last_name')
+            .order_by('email')[:USER_LOOKUP_LIMIT]
+        )
+    
+    return render(request, 'users/partials/user_lookup.html', {
+        'users': users,
+        'query': query,
+    })
+
+
+@query_budget(5)
 @login_required
 def user_detail_view(request, user_id):
     """Детальная информация о пользователе"""
@@ -134,6 +218,7 @@ def user_detail_view(request, user_id):
     return render(request, 'users/user_detail.html', context)
 
 
+@query_budget(10)
 @login_required
 def user_edit_view(request, user_id):
     """Редактирование пользователя"""
@@ -167,6 +252,7 @@ def user_edit_view(request, user_id):
     return render(request, 'users/user_edit.html', context)
 
 
+@query_budget(4)
 @login_required
 def profile_view(request):
     """Просмотр собственного профиля пользователя"""
@@ -177,6 +263,7 @@ def profile_view(request):
     return render(request, 'users/profile.html', context)
 
 
+@query_budget(6)
 @login_required
 @require_http_methods(["POST"])
 def user_toggle_block_view(request, user_id):
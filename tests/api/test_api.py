@@ -0,0 +1,378 @@
+"""
+Unit тесты для JSON API
+"""
+import json
+import os
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+
+User = get_user_model()
+
+
+@pytest.fixture
+def api_key(user, project_member):
+    """Ключ токена API пользователя - редактора проекта"""
+    from softlex.api.models import ApiToken
+    _, key = ApiToken.generate(user, 'CI')
+    return key
+
+
+@pytest.fixture
+def api(client, api_key):
+    """Клиент с заголовком авторизации по токену"""
+    client.defaults['HTTP_AUTHORIZATION'] = f'Token {api_key}'
+    return client
+
+
+@pytest.fixture
+def shared_cache(settings, tmp_path):
+    """Общий для процессов кэш (файловый вместо redis)"""
+    settings.CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': str(tmp_path / 'cache'),
+        }
+    }
+
+
+def post_json(client, url, data, method='post'):
+    return getattr(client, method)(url, data=json.dumps(data), content_type='application/json')
+
+
+@pytest.mark.django_db
+@pytest.mark.unit
+@pytest.mark.views
+class TestApiAuthentication:
+    """Тесты авторизации по токену"""
+
+    def test_token_required(self, client, project):
+        """Тест ответа 401 без токена и с неверным токеном"""
+        url = reverse('api:project_list')
+
+        assert client.get(url).status_code == 401
+        response = client.get(url, HTTP_AUTHORIZATION='Token wrong')
+        assert response.status_code == 401
+        assert response['WWW-Authenticate'] == 'Token'
+
+    def test_token_lookup_is_cached(self, api, project, shared_cache):
+        """Тест повторного запроса без обращения к таблице токенов"""
+        url = reverse('api:project_detail', args=[project.pk])
+        assert api.get(url).status_code == 200
+
+        with CaptureQueriesContext(connection) as queries:
+            assert api.get(url).status_code == 200
+
+        assert not any('api_apitoken' in query['sql'] for query in queries.captured_queries)
+
+    def test_deleted_token_rejected(self, api, user, shared_cache, django_capture_on_commit_callbacks):
+        """Тест немедленного отзыва токена несмотря на кэш"""
+        from softlex.api.models import ApiToken
+        url = reverse('api:project_list')
+        assert api.get(url).status_code == 200
+
+        with django_capture_on_commit_callbacks(execute=True):
+            ApiToken.objects.filter(user=user).delete()
+
+        assert api.get(url).status_code == 401
+
+    def test_local_cache_not_used_for_tokens(self, api, user):
+        """Тест проверки токена по таблице при локальном кэше процесса"""
+        from softlex.api.models import ApiToken
+        url = reverse('api:project_list')
+        assert api.get(url).status_code == 200
+
+        # Удаление в другом процессе: сброс кэша этого процесса не выполняется
+        ApiToken.objects.filter(user=user).delete()
+
+        assert api.get(url).status_code == 401
+
+    def test_blocked_user(self, api, user):
+        """Тест запрета доступа заблокированному пользователю"""
+        user.is_active = False
+        user.save()
+
+        assert api.get(reverse('api:project_list')).status_code == 403
+
+
+@pytest.mark.django_db
+@pytest.mark.unit
+@pytest.mark.views
+class TestApiLists:
+    """Тесты списков: пагинация и выбор полей"""
+
+    def test_cursor_pagination(self, api, user, project):
+        """Тест обхода списка тест-кейсов по курсору"""
+        from softlex.testcases.models import TestCase
+        TestCase.objects.bulk_create([
+            TestCase(title=f'Кейс {index}', steps='Шаги', expected_result='Результат',
+                     project=project, created_by=user)
+            for index in range(5)
+        ])
+        url = reverse('api:testcase_list', args=[project.pk])
+
+        titles = []
+        response = api.get(url, {'limit': 2, 'fields': 'title'}).json()
+        titles += [item['title'] for item in response['results']]
+        while response['next']:
+            response = api.get(response['next']).json()
+            titles += [item['title'] for item in response['results']]
+
+        assert titles == [f'Кейс {index}' for index in range(5)]
+
+    def test_fields_projection(self, api, project, testcase):
+        """Тест загрузки только запрошенных колонок"""
+        url = reverse('api:testcase_list', args=[project.pk])
+
+        with CaptureQueriesContext(connection) as queries:
+            response = api.get(url, {'fields': 'title,section'})
+
+        assert response.json()['results'] == [{'id': testcase.pk, 'title': testcase.title, 'section': None}]
+        select = next(query['sql'] for query in queries.captured_queries if 'testcases_testcase' in query['sql'])
+        assert '"steps"' not in select
+
+    def test_unknown_field(self, api, project):
+        """Тест ошибки для неизвестного поля"""
+        response = api.get(reverse('api:testcase_list', args=[project.pk]), {'fields': 'title,password'})
+
+        assert response.status_code == 400
+        assert 'password' in response.json()['error']
+
+    def test_foreign_project_forbidden(self, api, multiple_projects):
+        """Тест запрета доступа к чужому проекту"""
+        response = api.get(reverse('api:testcase_list', args=[multiple_projects[0].pk]))
+
+        assert response.status_code == 403
+
+
+@pytest.mark.django_db
+@pytest.mark.unit
+@pytest.mark.views
+class TestApiBatch:
+    """Тесты пакетного создания и изменения"""
+
+    def test_create_test_cases(self, api, project, section, django_assert_max_num_queries):
+        """Тест создания пакета тест-кейсов в одной транзакции"""
+        from softlex.testcases.models import ProjectStats, TestCase
+        items = [
+            {'title': f'Кейс {index}', 'steps': 'Шаги', 'expected_result': 'Результат', 'section': section.pk}
+            for index in range(50)
+        ]
+
+        # Количество запросов не зависит от размера пакета
+        with django_assert_max_num_queries(15):
+            response = post_json(api, reverse('api:testcase_list', args=[project.pk]), {'items': items})
+
+        assert response.status_code == 201
+        assert len(response.json()['results']) == 50
+        assert TestCase.objects.filter(project=project, section=section).count() == 50
+        assert ProjectStats.objects.get(project=project).test_case_count == 50
+
+    def test_invalid_item_rejects_batch(self, api, project, multiple_projects):
+        """Тест отклонения всего пакета при ошибке в одном элементе"""
+        from softlex.testcases.models import Section, TestCase
+        foreign = Section.objects.create(name='Чужая', project=multiple_projects[0])
+        items = [
+            {'title': 'Корректный', 'steps': 'Шаги', 'expected_result': 'Результат', 'automation_key': 'a'},
+            {'title': 'Без шагов', 'expected_result': 'Результат'},
+            {'title': 'Чужая секция', 'steps': 'Шаги', 'expected_result': 'Результат', 'section': foreign.pk},
+            {'title': 'Повтор', 'steps': 'Шаги', 'expected_result': 'Результат', 'automation_key': 'a'},
+        ]
+
+        response = post_json(api, reverse('api:testcase_list', args=[project.pk]), {'items': items})
+
+        assert response.status_code == 400
+        errors = {error['index']: error['errors'] for error in response.json()['errors']}
+        assert set(errors) == {1, 2, 3}
+        assert 'steps' in errors[1]
+        assert 'section' in errors[2]
+        assert 'automation_key' in errors[3]
+        assert not TestCase.objects.filter(project=project).exists()
+
+    def test_update_test_cases(self, api, user, project, testcase, testcase_data):
+        """Тест пакетного изменения только переданных полей"""
+        from softlex.testcases.models import TestCase
+        other = TestCase.objects.create(
+            title='Второй', steps='Шаги', expected_result='Результат', project=project, created_by=user
+        )
+        updated_at = testcase.updated_at
+
+        response = post_json(api, reverse('api:testcase_list', args=[project.pk]), {'items': [
+            {'id': testcase.pk, 'title': 'Новое название'},
+            {'id': other.pk, 'automation_key': 'tests.Other'},
+        ]}, method='patch')
+
+        assert response.status_code == 200
+        testcase.refresh_from_db()
+        assert (testcase.title, testcase.steps) == ('Новое название', testcase_data['steps'])
+        assert testcase.updated_at > updated_at
+        assert TestCase.objects.get(pk=other.pk).automation_key == 'tests.Other'
+
+    def test_update_swaps_automation_keys(self, api, user, project):
+        """Тест обмена ключами автоматизации внутри пакета"""
+        from softlex.testcases.models import TestCase
+        first, second = [
+            TestCase.objects.create(title=key, steps='Шаги', expected_result='Результат',
+                                    automation_key=key, project=project, created_by=user)
+            for key in ('tests.A', 'tests.B')
+        ]
+
+        response = post_json(api, reverse('api:testcase_list', args=[project.pk]), {'items': [
+            {'id': first.pk, 'automation_key': 'tests.B'},
+            {'id': second.pk, 'automation_key': 'tests.A'},
+        ]}, method='patch')
+
+        assert response.status_code == 200
+        assert TestCase.objects.get(pk=first.pk).automation_key == 'tests.B'
+        assert TestCase.objects.get(pk=second.pk).automation_key == 'tests.A'
+
+    def test_update_key_kept_by_batch_item(self, api, user, project):
+        """Тест ошибки элемента, если ключ остается у другого тест-кейса пакета"""
+        from softlex.testcases.models import TestCase
+        first, second = [
+            TestCase.objects.create(title=key, steps='Шаги', expected_result='Результат',
+                                    automation_key=key, project=project, created_by=user)
+            for key in ('tests.A', 'tests.B')
+        ]
+
+        response = post_json(api, reverse('api:testcase_list', args=[project.pk]), {'items': [
+            {'id': first.pk, 'automation_key': 'tests.B'},
+            {'id': second.pk, 'title': 'Новое название'},
+        ]}, method='patch')
+
+        assert response.status_code == 400
+        errors = {error['index']: error['errors'] for error in response.json()['errors']}
+        assert set(errors) == {0}
+        assert 'automation_key' in errors[0]
+        assert TestCase.objects.get(pk=first.pk).automation_key == 'tests.A'
+
+    def test_create_sections(self, api, project, section):
+        """Тест создания секций с материализованными путями"""
+        from softlex.testcases.models import Section
+
+        response = post_json(api, reverse('api:section_list', args=[project.pk]), {'items': [
+            {'name': 'Дочерняя', 'parent': section.pk},
+            {'name': 'Корневая'},
+        ]})
+
+        assert response.status_code == 201
+        child = Section.objects.get(name='Дочерняя')
+        assert child.path == f'{section.pk}/{child.pk}/'
+        assert [s.pk for s in section.get_descendants()] == [child.pk]
+
+    def test_viewer_cannot_create(self, api, project, project_member):
+        """Тест запрета пакетного создания для наблюдателя"""
+        project_member.role = 'viewer'
+        project_member.save()
+
+        response = post_json(api, reverse('api:testcase_list', args=[project.pk]), {'items': [
+            {'title': 'Кейс', 'steps': 'Шаги', 'expected_result': 'Результат'},
+        ]})
+
+        assert response.status_code == 403
+
+    def test_add_members(self, api, project, project_member, multiple_users):
+        """Тест добавления участников администратором проекта"""
+        project_member.role = 'admin'
+        project_member.save()
+        url = reverse('api:member_list', args=[project.pk])
+
+        response = post_json(api, url, {'items': [
+            {'user_email': multiple_users[0].email, 'role': 'editor'},
+            {'user_id': multiple_users[1].pk, 'role': 'viewer'},
+        ]})
+
+        assert response.status_code == 200
+        assert response.json()['added'] == 2
+        members = {item['email']: item['role'] for item in api.get(url).json()['results']}
+        assert members[multiple_users[0].email] == 'editor'
+
+
+@pytest.mark.django_db
+@pytest.mark.unit
+@pytest.mark.views
+class TestApiJUnit:
+    """Тесты загрузки отчета JUnit через API"""
+
+    def test_push_report(self, api, user, project, settings, tmp_path):
+        """Тест постановки задачи и опроса ее состояния"""
+        from softlex.jobs.models import Job
+        from softlex.jobs.worker import claim_job, execute_job
+        from softlex.testcases.models import TestCase, TestRun
+
+        settings.MEDIA_ROOT = tmp_path
+        TestCase.objects.create(
+            title='Вход', steps='Шаги', expected_result='Результат',
+            project=project, created_by=user, automation_key='auth.test_login'
+        )
+        run = TestRun.objects.create(name='CI', project=project, created_by=user)
+        report = b'<testsuite><testcase classname="auth" name="test_login"><failure/></testcase></testsuite>'
+
+        response = api.post(reverse('api:run_junit', args=[run.pk]), data=report, content_type='application/xml')
+
+        assert response.status_code == 202
+        job = Job.objects.get(pk=response.json()['job'])
+        claim_job('imports')
+        assert execute_job(job.pk) == Job.STATUS_DONE
+        assert api.get(response.json()['url']).json()['status'] == Job.STATUS_DONE
+        assert run.results.get().status == 'failed'
+
+    def test_push_large_report(self, api, user, project, settings, tmp_path):
+        """Тест отчета больше DATA_UPLOAD_MAX_MEMORY_SIZE"""
+        from django.core.files.storage import default_storage
+        from softlex.testcases.models import TestRun
+
+        settings.MEDIA_ROOT = tmp_path
+        run = TestRun.objects.create(name='CI', project=project, created_by=user)
+        testcase = b'<testcase classname="auth" name="test_login"><system-out>' + b'x' * 1024 + b'</system-out></testcase>'
+        report = b'<testsuite>' + testcase * 3000 + b'</testsuite>'
+        assert len(report) > settings.DATA_UPLOAD_MAX_MEMORY_SIZE
+
+        response = api.post(reverse('api:run_junit', args=[run.pk]), data=report, content_type='application/xml')
+
+        assert response.status_code == 202
+        path = f'imports/{os.listdir(tmp_path / "imports")[0]}'
+        with default_storage.open(path, 'rb') as file:
+            assert file.read() == report
+
+    def test_report_too_large(self, api, user, project, settings, tmp_path, monkeypatch):
+        """Тест ответа 413 на отчет больше допустимого размера"""
+        from softlex.api import views
+        from softlex.jobs.models import Job
+        from softlex.testcases.models import TestRun
+
+        settings.MEDIA_ROOT = tmp_path
+        monkeypatch.setattr(views, 'JUNIT_MAX_SIZE', 1024)
+        run = TestRun.objects.create(name='CI', project=project, created_by=user)
+
+        response = api.post(reverse('api:run_junit', args=[run.pk]), data=b'x' * 2048, content_type='application/xml')
+
+        assert response.status_code == 413
+        assert not Job.objects.exists()
+
+
+@pytest.mark.django_db
+@pytest.mark.unit
+@pytest.mark.views
+class TestApiDatabaseStatus:
+    """Тесты состояния подключений к базе данных"""
+
+    def test_admin_gets_status(self, client, admin):
+        """Тест ответа со статистикой подключений процесса"""
+        from softlex.api.models import ApiToken
+        _, key = ApiToken.generate(admin, 'Мониторинг')
+
+        response = client.get(reverse('api:database_status'), HTTP_AUTHORIZATION=f'Token {key}')
+
+        data = response.json()
+        assert response.status_code == 200
+        assert data['max_connections'] > 0
+        assert data['connections'] >= 1
+        assert 'pool' in data
+
+    def test_not_available_to_users(self, api):
+        """Тест запрета для обычного пользователя"""
+        assert api.get(reverse('api:database_status')).status_code == 403
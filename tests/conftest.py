@@ -10,7 +10,6 @@ from django.contrib.auth import get_user_model
 from django.core.management import call_command
 from django.db import connection
 from django.test.utils import setup_test_environment, teardown_test_environment
-from django.conf import settings
 
 # Добавляем корневую папку проекта в Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
@@ -31,6 +30,47 @@ def django_db_setup(django_db_setup, django_db_blocker):
         call_command('migrate', verbosity=0, interactive=False)
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Очищает кэш между тестами"""
+    from django.core.cache import cache
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def plain_static_storage(settings):
+    """Статика без манифеста: в тестах collectstatic не выполняется"""
+    settings.STORAGES = {
+        **settings.STORAGES,
+        'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+    }
+
+
+# Представления, бюджеты запросов которых проверяются в тестах
+QUERY_BUDGET_MODULES = ('testcases.views', 'users.views')
+
+
+@pytest.fixture(autouse=True)
+def query_budgets():
+    """Проваливает тест, если представление превысило объявленный бюджет SQL-запросов"""
+    from softlex.instrumentation import request_measured
+
+    def check(sender, request, metrics, **kwargs):
+        if metrics.query_budget is None or metrics.view.rsplit('.', 1)[0] not in QUERY_BUDGET_MODULES:
+            return
+        if metrics.queries > metrics.query_budget:
+            pytest.fail(
+                f'{metrics.view}: {metrics.queries} SQL-запросов при бюджете {metrics.query_budget} '
+                f'({request.method} {request.path})'
+            )
+
+    request_measured.connect(check, weak=False)
+    yield
+    request_measured.disconnect(check)
+
+
 @pytest.fixture
 def db_access_without_rollback_and_truncate(request, django_db_setup, django_db_blocker):
     """Фикстура для доступа к БД без отката транзакций"""
@@ -0,0 +1,211 @@
+"""
+Unit тесты для фоновых задач
+"""
+import threading
+from datetime import timedelta
+
+import pytest
+from django.db import connection, transaction
+from django.urls import reverse
+from django.utils import timezone
+from django.contrib.auth import get_user_model
+
+from softlex.jobs.registry import JobFailed, job_task
+
+User = get_user_model()
+
+
+@job_task('tests.sum', queue='tests')
+def sum_task(job, numbers):
+    job.set_progress(0, total=len(numbers))
+    for number in numbers:
+        job.add_progress(1)
+    return {'sum': sum(numbers)}
+
+
+@job_task('tests.fail', queue='tests', max_attempts=2)
+def failing_task(job):
+    raise RuntimeError('Ошибка задачи')
+
+
+@job_task('tests.gone', queue='tests', max_attempts=2)
+def gone_task(job):
+    raise JobFailed('Объект задачи удален')
+
+
+@pytest.mark.django_db
+@pytest.mark.unit
+@pytest.mark.utils
+class TestJobExecution:
+    """Тесты постановки, захвата и выполнения задач"""
+
+    def test_enqueue_claim_and_execute(self, user):
+        """Тест полного цикла выполнения задачи"""
+        from softlex.jobs.models import Job
+        from softlex.jobs.registry import enqueue
+        from softlex.jobs.worker import claim_job, execute_job
+
+        job = enqueue('tests.sum', {'numbers': [1, 2, 3]}, user=user)
+        assert job.queue == 'tests'
+
+        claimed = claim_job('tests', 'test-worker')
+        assert claimed.pk == job.pk
+        assert claimed.status == Job.STATUS_RUNNING
+        assert claimed.attempts == 1
+        assert claim_job('tests') is None
+
+        assert execute_job(job.pk) == Job.STATUS_DONE
+        job.refresh_from_db()
+        assert job.result == {'sum': 6}
+        assert (job.progress, job.total, job.percent) == (3, 3, 100)
+
+    def test_failed_job_is_retried_then_failed(self):
+        """Тест повторной попытки и окончательной ошибки"""
+        from softlex.jobs.models import Job
+        from softlex.jobs.registry import enqueue
+        from softlex.jobs.worker import claim_job, execute_job
+
+        job = enqueue('tests.fail')
+
+        claim_job('tests')
+        assert execute_job(job.pk) == Job.STATUS_PENDING
+        job.refresh_from_db()
+        assert job.run_after > timezone.now()
+        assert claim_job('tests') is None
+
+        Job.objects.filter(pk=job.pk).update(run_after=timezone.now())
+        claim_job('tests')
+        assert execute_job(job.pk) == Job.STATUS_FAILED
+        job.refresh_from_db()
+        assert 'Ошибка задачи' in job.error
+        assert job.finished_at is not None
+
+    def test_job_failed_is_not_retried(self):
+        """Тест завершения задачи с сообщением без повторных попыток"""
+        from softlex.jobs.models import Job
+        from softlex.jobs.registry import enqueue
+        from softlex.jobs.worker import claim_job, execute_job
+
+        job = enqueue('tests.gone')
+
+        claim_job('tests')
+        assert execute_job(job.pk) == Job.STATUS_FAILED
+        job.refresh_from_db()
+        assert (job.message, job.error) == ('Объект задачи удален', 'Объект задачи удален')
+
+    def test_requeue_stale_jobs(self):
+        """Тест возврата в очередь задач зависшего воркера"""
+        from softlex.jobs.models import Job
+        from softlex.jobs.worker import requeue_stale_jobs
+
+        stale = Job.objects.create(
+            task='tests.sum', status=Job.STATUS_RUNNING, attempts=0, max_attempts=1,
+            heartbeat_at=timezone.now() - timedelta(hours=1)
+        )
+        exhausted = Job.objects.create(
+            task='tests.sum', status=Job.STATUS_RUNNING, attempts=1, max_attempts=1,
+            heartbeat_at=timezone.now() - timedelta(hours=1)
+        )
+        alive = Job.objects.create(
+            task='tests.sum', status=Job.STATUS_RUNNING, attempts=1, heartbeat_at=timezone.now()
+        )
+
+        assert requeue_stale_jobs() == 2
+        statuses = dict(Job.objects.values_list('pk', 'status'))
+        assert statuses == {
+            stale.pk: Job.STATUS_PENDING,
+            exhausted.pk: Job.STATUS_FAILED,
+            alive.pk: Job.STATUS_RUNNING,
+        }
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.unit
+@pytest.mark.utils
+class TestClaimSkipLocked:
+    """Тесты параллельного захвата задач"""
+
+    def test_locked_job_is_skipped(self):
+        """Тест, что задача, заблокированная другим воркером, пропускается"""
+        from softlex.jobs.models import Job
+        from softlex.jobs.registry import enqueue
+        from softlex.jobs.worker import claim_job
+
+        first = enqueue('tests.sum', {'numbers': []})
+        second = enqueue('tests.sum', {'numbers': []})
+        locked = threading.Event()
+        release = threading.Event()
+
+        def hold_lock():
+            with transaction.atomic():
+                Job.objects.select_for_update().get(pk=first.pk)
+                locked.set()
+                release.wait(5)
+            connection.close()
+
+        thread = threading.Thread(target=hold_lock)
+        thread.start()
+        try:
+            assert locked.wait(5)
+            claimed = claim_job('tests')
+        finally:
+            release.set()
+            thread.join()
+
+        assert claimed.pk == second.pk
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.unit
+@pytest.mark.utils
+class TestProgressConnection:
+    """Тесты отчета о прогрессе из длинной транзакции"""
+
+    def test_progress_survives_rollback(self):
+        """Тест, что прогресс виден сразу и не откатывается с транзакцией задачи"""
+        from softlex.jobs.models import Job
+        from softlex.jobs.registry import enqueue
+
+        job = enqueue('tests.sum', {'numbers': []})
+
+        with job.progress_connection(), transaction.atomic():
+            job.set_progress(5, message='Обработано 5')
+            # Прогресс уже зафиксирован отдельным соединением
+            assert Job.objects.values_list('progress', 'message').get(pk=job.pk) == (5, 'Обработано 5')
+            transaction.set_rollback(True)
+
+        job.refresh_from_db()
+        assert job.progress == 5
+
+
+@pytest.mark.django_db
+@pytest.mark.unit
+@pytest.mark.views
+class TestJobDetailView:
+    """Тесты для страницы прогресса задачи"""
+
+    def test_owner_gets_htmx_progress(self, client, user):
+        """Тест фрагмента прогресса для HTMX опроса"""
+        from softlex.jobs.registry import enqueue
+
+        job = enqueue('tests.sum', {'numbers': [1]}, user=user)
+
+        client.force_login(user)
+        response = client.get(reverse('jobs:job_detail', args=[job.pk]), HTTP_HX_REQUEST='true')
+
+        assert response.status_code == 200
+        assert 'jobs/partials/job_progress.html' in [t.name for t in response.templates]
+        assert 'base.html' not in [t.name for t in response.templates]
+        assert 'every 2s' in response.content.decode()
+
+    def test_other_user_denied(self, client, user):
+        """Тест запрета просмотра чужой задачи"""
+        from softlex.jobs.registry import enqueue
+
+        job = enqueue('tests.sum', {'numbers': [1]}, user=user)
+        other_user = User.objects.create_user(email='other@example.com', password='testpass123')
+
+        client.force_login(other_user)
+        response = client.get(reverse('jobs:job_detail', args=[job.pk]))
+
+        assert response.status_code == 403
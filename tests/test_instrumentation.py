@@ -0,0 +1,105 @@
+"""
+Тесты замеров запросов: Server-Timing, лог и бюджеты
+"""
+import json
+import logging
+from unittest import mock
+
+import pytest
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.urls import resolve, reverse
+
+
+def querying_view(count):
+    """Представление, выполняющее count SQL-запросов"""
+    def view(request):
+        from softlex.testcases.models import Project
+        for _ in range(count):
+            Project.objects.exists()
+        return HttpResponse('ok')
+    return view
+
+
+def measure(view):
+    """Выполняет представление через middleware и возвращает ответ и метрики"""
+    from softlex.instrumentation import RequestInstrumentationMiddleware, request_measured
+    measured = []
+
+    def receiver(sender, metrics, **kwargs):
+        measured.append(metrics)
+
+    def get_response(request):
+        middleware.process_view(request, view, (), {})
+        return view(request)
+
+    middleware = RequestInstrumentationMiddleware(get_response)
+    request_measured.connect(receiver)
+    try:
+        response = middleware(RequestFactory().get('/'))
+    finally:
+        request_measured.disconnect(receiver)
+    return response, measured[0]
+
+
+@pytest.mark.django_db
+@pytest.mark.unit
+@pytest.mark.utils
+class TestRequestInstrumentation:
+    """Тесты middleware замеров и бюджетов SQL-запросов"""
+
+    def test_server_timing_header(self, client, user):
+        """Тест заголовка Server-Timing со временем SQL, шаблонов и представления"""
+        client.force_login(user)
+
+        response = client.get(reverse('testcases:project_list'))
+
+        timing = response['Server-Timing']
+        for metric in ('sql;dur=', 'tpl;dur=', 'view;dur=', 'total;dur='):
+            assert metric in timing
+        assert 'queries"' in timing
+
+    def test_queries_counted(self):
+        """Тест подсчета SQL-запросов запроса"""
+        response, metrics = measure(querying_view(3))
+
+        assert metrics.queries == 3
+        assert 'desc="3 queries"' in response['Server-Timing']
+
+    def test_log_line_is_json(self, client, user):
+        """Тест строки лога с представлением и метриками запроса"""
+        from softlex import instrumentation
+        client.force_login(user)
+
+        with mock.patch.object(instrumentation.logger, 'log') as log:
+            client.get(reverse('testcases:project_list'))
+
+        level, line = log.call_args.args
+        record = json.loads(line)
+        assert level == logging.INFO
+        assert record['view'] == 'testcases.views.project_list'
+        assert record['status'] == 200
+        assert record['over_budget'] == []
+
+    def test_over_budget_logged_as_warning(self):
+        """Тест предупреждения в логе при превышении объявленного бюджета"""
+        from softlex import instrumentation
+
+        view = instrumentation.query_budget(1)(querying_view(2))
+        with mock.patch.object(instrumentation.logger, 'log') as log:
+            _, metrics = measure(view)
+
+        assert metrics.query_budget == 1
+        assert metrics.over_budget() == ['queries']
+        level, line = log.call_args.args
+        assert level == logging.WARNING
+        assert json.loads(line)['over_budget'] == ['queries']
+
+    def test_budget_fixture_fails_test(self, client, user, monkeypatch):
+        """Тест провала теста при превышении бюджета представлением приложения"""
+        client.force_login(user)
+        url = reverse('testcases:project_list')
+        monkeypatch.setattr(resolve(url).func, 'query_budget', 0)
+
+        with pytest.raises(pytest.fail.Exception, match='project_list'):
+            client.get(url)
@@ -0,0 +1,111 @@
+"""
+Тесты маршрутизации чтения на реплику
+"""
+import pytest
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory
+
+
+@pytest.fixture
+def replica_router(settings):
+    """Включает роутер реплики (сами запросы к базе в тестах не выполняются)"""
+    settings.DATABASE_ROUTERS = ['softlex.routers.ReplicaRouter']
+
+
+def routed(view_body=None):
+    """Представление, возвращающее базу, выбранную для чтения тест-кейсов"""
+    def view(request):
+        from softlex.testcases.models import TestCase
+        if view_body:
+            view_body()
+        return HttpResponse(TestCase.objects.all().db)
+    return view
+
+
+@pytest.mark.unit
+@pytest.mark.utils
+class TestReplicaRouting:
+    """Тесты роутера и middleware закрепления за основной базой"""
+
+    def test_reads_outside_request_use_primary(self, replica_router):
+        """Тест чтения вне HTTP-запроса из основной базы"""
+        from softlex.testcases.models import TestCase
+
+        assert TestCase.objects.all().db == 'default'
+
+    def test_get_reads_from_replica(self, replica_router):
+        """Тест чтения GET-запроса с реплики без закрепления"""
+        from softlex.routers import ReplicaRoutingMiddleware
+
+        response = ReplicaRoutingMiddleware(routed())(RequestFactory().get('/'))
+
+        assert response.content == b'replica'
+        assert 'db_primary' not in response.cookies
+
+    def test_post_pins_session_to_primary(self, replica_router):
+        """Тест чтения из основной базы после сохранения формы"""
+        from softlex.routers import ReplicaRoutingMiddleware
+        middleware = ReplicaRoutingMiddleware(routed())
+
+        response = middleware(RequestFactory().post('/'))
+        assert response.content == b'default'
+        cookie = response.cookies['db_primary']
+        assert cookie['max-age'] == 10
+
+        request = RequestFactory().get('/')
+        request.COOKIES['db_primary'] = cookie.value
+        assert middleware(request).content == b'default'
+
+    def test_write_in_get_switches_to_primary(self, replica_router):
+        """Тест чтения из основной базы после записи в том же запросе"""
+        from django.db import router
+        from softlex.routers import ReplicaRoutingMiddleware
+        from softlex.testcases.models import TestCase
+
+        response = ReplicaRoutingMiddleware(routed(lambda: router.db_for_write(TestCase)))(RequestFactory().get('/'))
+
+        assert response.content == b'default'
+        assert 'db_primary' in response.cookies
+
+    def test_streaming_response_keeps_routing(self, replica_router):
+        """Тест потокового ответа, читающего данные после выхода из middleware"""
+        from softlex.routers import ReplicaRoutingMiddleware
+        from softlex.testcases.models import TestCase
+
+        def view(request):
+            return StreamingHttpResponse(TestCase.objects.all().db for _ in range(2))
+
+        response = ReplicaRoutingMiddleware(view)(RequestFactory().get('/'))
+
+        assert b''.join(response.streaming_content) == b'replicareplica'
+
+    # Без общей транзакции теста: внутри нее роутер и так читает из основной базы
+    @pytest.mark.django_db(transaction=True)
+    def test_security_caches_read_from_primary(self, replica_router, user, project, project_member):
+        """Тест загрузки ролей и токенов для кэша из основной базы"""
+        from django.db import connections
+        from django.test.utils import CaptureQueriesContext
+        from softlex.api.auth import get_token_user_id
+        from softlex.api.models import ApiToken
+        from softlex.routers import ReplicaRoutingMiddleware
+        from softlex.testcases.permissions import ProjectPermissionResolver
+        _, key = ApiToken.generate(user, 'CI')
+
+        def view(request):
+            role = ProjectPermissionResolver(user).get_role(project)
+            return HttpResponse(f'{role}:{get_token_user_id(key)}')
+
+        with CaptureQueriesContext(connections['default']) as queries:
+            response = ReplicaRoutingMiddleware(view)(RequestFactory().get('/'))
+
+        assert response.content == f'editor:{user.pk}'.encode()
+        tables = ' '.join(query['sql'] for query in queries.captured_queries)
+        assert 'testcases_projectmember' in tables
+        assert 'api_apitoken' in tables
+
+    def test_replica_not_migrated(self):
+        """Тест запрета миграций на реплике"""
+        from softlex.routers import ReplicaRouter
+
+        assert ReplicaRouter().allow_migrate('replica', 'testcases') is False
+        assert ReplicaRouter().allow_migrate('default', 'testcases') is True
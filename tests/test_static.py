@@ -0,0 +1,36 @@
+"""
+Тесты сборки и раздачи статических файлов
+"""
+import pytest
+from django.core.management import call_command
+from django.test import Client
+
+
+@pytest.mark.slow
+@pytest.mark.integration
+class TestStaticFiles:
+    """Тесты хэшированной и сжатой статики"""
+
+    def test_collectstatic_and_serving(self, settings, tmp_path):
+        """Тест хэшированных имен, сжатых копий и кэширования навсегда"""
+        from django.templatetags.static import static
+        settings.STATIC_ROOT = tmp_path
+        settings.STORAGES = {
+            **settings.STORAGES,
+            'staticfiles': {'BACKEND': 'whitenoise.storage.CompressedManifestStaticFilesStorage'},
+        }
+
+        call_command('collectstatic', interactive=False, verbosity=0)
+
+        url = static('css/style.css')
+        assert url != '/static/css/style.css'
+        name = url.removeprefix(settings.STATIC_URL)
+        assert (tmp_path / f'{name}.gz').exists()
+        assert (tmp_path / f'{name}.br').exists()
+
+        # Новый клиент создает WhiteNoise, который читает собранную статику
+        response = Client().get(url, HTTP_ACCEPT_ENCODING='gzip, br')
+
+        assert response.status_code == 200
+        assert response['Content-Encoding'] == 'br'
+        assert 'immutable' in response['Cache-Control']
@@ -0,0 +1,82 @@
+"""
+Unit тесты для кэширования карточек в списках
+"""
+from unittest import mock
+
+import pytest
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+
+User = get_user_model()
+
+
+@pytest.mark.django_db
+@pytest.mark.unit
+@pytest.mark.views
+class TestCardCache:
+    """Тесты версионированного кэша карточек проектов и тест-кейсов"""
+
+    def test_cards_read_with_one_get_many(self, client, user, project, project_member):
+        """Тест чтения всех карточек страницы одним обращением к кэшу"""
+        from django.core.cache import cache
+        from softlex.testcases.models import TestCase
+        TestCase.objects.bulk_create([
+            TestCase(title=f'Кейс {index}', steps='Шаги', expected_result='Результат',
+                     project=project, created_by=user)
+            for index in range(5)
+        ])
+        client.force_login(user)
+        url = reverse('testcases:testcase_list')
+        client.get(url)
+
+        with mock.patch.object(cache, 'get_many', wraps=cache.get_many) as get_many, \
+                mock.patch.object(cache, 'set_many', wraps=cache.set_many) as set_many:
+            response = client.get(url)
+
+        assert get_many.call_count == 1
+        assert len(get_many.call_args.args[0]) == 5
+        assert not set_many.called
+        assert response.content.decode().count('testcase-card') == 5
+
+    def test_card_version_follows_updated_at(self, client, user, project, project_member, testcase):
+        """Тест повторной отрисовки карточки после изменения тест-кейса"""
+        from softlex.testcases.models import TestCase
+        client.force_login(user)
+        url = reverse('testcases:project_detail', args=[project.pk])
+        client.get(url)
+
+        # Изменение без обновления updated_at карточку не затрагивает
+        TestCase.objects.filter(pk=testcase.pk).update(title='Скрытое изменение')
+        assert 'Скрытое изменение' not in client.get(url).content.decode()
+
+        testcase.title = 'Новое название'
+        testcase.save()
+        assert 'Новое название' in client.get(url).content.decode()
+
+    def test_card_depends_on_role(self, client, user, project, project_member, testcase,
+                                  django_capture_on_commit_callbacks):
+        """Тест отдельной карточки для другой роли зрителя"""
+        client.force_login(user)
+        url = reverse('testcases:project_detail', args=[project.pk])
+        edit_url = reverse('testcases:testcase_edit', args=[testcase.pk])
+        assert edit_url in client.get(url).content.decode()
+
+        with django_capture_on_commit_callbacks(execute=True):
+            project_member.role = 'viewer'
+            project_member.save()
+
+        assert edit_url not in client.get(url).content.decode()
+
+    def test_project_card_counters(self, client, user, project, project_member):
+        """Тест обновления счетчиков в карточке проекта"""
+        from softlex.testcases.models import TestCase
+        client.force_login(user)
+        url = reverse('testcases:project_list')
+        client.get(url)
+
+        TestCase.objects.create(
+            title='Кейс', steps='Шаги', expected_result='Результат', project=project, created_by=user
+        )
+        response = client.get(url)
+
+        assert '<span class="fw-semibold">1</span>' in response.content.decode()
@@ -0,0 +1,145 @@
+"""
+Unit тесты для копирования проектов
+"""
+import pytest
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+
+User = get_user_model()
+
+
+@pytest.fixture
+def source_project(user, project, project_member, multiple_users):
+    """Проект с деревом секций, тест-кейсами и участниками"""
+    from softlex.testcases.models import ProjectMember, Section, TestCase
+    root = Section.objects.create(name='Auth', project=project)
+    child = Section.objects.create(name='Login', project=project, parent=root, order=3)
+    for title, section in [('Вход по паролю', child), ('Выход', root), ('Без секции', None)]:
+        TestCase.objects.create(
+            title=title, steps='Шаги', expected_result='Результат',
+            project=project, section=section, created_by=user
+        )
+    ProjectMember.objects.create(project=project, user=multiple_users[0], role='viewer')
+    return project
+
+
+@pytest.mark.django_db
+@pytest.mark.unit
+@pytest.mark.utils
+class TestCloneProject:
+    """Тесты для функции clone_project"""
+
+    def test_clone_copies_tree_and_cases(self, source_project, multiple_users):
+        """Тест копирования секций с новыми связями и тест-кейсов"""
+        from softlex.testcases.clone import clone_project
+        from softlex.testcases.models import Section, TestCase
+        from softlex.testcases.stats import refresh_project_stats
+
+        owner = multiple_users[1]
+        clone, copied = clone_project(source_project, 'Релиз 2', owner)
+
+        assert copied == {'sections': 2, 'test_cases': 3, 'members': 0}
+        root = Section.objects.get(project=clone, name='Auth')
+        child = Section.objects.get(project=clone, name='Login')
+        assert child.parent_id == root.pk
+        assert child.order == 3
+        assert child.path == f'{root.pk}/{child.pk}/'
+        assert TestCase.objects.get(project=clone, title='Вход по паролю').section_id == child.pk
+        assert TestCase.objects.get(project=clone, title='Без секции').section_id is None
+        assert TestCase.objects.filter(project=clone, search_vector='выход').exists()
+        assert list(clone.members.values_list('user_id', 'role')) == [(owner.pk, 'admin')]
+        assert TestCase.objects.filter(project=source_project).count() == 3
+        assert refresh_project_stats([clone.pk, source_project.pk]) == 0
+
+    def test_clone_with_members(self, user, source_project, multiple_users):
+        """Тест копирования участников"""
+        from softlex.testcases.clone import clone_project
+        from softlex.testcases.stats import refresh_project_stats
+
+        clone, copied = clone_project(source_project, 'Релиз 2', user, include_members=True)
+
+        assert copied['members'] == 1
+        assert dict(clone.members.values_list('user_id', 'role')) == {
+            user.pk: 'admin',
+            multiple_users[0].pk: 'viewer',
+        }
+        assert refresh_project_stats([clone.pk]) == 0
+
+
+@pytest.mark.django_db
+@pytest.mark.unit
+@pytest.mark.views
+class TestProjectCloneView:
+    """Тесты для копирования проекта через интерфейс"""
+
+    def test_clone_runs_as_job(self, client, user, source_project):
+        """Тест постановки и выполнения задачи копирования"""
+        from softlex.jobs.models import Job
+        from softlex.jobs.worker import claim_job, execute_job
+        from softlex.testcases.models import Project
+
+        client.force_login(user)
+        response = client.post(
+            reverse('testcases:project_clone', args=[source_project.pk]),
+            {'name': 'Релиз 2', 'include_members': 'on'}
+        )
+
+        job = Job.objects.get(task='testcases.clone_project')
+        assert response.url == reverse('jobs:job_detail', args=[job.pk])
+
+        claim_job('default')
+        assert execute_job(job.pk) == Job.STATUS_DONE
+        clone = Project.objects.get(name='Релиз 2')
+        assert clone.created_by == user
+        assert clone.test_cases.count() == 3
+
+    def test_deleted_source_fails_job(self, client, user, source_project):
+        """Тест ошибки задачи, если исходный проект удален до ее выполнения"""
+        from softlex.jobs.models import Job
+        from softlex.jobs.worker import claim_job, execute_job
+        from softlex.testcases.models import Project
+
+        client.force_login(user)
+        client.post(reverse('testcases:project_clone', args=[source_project.pk]), {'name': 'Релиз 2'})
+        Project.objects.filter(pk=source_project.pk).update(is_deleted=True)
+
+        claim_job('default')
+        assert execute_job(Job.objects.get().pk) == Job.STATUS_FAILED
+        assert Job.objects.get().message == 'Проект удален или не существует'
+        assert not Project.objects.filter(name='Релиз 2').exists()
+
+    def test_clone_visible_to_web_process(self, client, user, source_project):
+        """Тест доступа к копии из веб-процесса после сброса ролей в воркере"""
+        from django.test import override_settings
+        from softlex.jobs.models import Job
+        from softlex.jobs.worker import claim_job, execute_job
+        from softlex.testcases.models import Project
+
+        client.force_login(user)
+        client.post(
+            reverse('testcases:project_clone', args=[source_project.pk]),
+            {'name': 'Релиз 2'}
+        )
+        # Карта ролей веб-процесса закэширована до выполнения задачи
+        assert client.get(reverse('testcases:project_list')).status_code == 200
+
+        # Воркер - отдельный процесс со своим локальным кэшем
+        worker_caches = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+                                     'LOCATION': 'worker'}}
+        with override_settings(CACHES=worker_caches):
+            claim_job('default')
+            assert execute_job(Job.objects.get(task='testcases.clone_project').pk) == Job.STATUS_DONE
+
+        clone = Project.objects.get(name='Релиз 2')
+        assert client.get(reverse('testcases:project_detail', args=[clone.pk])).status_code == 200
+        assert 'Релиз 2' in client.get(reverse('testcases:project_list')).content.decode()
+
+    def test_viewer_cannot_clone(self, client, user, source_project, project_member):
+        """Тест запрета копирования для наблюдателя"""
+        project_member.role = 'viewer'
+        project_member.save()
+
+        client.force_login(user)
+        response = client.get(reverse('testcases:project_clone', args=[source_project.pk]))
+
+        assert response.status_code == 403
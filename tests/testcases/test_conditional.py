@@ -0,0 +1,107 @@
+"""
+Unit тесты для условного GET страниц проекта и тест-кейса
+"""
+import pytest
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+
+User = get_user_model()
+
+
+@pytest.mark.django_db
+@pytest.mark.unit
+@pytest.mark.views
+class TestConditionalGet:
+    """Тесты ETag и Last-Modified на детальных страницах"""
+
+    def test_testcase_not_modified(self, client, user, testcase, project_member, django_assert_max_num_queries):
+        """Тест ответа 304 без загрузки тест-кейса и отрисовки шаблона"""
+        client.force_login(user)
+        url = reverse('testcases:testcase_detail', args=[testcase.pk])
+        response = client.get(url)
+        assert response['ETag'].startswith('W/"')
+        assert 'Last-Modified' in response
+        assert 'no-cache' in response['Cache-Control']
+
+        with django_assert_max_num_queries(4) as queries:
+            response = client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+
+        assert response.status_code == 304
+        assert not response.templates
+        assert not any('"steps"' in query['sql'] for query in queries.captured_queries)
+
+    def test_project_post_skips_validators(self, client, user, project, project_member):
+        """Тест POST страницы проекта без запроса даты изменения тест-кейсов"""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        client.force_login(user)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = client.post(reverse('testcases:project_detail', args=[project.pk]), {'title': ''})
+
+        assert response.status_code == 200
+        assert 'ETag' not in response
+        assert not any('MAX(' in query['sql'] for query in queries.captured_queries)
+
+    def test_testcase_changed(self, client, user, testcase, project_member):
+        """Тест новой версии страницы после изменения тест-кейса"""
+        client.force_login(user)
+        url = reverse('testcases:testcase_detail', args=[testcase.pk])
+        etag = client.get(url)['ETag']
+
+        testcase.title = 'Новое название'
+        testcase.save()
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 200
+        assert response['ETag'] != etag
+
+    def test_role_change(self, client, user, project, project_member, django_capture_on_commit_callbacks):
+        """Тест новой версии страницы проекта после смены роли"""
+        client.force_login(user)
+        url = reverse('testcases:project_detail', args=[project.pk])
+        # Первый ответ выставляет CSRF-cookie формы, от которой зависит ETag
+        client.get(url)
+        etag = client.get(url)['ETag']
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+        with django_capture_on_commit_callbacks(execute=True):
+            project_member.role = 'viewer'
+            project_member.save()
+
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+    def test_project_list_changes(self, client, user, project, project_member, testcase):
+        """Тест новой версии страницы проекта после удаления тест-кейса"""
+        client.force_login(user)
+        url = reverse('testcases:project_detail', args=[project.pk])
+        etag = client.get(url)['ETag']
+
+        testcase.delete()
+
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+    def test_htmx_fragment_has_own_etag(self, client, user, project, project_member):
+        """Тест разных ETag у страницы и ее HTMX-фрагмента"""
+        client.force_login(user)
+        url = reverse('testcases:project_detail', args=[project.pk])
+        etag = client.get(url)['ETag']
+
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag, HTTP_HX_REQUEST='true')
+
+        assert response.status_code == 200
+        assert 'HX-Request' in response['Vary']
+
+    def test_pending_messages_disable_validators(self, client, user, project, project_member):
+        """Тест отрисовки страницы с flash-сообщением вместо ответа 304"""
+        client.force_login(user)
+        url = reverse('testcases:project_detail', args=[project.pk])
+        client.post(url, {
+            'title': 'Кейс', 'steps': 'Шаги', 'expected_result': 'Результат', 'project': project.pk,
+        })
+
+        response = client.get(url)
+
+        assert 'успешно создан' in response.content.decode()
+        assert 'ETag' not in response
+        assert 'ETag' in client.get(url)
@@ -0,0 +1,80 @@
+"""
+Unit тесты для выгрузки тест-кейсов в Excel
+"""
+import io
+
+import pytest
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+
+User = get_user_model()
+
+
+def load_sheet(response):
+    """Собирает потоковый ответ и открывает лист выгрузки"""
+    from openpyxl import load_workbook
+    content = b''.join(response.streaming_content)
+    return load_workbook(io.BytesIO(content), read_only=True).active
+
+
+@pytest.mark.django_db
+@pytest.mark.unit
+@pytest.mark.views
+class TestProjectExportView:
+    """Тесты для представления выгрузки проекта"""
+
+    def test_export_project(self, client, user, project, project_member):
+        """Тест выгрузки всех тест-кейсов проекта"""
+        from softlex.testcases.models import TestCase
+
+        TestCase.objects.bulk_create([
+            TestCase(
+                title=f'Кейс {i} <&>',
+                steps='Шаги\nв две строки',
+                expected_result='Результат',
+                project=project,
+                created_by=user
+            )
+            for i in range(1200)
+        ])
+
+        client.force_login(user)
+        response = client.get(reverse('testcases:project_export', args=[project.pk]))
+
+        assert response.status_code == 200
+        assert response.streaming
+        assert 'attachment' in response['Content-Disposition']
+
+        rows = list(load_sheet(response).iter_rows(values_only=True))
+        assert rows[0][:3] == ('ID', 'Секция', 'Название')
+        assert len(rows) == 1201
+        assert rows[1][2] == 'Кейс 0 <&>'
+        assert rows[1][5] == 'Шаги\nв две строки'
+
+    def test_export_section_includes_subsections(self, client, user, project, project_member):
+        """Тест выгрузки секции вместе с вложенными секциями"""
+        from softlex.testcases.models import Section, TestCase
+
+        root = Section.objects.create(name='Корень', project=project)
+        child = Section.objects.create(name='Вложенная', project=project, parent=root)
+        other = Section.objects.create(name='Другая', project=project)
+        for section in (root, child, other):
+            TestCase.objects.create(
+                title=f'Кейс {section.name}', steps='Шаги', expected_result='Результат',
+                project=project, section=section, created_by=user
+            )
+
+        client.force_login(user)
+        response = client.get(reverse('testcases:section_export', args=[project.pk, root.pk]))
+
+        titles = {row[2] for row in load_sheet(response).iter_rows(min_row=2, values_only=True)}
+        assert titles == {'Кейс Корень', 'Кейс Вложенная'}
+
+    def test_export_requires_access(self, client, user, project):
+        """Тест запрета выгрузки без доступа к проекту"""
+        other_user = User.objects.create_user(email='other@example.com', password='testpass123')
+
+        client.force_login(other_user)
+        response = client.get(reverse('testcases:project_export', args=[project.pk]))
+
+        assert response.status_code == 403
@@ -0,0 +1,248 @@
+"""
+Unit тесты для импорта тест-кейсов из Excel
+"""
+import io
+
+import pytest
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+
+User = get_user_model()
+
+
+def make_xlsx(rows, header=('Секция', 'Название', 'Описание', 'Шаги выполнения', 'Ожидаемый результат')):
+    """Создает .xlsx файл в памяти"""
+    from openpyxl import Workbook
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(header)
+    for row in rows:
+        sheet.append(row)
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    buffer.seek(0)
+    return buffer
+
+
+@pytest.mark.django_db
+@pytest.mark.unit
+@pytest.mark.utils
+class TestImportTestCases:
+    """Тесты для функции import_test_cases"""
+
+    def test_import_creates_cases_and_sections(self, user, project):
+        """Тест создания тест-кейсов и дерева секций по путям"""
+        from softlex.testcases.importer import import_test_cases
+        from softlex.testcases.models import Section, TestCase
+        from softlex.testcases.stats import refresh_project_stats
+
+        auth = Section.objects.create(name='Auth', project=project)
+        file = make_xlsx([
+            ('Auth/Login/SSO', 'Вход через SSO', '', 'Шаги', 'Результат'),
+            ('Auth/Login', 'Вход по паролю', 'Описание', 'Шаги', 'Результат'),
+            ('', 'Без секции', '', 'Шаги', 'Результат'),
+        ])
+
+        report = import_test_cases(file, project, user)
+
+        assert (report['rows'], report['created'], report['sections_created']) == (3, 3, 2)
+        login = Section.objects.get(name='Login', project=project)
+        sso = Section.objects.get(name='SSO', project=project)
+        assert login.parent_id == auth.pk
+        assert sso.parent_id == login.pk
+        assert sso.path == f'{auth.pk}/{login.pk}/{sso.pk}/'
+        assert TestCase.objects.get(title='Вход через SSO').section_id == sso.pk
+        assert TestCase.objects.get(title='Без секции').section_id is None
+        assert TestCase.objects.get(title='Вход по паролю').created_by == user
+        # Счетчики обновлены явно, без сигналов
+        assert refresh_project_stats([project.pk]) == 0
+
+    def test_invalid_rows_reported_and_skipped(self, user, project):
+        """Тест отчета об ошибках по строкам"""
+        from softlex.testcases.importer import import_test_cases
+        from softlex.testcases.models import TestCase
+
+        file = make_xlsx([
+            ('', 'Корректный', '', 'Шаги', 'Результат'),
+            ('', 'Без шагов', '', '', 'Результат'),
+            ('', 'x' * 301, '', 'Шаги', 'Результат'),
+        ])
+
+        report = import_test_cases(file, project, user)
+
+        assert report['created'] == 1
+        assert report['error_count'] == 2
+        assert [error['row'] for error in report['errors']] == [3, 4]
+        assert 'Поле шаги выполнения обязательно для заполнения' in report['errors'][0]['messages'][0]
+        assert list(TestCase.objects.values_list('title', flat=True)) == ['Корректный']
+
+    def test_duplicate_automation_keys_reported(self, user, project, testcase):
+        """Тест пропуска строк с уже занятым ключом автоматизации"""
+        from softlex.testcases.importer import import_test_cases
+        from softlex.testcases.models import TestCase
+
+        testcase.automation_key = 'tests.Existing'
+        testcase.save()
+        file = make_xlsx([
+            ('Первый', 'Шаги', 'Результат', 'tests.New'),
+            ('Повтор', 'Шаги', 'Результат', 'tests.New'),
+            ('Занятый', 'Шаги', 'Результат', 'tests.Existing'),
+        ], header=('Название', 'Шаги выполнения', 'Ожидаемый результат', 'Ключ автоматизации'))
+
+        report = import_test_cases(file, project, user)
+
+        assert report['created'] == 1
+        assert [error['row'] for error in report['errors']] == [3, 4]
+        assert TestCase.objects.get(automation_key='tests.New').title == 'Первый'
+
+    def test_dry_run_does_not_write(self, user, project):
+        """Тест проверки файла без сохранения"""
+        from softlex.testcases.importer import import_test_cases
+        from softlex.testcases.models import Section, TestCase
+
+        file = make_xlsx([('A/B', 'Кейс', '', 'Шаги', 'Результат')])
+
+        report = import_test_cases(file, project, user, dry_run=True)
+
+        assert (report['created'], report['sections_created']) == (1, 2)
+        assert not TestCase.objects.exists()
+        assert not Section.objects.exists()
+        project.stats.refresh_from_db()
+        assert project.stats.test_case_count == 0
+
+    def test_dry_run_across_batches(self, user, project, monkeypatch):
+        """Тест проверки файла из нескольких пачек с общими секциями"""
+        from softlex.testcases import importer
+        from softlex.testcases.models import Section, TestCase
+
+        monkeypatch.setattr(importer, 'IMPORT_BATCH_SIZE', 1)
+        file = make_xlsx([
+            ('A/B', 'Первый', '', 'Шаги', 'Результат'),
+            ('A/B/C', 'Второй', '', 'Шаги', 'Результат'),
+        ])
+
+        report = importer.import_test_cases(file, project, user, dry_run=True)
+
+        assert (report['created'], report['sections_created']) == (2, 3)
+        assert not TestCase.objects.exists()
+        assert not Section.objects.exists()
+
+    def test_progress_reported_per_batch(self, user, project, monkeypatch):
+        """Тест отчета о прогрессе после каждой пачки"""
+        from softlex.testcases import importer
+
+        monkeypatch.setattr(importer, 'IMPORT_BATCH_SIZE', 1)
+        calls = []
+        file = make_xlsx([
+            ('', 'Первый', '', 'Шаги', 'Результат'),
+            ('', 'Второй', '', 'Шаги', 'Результат'),
+        ])
+
+        importer.import_test_cases(file, project, user, progress=calls.append)
+
+        assert calls == [1, 2]
+
+    def test_failed_batch_rolls_back_import(self, user, project, monkeypatch):
+        """Тест отката всего импорта при ошибке записи пачки в середине файла"""
+        from softlex.testcases import importer
+        from softlex.testcases.models import Section, TestCase
+
+        monkeypatch.setattr(importer, 'IMPORT_BATCH_SIZE', 1)
+        import_batch = importer._import_batch
+        calls = []
+
+        def failing_batch(*args):
+            calls.append(1)
+            if len(calls) == 2:
+                raise RuntimeError('Ошибка записи')
+            import_batch(*args)
+
+        monkeypatch.setattr(importer, '_import_batch', failing_batch)
+        file = make_xlsx([
+            ('A', 'Первый', '', 'Шаги', 'Результат'),
+            ('B', 'Второй', '', 'Шаги', 'Результат'),
+            ('C', 'Третий', '', 'Шаги', 'Результат'),
+        ])
+
+        with pytest.raises(RuntimeError):
+            importer.import_test_cases(file, project, user)
+
+        assert not TestCase.objects.exists()
+        assert not Section.objects.exists()
+        project.stats.refresh_from_db()
+        assert (project.stats.test_case_count, project.stats.section_count) == (0, 0)
+
+    def test_missing_required_columns(self, user, project):
+        """Тест файла без обязательных колонок"""
+        from softlex.testcases.importer import ImportFileError, import_test_cases
+
+        file = make_xlsx([('Кейс',)], header=('Название',))
+
+        with pytest.raises(ImportFileError):
+            import_test_cases(file, project, user)
+
+
+@pytest.mark.django_db
+@pytest.mark.unit
+@pytest.mark.views
+class TestTestCaseImportView:
+    """Тесты для загрузки файла импорта"""
+
+    def test_upload_enqueues_job(self, client, user, project, project_member, settings, tmp_path):
+        """Тест постановки задачи импорта и ее выполнения"""
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        from softlex.jobs.models import Job
+        from softlex.jobs.worker import claim_job, execute_job
+        from softlex.testcases.models import TestCase
+
+        settings.MEDIA_ROOT = tmp_path
+        upload = SimpleUploadedFile(
+            'cases.xlsx', make_xlsx([('', 'Кейс', '', 'Шаги', 'Результат')]).read()
+        )
+
+        client.force_login(user)
+        response = client.post(reverse('testcases:testcase_import', args=[project.pk]), {'file': upload})
+
+        job = Job.objects.get()
+        assert response.status_code == 302
+        assert response.url == reverse('jobs:job_detail', args=[job.pk])
+        assert job.params['dry_run'] is False
+
+        claim_job('imports')
+        assert execute_job(job.pk) == Job.STATUS_DONE
+        job.refresh_from_db()
+        assert TestCase.objects.filter(project=project, title='Кейс').exists()
+        assert job.result['errors'] == []
+        assert not list(tmp_path.rglob('*.xlsx'))
+
+    def test_deleted_project_fails_job(self, client, user, project, project_member, settings, tmp_path):
+        """Тест ошибки задачи, если проект удален, пока задача ждала в очереди"""
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        from softlex.jobs.models import Job
+        from softlex.jobs.worker import claim_job, execute_job
+        from softlex.testcases.models import Project, TestCase
+
+        settings.MEDIA_ROOT = tmp_path
+        upload = SimpleUploadedFile(
+            'cases.xlsx', make_xlsx([('', 'Кейс', '', 'Шаги', 'Результат')]).read()
+        )
+        client.force_login(user)
+        client.post(reverse('testcases:testcase_import', args=[project.pk]), {'file': upload})
+        Project.objects.filter(pk=project.pk).update(is_deleted=True)
+
+        claim_job('imports')
+        assert execute_job(Job.objects.get().pk) == Job.STATUS_FAILED
+        job = Job.objects.get()
+        assert job.message == 'Проект удален или не существует'
+        assert not TestCase.objects.exists()
+        assert not list(tmp_path.rglob('*.xlsx'))
+
+    def test_viewer_cannot_import(self, client, user, project, project_member):
+        """Тест запрета импорта для наблюдателя"""
+        project_member.role = 'viewer'
+        project_member.save()
+
+        client.force_login(user)
+        response = client.get(reverse('testcases:testcase_import', args=[project.pk]))
+
+        assert response.status_code == 403
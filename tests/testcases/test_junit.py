@@ -0,0 +1,235 @@
+"""
+Unit тесты для загрузки результатов из отчетов JUnit XML
+"""
+import io
+
+import pytest
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+
+User = get_user_model()
+
+
+REPORT = b'''<?xml version="1.0" encoding="utf-8"?>
+<testsuites>
+  <testsuite name="auth" tests="4">
+    <properties><property name="python" value="3.11"/></properties>
+    <testcase classname="tests.test_auth.LoginTest" name="test_valid_password" time="0.1"/>
+    <testcase classname="tests.test_auth.LoginTest" name="test_wrong_password" time="0.2">
+      <failure message="AssertionError: 302 != 200">Traceback ...</failure>
+      <system-out>captured output</system-out>
+    </testcase>
+    <testcase classname="tests.test_auth.LoginTest" name="test_sso" time="0">
+      <skipped message="SSO is not configured"/>
+    </testcase>
+    <testcase classname="tests.test_auth.LogoutTest" name="test_logout" time="0.1">
+      <error message="ConnectionError"/>
+    </testcase>
+  </testsuite>
+</testsuites>
+'''
+
+
+@pytest.fixture
+def automated_cases(user, project, project_member):
+    """Тест-кейсы проекта с ключами автоматизации"""
+    from softlex.testcases.models import TestCase
+    cases = {}
+    for key in ['tests.test_auth.LoginTest.test_valid_password', 'tests.test_auth.LoginTest.test_wrong_password']:
+        cases[key] = TestCase.objects.create(
+            title=key.rsplit('.', 1)[-1], steps='Шаги', expected_result='Результат',
+            project=project, created_by=user, automation_key=key
+        )
+    return cases
+
+
+@pytest.mark.django_db
+@pytest.mark.unit
+@pytest.mark.utils
+class TestImportJUnit:
+    """Тесты для разбора отчета и функции import_junit"""
+
+    def test_iter_junit_cases(self):
+        """Тест потокового разбора отчета"""
+        from softlex.testcases.junit import iter_junit_cases
+
+        cases = list(iter_junit_cases(io.BytesIO(REPORT)))
+
+        assert cases == [
+            ('tests.test_auth.LoginTest.test_valid_password', 'test_valid_password', 'passed', ''),
+            ('tests.test_auth.LoginTest.test_wrong_password', 'test_wrong_password', 'failed',
+             'AssertionError: 302 != 200'),
+            ('tests.test_auth.LoginTest.test_sso', 'test_sso', 'skipped', 'SSO is not configured'),
+            ('tests.test_auth.LogoutTest.test_logout', 'test_logout', 'failed', 'ConnectionError'),
+        ]
+
+    def test_invalid_xml(self):
+        """Тест ошибки для файла, который не является XML"""
+        from softlex.testcases.junit import JUnitFileError, iter_junit_cases
+
+        with pytest.raises(JUnitFileError):
+            list(iter_junit_cases(io.BytesIO(b'<testsuite><testcase name="a">')))
+
+    def test_import_matches_by_automation_key(self, user, project, automated_cases, monkeypatch):
+        """Тест сопоставления по ключу и пропуска неизвестных автотестов"""
+        from softlex.testcases import junit
+        from softlex.testcases.models import TestResult, TestRun
+
+        # Маленькая пачка, чтобы отчет записывался в несколько приемов
+        monkeypatch.setattr(junit, 'JUNIT_BATCH_SIZE', 3)
+        run = TestRun.objects.create(name='CI', project=project, created_by=user)
+
+        report = junit.import_junit(io.BytesIO(REPORT), run, user)
+
+        assert report['cases'] == 4
+        assert report['recorded'] == 2
+        assert report['unknown'] == 2
+        assert report['statuses'] == {'passed': 1, 'failed': 2, 'skipped': 1}
+        results = {result.test_case.automation_key: result for result in TestResult.objects.filter(run=run)}
+        assert results['tests.test_auth.LoginTest.test_valid_password'].status == 'passed'
+        failed = results['tests.test_auth.LoginTest.test_wrong_password']
+        assert (failed.status, failed.comment, failed.updated_by) == ('failed', 'AssertionError: 302 != 200', user)
+
+    def test_reimport_overwrites_statuses(self, user, project, automated_cases):
+        """Тест повторной загрузки отчета в тот же прогон"""
+        from softlex.testcases.junit import import_junit
+        from softlex.testcases.models import TestResult, TestRun
+
+        run = TestRun.objects.create(name='CI', project=project, created_by=user)
+        import_junit(io.BytesIO(REPORT), run, user)
+        import_junit(io.BytesIO(REPORT.replace(b'<failure', b'<skipped').replace(b'</failure>', b'</skipped>')), run, user)
+
+        assert TestResult.objects.filter(run=run).count() == 2
+        assert TestResult.objects.get(
+            run=run, test_case=automated_cases['tests.test_auth.LoginTest.test_wrong_password']
+        ).status == 'skipped'
+
+    def test_create_missing(self, user, project, automated_cases):
+        """Тест создания тест-кейсов для неизвестных автотестов"""
+        from softlex.testcases.junit import import_junit
+        from softlex.testcases.models import ProjectStats, TestCase, TestRun
+
+        run = TestRun.objects.create(name='CI', project=project, created_by=user)
+        report = import_junit(io.BytesIO(REPORT), run, user, create_missing=True)
+
+        assert (report['created'], report['unknown'], report['recorded']) == (2, 0, 4)
+        created = TestCase.objects.get(project=project, automation_key='tests.test_auth.LoginTest.test_sso')
+        assert created.title == 'test_sso'
+        assert ProjectStats.objects.get(project=project).test_case_count == 4
+
+    def test_create_missing_skips_concurrent_cases(self, user, project, automated_cases, monkeypatch):
+        """Тест, что ключи, созданные параллельным импортом, не учитываются в счетчиках"""
+        from softlex.testcases import junit
+        from softlex.testcases.models import ProjectStats, TestCase, TestRun
+
+        key = 'tests.test_auth.LoginTest.test_sso'
+        create_test_cases = junit._create_test_cases
+
+        def concurrent_create(run, user, titles):
+            # Параллельный импорт создает тот же ключ между выборкой и вставкой
+            TestCase.objects.create(
+                title='test_sso', steps='Шаги', expected_result='Результат',
+                project=project, created_by=user, automation_key=key
+            )
+            return create_test_cases(run, user, titles)
+
+        monkeypatch.setattr(junit, '_create_test_cases', concurrent_create)
+        run = TestRun.objects.create(name='CI', project=project, created_by=user)
+        report = junit.import_junit(io.BytesIO(REPORT), run, user, create_missing=True)
+
+        assert (report['created'], report['unknown'], report['recorded']) == (1, 0, 4)
+        assert run.results.get(test_case__automation_key=key).status == 'skipped'
+        assert ProjectStats.objects.get(project=project).test_case_count == 4
+
+    def test_management_command(self, user, project, automated_cases, tmp_path):
+        """Тест загрузки отчета командой import_junit"""
+        from django.core.management import call_command
+        from softlex.testcases.models import TestRun
+
+        path = tmp_path / 'report.xml'
+        path.write_bytes(REPORT)
+        out = io.StringIO()
+
+        call_command(
+            'import_junit', str(path), project=project.pk, run_name='CI #1', user=user.email, stdout=out
+        )
+
+        run = TestRun.objects.get(project=project, name='CI #1')
+        assert run.results.count() == 2
+        assert 'tests.test_auth.LoginTest.test_sso' in out.getvalue()
+
+
+@pytest.mark.django_db
+@pytest.mark.unit
+@pytest.mark.views
+class TestJUnitUploadView:
+    """Тесты для загрузки отчета через интерфейс"""
+
+    def test_upload_runs_as_job(self, client, user, project, automated_cases, settings, tmp_path):
+        """Тест постановки задачи загрузки отчета и ее выполнения"""
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        from softlex.jobs.models import Job
+        from softlex.jobs.worker import claim_job, execute_job
+        from softlex.testcases.models import TestRun
+
+        settings.MEDIA_ROOT = tmp_path
+        client.force_login(user)
+        response = client.post(reverse('testcases:junit_upload', args=[project.pk]), {
+            'file': SimpleUploadedFile('report.xml', REPORT),
+            'run_name': 'CI #2',
+        })
+
+        job = Job.objects.get()
+        assert response.status_code == 302
+        assert response.url == reverse('jobs:job_detail', args=[job.pk])
+
+        claim_job('imports')
+        assert execute_job(job.pk) == Job.STATUS_DONE
+        job.refresh_from_db()
+        run = TestRun.objects.get(project=project, name='CI #2')
+        assert run.results.count() == 2
+        assert job.result['url'] == reverse('testcases:run_detail', args=[run.pk])
+        assert not list(tmp_path.rglob('*.xml'))
+
+    def test_deleted_project_fails_job(self, client, user, project, automated_cases, settings, tmp_path):
+        """Тест ошибки задачи, если проект прогона удален до ее выполнения"""
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        from softlex.jobs.models import Job
+        from softlex.jobs.worker import claim_job, execute_job
+        from softlex.testcases.models import Project, TestResult
+
+        settings.MEDIA_ROOT = tmp_path
+        client.force_login(user)
+        client.post(reverse('testcases:junit_upload', args=[project.pk]), {
+            'file': SimpleUploadedFile('report.xml', REPORT),
+            'run_name': 'CI #2',
+        })
+        Project.objects.filter(pk=project.pk).update(is_deleted=True)
+
+        claim_job('imports')
+        assert execute_job(Job.objects.get().pk) == Job.STATUS_FAILED
+        assert Job.objects.get().message == 'Прогон удален или не существует'
+        assert not TestResult.objects.exists()
+        assert not list(tmp_path.rglob('*.xml'))
+
+    def test_run_or_name_required(self, client, user, project, project_member):
+        """Тест ошибки формы без прогона и названия"""
+        from django.core.files.uploadedfile import SimpleUploadedFile
+
+        client.force_login(user)
+        response = client.post(reverse('testcases:junit_upload', args=[project.pk]), {
+            'file': SimpleUploadedFile('report.xml', REPORT),
+        })
+
+        assert response.status_code == 200
+        assert 'Выберите прогон или укажите название нового' in response.content.decode()
+
+    def test_viewer_cannot_upload(self, client, user, project, project_member):
+        """Тест запрета загрузки для наблюдателя"""
+        project_member.role = 'viewer'
+        project_member.save()
+
+        client.force_login(user)
+        response = client.get(reverse('testcases:junit_upload', args=[project.pk]))
+
+        assert response.status_code == 403
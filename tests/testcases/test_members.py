@@ -0,0 +1,136 @@
+"""
+Unit тесты для массовой синхронизации участников проекта
+"""
+import pytest
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+
+User = get_user_model()
+
+
+@pytest.mark.django_db
+@pytest.mark.unit
+@pytest.mark.utils
+class TestParseMemberList:
+    """Тесты для разбора списка участников"""
+
+    def test_csv_with_header_and_roles(self):
+        """Тест разбора CSV с заголовком и ролями"""
+        from softlex.testcases.members import parse_member_list
+
+        text = 'email;role\nUser1@Example.com;editor\nuser2@example.com\n'
+
+        assert parse_member_list(text) == [
+            {'user_email': 'user1@example.com', 'role': 'editor'},
+            {'user_email': 'user2@example.com', 'role': 'viewer'},
+        ]
+
+    def test_pasted_list_with_default_role(self):
+        """Тест разбора вставленного списка через запятую"""
+        from softlex.testcases.members import parse_member_list
+
+        members = parse_member_list('a@example.com, b@example.com  c@example.com', default_role='editor')
+
+        assert [m['user_email'] for m in members] == ['a@example.com', 'b@example.com', 'c@example.com']
+        assert {m['role'] for m in members} == {'editor'}
+
+
+@pytest.mark.django_db
+@pytest.mark.unit
+@pytest.mark.utils
+class TestSyncProjectMembers:
+    """Тесты для функции sync_project_members"""
+
+    def test_add_update_remove(self, user, project, multiple_users):
+        """Тест добавления, изменения роли и удаления участников"""
+        from softlex.testcases.members import sync_project_members
+        from softlex.testcases.models import ProjectMember
+        from softlex.testcases.stats import refresh_project_stats
+
+        first, second, third = multiple_users[:3]
+        sync_project_members(project, [
+            {'user_id': first.id, 'role': 'viewer'},
+            {'user_id': second.id, 'role': 'viewer'},
+        ], added_by=user)
+
+        result = sync_project_members(project, [
+            {'user_id': first.id, 'role': 'editor'},
+            {'user_email': third.email, 'role': 'viewer'},
+        ], added_by=user)
+
+        assert result == {'added': 1, 'updated': 1, 'removed': 1, 'unknown': []}
+        assert dict(ProjectMember.objects.filter(project=project).values_list('user_id', 'role')) == {
+            first.id: 'editor',
+            third.id: 'viewer',
+        }
+        # Счетчик участников обновлен без сигналов и не расходится с данными
+        assert refresh_project_stats([project.pk]) == 0
+
+    def test_constant_number_of_queries(self, user, project, django_assert_max_num_queries):
+        """Тест, что количество запросов не зависит от числа участников"""
+        from softlex.testcases.members import sync_project_members
+
+        users = User.objects.bulk_create([
+            User(email=f'bulk{i}@example.com') for i in range(100)
+        ])
+        members = [{'user_email': u.email, 'role': 'viewer'} for u in users]
+
+        with django_assert_max_num_queries(8):
+            result = sync_project_members(project, members, added_by=user)
+
+        assert result['added'] == 100
+
+    def test_unknown_emails_and_creator_skipped(self, user, project):
+        """Тест пропуска несуществующих пользователей и создателя проекта"""
+        from softlex.testcases.members import sync_project_members
+        from softlex.testcases.models import ProjectMember
+
+        result = sync_project_members(project, [
+            {'user_email': 'missing@example.com', 'role': 'viewer'},
+            {'user_id': user.id, 'role': 'viewer'},
+        ], added_by=user)
+
+        assert result['unknown'] == ['missing@example.com']
+        assert not ProjectMember.objects.filter(project=project).exists()
+
+
+@pytest.mark.django_db
+@pytest.mark.unit
+@pytest.mark.views
+class TestProjectMembersBulkView:
+    """Тесты для массового добавления участников"""
+
+    def test_bulk_add_from_csv(self, client, admin, project, multiple_users):
+        """Тест добавления участников из CSV файла без удаления существующих"""
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        from softlex.testcases.models import ProjectMember
+
+        ProjectMember.objects.create(project=project, user=multiple_users[0], role='editor')
+        csv_file = SimpleUploadedFile(
+            'members.csv',
+            f'email,role\n{multiple_users[1].email},editor\nnobody@example.com\n'.encode('utf-8'),
+            content_type='text/csv'
+        )
+
+        client.force_login(admin)
+        response = client.post(
+            reverse('testcases:project_members_bulk', args=[project.pk]),
+            {'members_text': multiple_users[2].email, 'members_file': csv_file, 'role': 'viewer'}
+        )
+
+        assert response.status_code == 302
+        assert dict(ProjectMember.objects.filter(project=project).values_list('user_id', 'role')) == {
+            multiple_users[0].id: 'editor',
+            multiple_users[1].id: 'editor',
+            multiple_users[2].id: 'viewer',
+        }
+
+    def test_bulk_add_requires_project_admin(self, client, user, project, project_member):
+        """Тест запрета массового добавления для редактора проекта"""
+        client.force_login(user)
+        response = client.post(
+            reverse('testcases:project_members_bulk', args=[project.pk]),
+            {'members_text': 'someone@example.com', 'role': 'viewer'}
+        )
+
+        assert response.status_code == 403
@@ -0,0 +1,111 @@
+"""
+Unit тесты для курсорной пагинации списков
+"""
+import pytest
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+
+User = get_user_model()
+
+
+@pytest.fixture
+def many_testcases(user, project, project_member):
+    """Создает тест-кейсы для нескольких страниц"""
+    from softlex.testcases.models import TestCase
+    return TestCase.objects.bulk_create([
+        TestCase(
+            title=f'Кейс {i:03}',
+            steps='Шаги',
+            expected_result='Результат',
+            project=project,
+            created_by=user
+        )
+        for i in range(75)
+    ])
+
+
+@pytest.mark.django_db
+@pytest.mark.unit
+@pytest.mark.utils
+class TestPaginateKeyset:
+    """Тесты для функции paginate_keyset"""
+
+    def test_pages_cover_all_items_without_duplicates(self, many_testcases):
+        """Тест обхода всех страниц по курсору"""
+        from softlex.testcases.models import TestCase
+        from softlex.testcases.pagination import paginate_keyset, TESTCASE_ORDERINGS
+
+        seen = []
+        cursor = None
+        while True:
+            page = paginate_keyset(TestCase.objects.all(), TESTCASE_ORDERINGS['title'], cursor, per_page=20)
+            seen.extend(test_case.pk for test_case in page)
+            if not page.has_next:
+                break
+            cursor = page.next_cursor
+
+        assert len(seen) == len(many_testcases)
+        assert len(set(seen)) == len(seen)
+
+    def test_title_ordering(self, many_testcases):
+        """Тест сортировки по названию"""
+        from softlex.testcases.models import TestCase
+        from softlex.testcases.pagination import paginate_keyset, TESTCASE_ORDERINGS
+
+        page = paginate_keyset(TestCase.objects.all(), TESTCASE_ORDERINGS['title'], per_page=5)
+
+        assert [test_case.title for test_case in page] == [f'Кейс {i:03}' for i in range(5)]
+        assert page.has_next
+
+    def test_invalid_cursor_returns_first_page(self, many_testcases):
+        """Тест поврежденного курсора"""
+        from softlex.testcases.models import TestCase
+        from softlex.testcases.pagination import paginate_keyset, TESTCASE_ORDERINGS
+
+        first = paginate_keyset(TestCase.objects.all(), TESTCASE_ORDERINGS['created'], per_page=5)
+        broken = paginate_keyset(TestCase.objects.all(), TESTCASE_ORDERINGS['created'], 'не-курсор', per_page=5)
+
+        assert [t.pk for t in broken] == [t.pk for t in first]
+
+
+@pytest.mark.django_db
+@pytest.mark.unit
+@pytest.mark.views
+class TestPaginatedViews:
+    """Тесты серверной фильтрации и пагинации в представлениях"""
+
+    def test_project_detail_first_page(self, client, user, project, many_testcases):
+        """Тест первой страницы тест-кейсов проекта"""
+        from softlex.testcases.pagination import PAGE_SIZE
+
+        client.force_login(user)
+        response = client.get(reverse('testcases:project_detail', args=[project.pk]))
+
+        assert response.status_code == 200
+        assert len(response.context['page']) == PAGE_SIZE
+        assert response.context['page'].has_next
+
+    def test_htmx_next_page_returns_fragment(self, client, user, project, many_testcases):
+        """Тест подгрузки следующей страницы через HTMX"""
+        client.force_login(user)
+        url = reverse('testcases:testcase_list')
+        first = client.get(url)
+
+        response = client.get(
+            url,
+            {'cursor': first.context['page'].next_cursor},
+            HTTP_HX_REQUEST='true'
+        )
+
+        assert response.status_code == 200
+        assert 'testcases/partials/testcase_items.html' in [t.name for t in response.templates]
+        assert 'base.html' not in [t.name for t in response.templates]
+
+    def test_server_side_search(self, client, user, project, many_testcases):
+        """Тест поиска по названию на стороне сервера"""
+        client.force_login(user)
+        response = client.get(reverse('testcases:testcase_list'), {'search': 'Кейс 07'})
+
+        titles = [test_case.title for test_case in response.context['page']]
+        assert titles
+        assert all('Кейс 07' in title for title in titles)
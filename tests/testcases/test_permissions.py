@@ -0,0 +1,163 @@
+"""
+Unit тесты для резолвера прав на проекты
+"""
+import pytest
+from django.contrib.auth import get_user_model
+
+User = get_user_model()
+
+
+@pytest.mark.django_db
+@pytest.mark.unit
+@pytest.mark.utils
+class TestProjectPermissionResolver:
+    """Тесты для ProjectPermissionResolver"""
+
+    def test_roles_loaded_once(self, user, multiple_projects, django_assert_num_queries):
+        """Тест загрузки карты ролей одним запросом"""
+        from softlex.testcases.permissions import get_project_permissions
+        from softlex.testcases.utils import can_view_project, can_edit_project, get_user_project_role
+
+        member = User.objects.get(email='user1@example.com')
+
+        with django_assert_num_queries(1):
+            for project in multiple_projects:
+                assert can_view_project(member, project)
+                assert not can_edit_project(member, project)
+                assert get_user_project_role(member, project) == 'editor'
+
+        assert get_project_permissions(member) is get_project_permissions(member)
+
+    def test_role_hierarchy(self, multiple_projects):
+        """Тест иерархии ролей"""
+        from softlex.testcases.permissions import ProjectPermissionResolver
+
+        viewer = User.objects.get(email='user0@example.com')
+        resolver = ProjectPermissionResolver(viewer)
+        project = multiple_projects[0]
+
+        assert resolver.has_access(project)
+        assert resolver.has_access(project, min_role='viewer')
+        assert not resolver.has_access(project, min_role='editor')
+        assert resolver.get_role(project.pk) == 'viewer'
+
+    def test_admin_needs_no_queries(self, admin, project, django_assert_num_queries):
+        """Тест системного администратора"""
+        from softlex.testcases.permissions import ProjectPermissionResolver
+
+        resolver = ProjectPermissionResolver(admin)
+        with django_assert_num_queries(0):
+            assert resolver.get_role(project) == 'admin'
+            assert resolver.can_edit_project(project)
+
+    def test_no_membership(self, user, multiple_users, project):
+        """Тест пользователя без участия в проекте"""
+        from softlex.testcases.permissions import ProjectPermissionResolver
+
+        resolver = ProjectPermissionResolver(multiple_users[4])
+
+        assert resolver.get_role(project) is None
+        assert not resolver.can_view_project(project)
+
+    def test_middleware_attaches_resolver(self, client, user, project, project_member):
+        """Тест middleware, добавляющего резолвер в запрос"""
+        from django.urls import reverse
+
+        client.force_login(user)
+        response = client.get(reverse('testcases:project_detail', args=[project.pk]))
+
+        assert response.wsgi_request.project_permissions.get_role(project) == 'editor'
+
+
+@pytest.mark.django_db
+@pytest.mark.unit
+@pytest.mark.utils
+class TestProjectRolesCache:
+    """Тесты для кэширования карты ролей между запросами"""
+
+    def test_warm_cache_needs_no_queries(self, user, project, project_member, django_assert_num_queries):
+        """Тест повторной загрузки ролей из кэша"""
+        from softlex.testcases.permissions import ProjectPermissionResolver
+
+        assert ProjectPermissionResolver(user).get_role(project) == 'editor'
+
+        with django_assert_num_queries(0):
+            assert ProjectPermissionResolver(user).get_role(project) == 'editor'
+
+    def test_membership_change_invalidates_cache(self, user, project, project_member):
+        """Тест сброса кэша при изменении участия в проекте"""
+        from softlex.testcases.permissions import ProjectPermissionResolver
+
+        assert ProjectPermissionResolver(user).get_role(project) == 'editor'
+
+        project_member.delete()
+
+        # Следующий запрос загружает пользователя с новой версией ролей
+        assert ProjectPermissionResolver(User.objects.get(pk=user.pk)).get_role(project) is None
+
+    def test_invalidation_does_not_depend_on_cache(self, user, project, project_member):
+        """Тест сброса без обращения к кэшу: версия хранится в базе и видна всем процессам"""
+        from django.core.cache import cache
+        from softlex.testcases.permissions import ProjectPermissionResolver
+
+        before = User.objects.get(pk=user.pk)
+        assert ProjectPermissionResolver(before).get_role(project) == 'editor'
+        key = f'project_roles:{user.pk}:{before.roles_version}'
+
+        project_member.role = 'viewer'
+        project_member.save()
+
+        # Кэш другого процесса не изменился, но следующий запрос читает новую версию
+        assert cache.get(key) == {project.pk: 'editor'}
+        after = User.objects.get(pk=user.pk)
+        assert after.roles_version == before.roles_version + 1
+        assert ProjectPermissionResolver(after).get_role(project) == 'viewer'
+
+    def test_stale_user_save_keeps_roles_version(self, user, project, project_member):
+        """Тест сохранения ранее загруженного пользователя без отката версии ролей"""
+        stale = User.objects.get(pk=user.pk)
+        project_member.delete()
+
+        stale.first_name = 'Новое имя'
+        stale.save()
+
+        fresh = User.objects.get(pk=user.pk)
+        assert fresh.first_name == 'Новое имя'
+        assert fresh.roles_version == stale.roles_version + 1
+
+    def test_deferred_user_save_skips_deferred_fields(self, user):
+        """Тест сохранения пользователя с отложенными полями одним UPDATE"""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        partial = User.objects.only('first_name').get(pk=user.pk)
+        partial.first_name = 'Новое имя'
+        with CaptureQueriesContext(connection) as queries:
+            partial.save()
+
+        assert len(queries.captured_queries) == 1
+        assert 'email' not in queries.captured_queries[0]['sql']
+        fresh = User.objects.get(pk=user.pk)
+        assert (fresh.first_name, fresh.email) == ('Новое имя', user.email)
+
+    def test_form_bulk_delete_invalidates_cache(self, user, multiple_users):
+        """Тест сброса кэша при удалении участников через форму проекта"""
+        from softlex.testcases.forms import ProjectForm
+        from softlex.testcases.permissions import ProjectPermissionResolver
+        import json
+
+        member = multiple_users[0]
+        form = ProjectForm(data={
+            'name': 'Проект',
+            'members_data': json.dumps([{'user_id': member.id, 'user_email': member.email, 'role': 'viewer'}])
+        }, user=user)
+        assert form.is_valid()
+        project = form.save()
+
+        assert ProjectPermissionResolver(User.objects.get(pk=member.pk)).get_role(project) == 'viewer'
+
+        form = ProjectForm(data={'name': 'Проект', 'members_data': '[]'}, instance=project, user=user)
+        assert form.is_valid()
+        form.save()
+
+        assert ProjectPermissionResolver(User.objects.get(pk=member.pk)).get_role(project) is None
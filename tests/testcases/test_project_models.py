@@ -221,7 +221,112 @@ class TestSectionModel:
         after_creation = timezone.now()
         
         assert before_creation <= section.created_at <= after_creation
+    
+    def test_section_path_on_create(self, project):
+        """Тест заполнения материализованного пути при создании"""
+        from softlex.testcases.models import Section
+        
+        root = Section.objects.create(name='Корень', project=project)
+        child = Section.objects.create(name='Дочерняя', project=project, parent=root)
+        
+        assert root.path == f'{root.pk}/'
+        assert child.path == f'{root.pk}/{child.pk}/'
+        assert child.level == 1
+        assert Section.objects.get(pk=child.pk).path == child.path
+        assert list(child.get_ancestors()) == [root]
+        assert list(root.get_descendants()) == [child]
+    
+    def test_section_move_rewrites_subtree_paths(self, project):
+        """Тест пересчета путей поддерева при переносе секции"""
+        from softlex.testcases.models import Section
+        
+        first = Section.objects.create(name='Первая', project=project)
+        second = Section.objects.create(name='Вторая', project=project)
+        child = Section.objects.create(name='Дочерняя', project=project, parent=first)
+        leaf = Section.objects.create(name='Лист', project=project, parent=child)
+        
+        child.parent = second
+        child.save()
+        
+        leaf.refresh_from_db()
+        assert leaf.path == f'{second.pk}/{child.pk}/{leaf.pk}/'
+        assert set(second.get_descendants()) == {child, leaf}
+        assert not first.get_descendants().exists()
+    
+    def test_section_move_under_deep_parent(self, project):
+        """Тест переноса поддерева под глубоко вложенную секцию (путь длиннее 255)"""
+        from softlex.testcases.models import Section
+        
+        parent = None
+        for level in range(100):
+            parent = Section.objects.create(name=f'Уровень {level}', project=project, parent=parent)
+        child = Section.objects.create(name='Дочерняя', project=project)
+        leaf = Section.objects.create(name='Лист', project=project, parent=child)
+        
+        child.parent = parent
+        child.save()
+        
+        leaf.refresh_from_db()
+        assert len(leaf.path) > 255
+        assert leaf.path == f'{parent.path}{child.pk}/{leaf.pk}/'
+        assert leaf.level == 101
+    
+    def test_section_cannot_move_into_own_subtree(self, project):
+        """Тест запрета переноса секции внутрь своего поддерева"""
+        from softlex.testcases.models import Section
+        
+        root = Section.objects.create(name='Корень', project=project)
+        child = Section.objects.create(name='Дочерняя', project=project, parent=root)
+        
+        root.parent = child
+        with pytest.raises(ValueError):
+            root.save()
+    
+    def test_section_delete_removes_subtree(self, project, user):
+        """Тест удаления секции вместе с поддеревом"""
+        from softlex.testcases.models import Section, TestCase
+        from softlex.testcases.stats import refresh_project_stats
+        
+        root = Section.objects.create(name='Корень', project=project)
+        child = Section.objects.create(name='Дочерняя', project=project, parent=root)
+        Section.objects.create(name='Лист', project=project, parent=child)
+        other = Section.objects.create(name='Другая', project=project)
+        test_case = TestCase.objects.create(
+            title='Кейс', steps='Шаги', expected_result='Результат',
+            project=project, section=child, created_by=user
+        )
+        
+        root.delete()
+        
+        assert list(Section.objects.all()) == [other]
+        test_case.refresh_from_db()
+        assert test_case.section is None
+        assert refresh_project_stats([project.pk]) == 0
+
 
+@pytest.mark.django_db
+@pytest.mark.unit
+@pytest.mark.utils
+class TestSectionTree:
+    """Тесты для построения дерева секций"""
+    
+    def test_tree_built_with_single_query(self, project, django_assert_num_queries):
+        """Тест построения дерева одним запросом с сортировкой по order"""
+        from softlex.testcases.models import Section
+        from softlex.testcases.utils import get_section_tree
+        
+        root = Section.objects.create(name='Корень', project=project)
+        second = Section.objects.create(name='Б', project=project, parent=root, order=2)
+        first = Section.objects.create(name='В', project=project, parent=root, order=1)
+        leaf = Section.objects.create(name='Лист', project=project, parent=second)
+        other = Section.objects.create(name='А', project=project)
+        
+        with django_assert_num_queries(1):
+            tree = get_section_tree(project)
+        
+        assert tree == [other, root]
+        assert tree[1].tree_children == [first, second]
+        assert tree[1].tree_children[1].tree_children == [leaf]
 
 @pytest.mark.django_db
 @pytest.mark.unit
@@ -0,0 +1,80 @@
+"""
+Unit тесты для денормализованной статистики проектов
+"""
+import pytest
+from django.core.management import call_command
+from django.contrib.auth import get_user_model
+
+User = get_user_model()
+
+
+@pytest.mark.django_db
+@pytest.mark.unit
+@pytest.mark.models
+class TestProjectStats:
+    """Тесты для модели ProjectStats и ее поддержки"""
+
+    def test_stats_created_with_project(self, project):
+        """Тест создания статистики вместе с проектом"""
+        from softlex.testcases.models import ProjectStats
+
+        stats = ProjectStats.objects.get(project=project)
+        assert stats.test_case_count == 0
+        assert stats.member_count == 0
+
+    def test_counters_follow_writes(self, project, testcase, section, project_member):
+        """Тест инкрементального обновления счетчиков"""
+        project.stats.refresh_from_db()
+        assert project.stats.test_case_count == 1
+        assert project.stats.section_count == 1
+        assert project.stats.member_count == 1
+
+        testcase.delete()
+        project.stats.refresh_from_db()
+        assert project.stats.test_case_count == 0
+
+    def test_testcase_moved_between_projects(self, user, project, testcase):
+        """Тест переноса тест-кейса в другой проект"""
+        from softlex.testcases.models import Project
+
+        other = Project.objects.create(name='Другой проект', created_by=user)
+        testcase.project = other
+        testcase.save()
+
+        project.stats.refresh_from_db()
+        other.stats.refresh_from_db()
+        assert project.stats.test_case_count == 0
+        assert other.stats.test_case_count == 1
+
+    def test_loaded_testcase_moved_without_extra_select(self, user, project, testcase):
+        """Тест переноса загруженного тест-кейса без чтения строки перед сохранением"""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from softlex.testcases.models import Project, TestCase
+
+        other = Project.objects.create(name='Другой проект', created_by=user)
+        loaded = TestCase.objects.get(pk=testcase.pk)
+        loaded.project = other
+        with CaptureQueriesContext(connection) as queries:
+            loaded.save()
+
+        assert not any(query['sql'].startswith('SELECT') for query in queries.captured_queries)
+        project.stats.refresh_from_db()
+        other.stats.refresh_from_db()
+        assert (project.stats.test_case_count, other.stats.test_case_count) == (0, 1)
+
+    def test_reconcile_command_repairs_drift(self, user, project):
+        """Тест исправления расхождений командой reconcile_project_stats"""
+        from softlex.testcases.models import ProjectStats, TestCase
+
+        TestCase.objects.bulk_create([
+            TestCase(title=f'Кейс {i}', steps='Шаги', expected_result='Результат',
+                     project=project, created_by=user)
+            for i in range(3)
+        ])
+        ProjectStats.objects.filter(project=project).delete()
+
+        call_command('reconcile_project_stats')
+
+        stats = ProjectStats.objects.get(project=project)
+        assert stats.test_case_count == 3
@@ -0,0 +1,107 @@
+"""
+Unit тесты для фонового удаления проектов
+"""
+import pytest
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+
+User = get_user_model()
+
+
+@pytest.fixture
+def filled_project(user, project, project_member, multiple_users):
+    """Проект с деревом секций, тест-кейсами и участниками"""
+    from softlex.testcases.models import ProjectMember, Section, TestCase
+    root = Section.objects.create(name='Корень', project=project)
+    child = Section.objects.create(name='Дочерняя', project=project, parent=root)
+    Section.objects.create(name='Лист', project=project, parent=child)
+    for i in range(7):
+        TestCase.objects.create(
+            title=f'Кейс {i}', steps='Шаги', expected_result='Результат',
+            project=project, section=child if i % 2 else None, created_by=user
+        )
+    for member in multiple_users[:2]:
+        ProjectMember.objects.create(project=project, user=member, role='viewer')
+    return project
+
+
+@pytest.mark.django_db
+@pytest.mark.unit
+@pytest.mark.utils
+class TestPurgeProject:
+    """Тесты для функции purge_project"""
+
+    def test_purge_deletes_in_batches(self, user, filled_project):
+        """Тест удаления всех данных проекта пачками"""
+        from softlex.testcases.models import Project, ProjectMember, ProjectStats, Section, TestCase
+        from softlex.testcases.purge import mark_project_deleted, purge_project
+        from softlex.testcases.runs import create_run
+
+        create_run(filled_project, 'Регресс', user)
+        other_project = Project.objects.create(name='Другой', created_by=user)
+        Section.objects.create(name='Чужая', project=other_project)
+
+        batches = []
+        mark_project_deleted(filled_project)
+        deleted = purge_project(filled_project.pk, batch_size=2, progress=batches.append)
+
+        assert deleted == 7 + 1 + 7 + 3 + 3
+        assert max(batches) == 2
+        assert not Project.objects.filter(pk=filled_project.pk).exists()
+        assert not TestCase.objects.filter(project_id=filled_project.pk).exists()
+        assert not Section.objects.filter(project_id=filled_project.pk).exists()
+        assert not ProjectMember.objects.filter(project_id=filled_project.pk).exists()
+        assert not ProjectStats.objects.filter(project_id=filled_project.pk).exists()
+        assert Section.objects.filter(project=other_project).exists()
+
+    def test_purge_skips_active_project(self, filled_project):
+        """Тест защиты от удаления не помеченного проекта"""
+        from softlex.testcases.models import TestCase
+        from softlex.testcases.purge import purge_project
+
+        assert purge_project(filled_project.pk) == 0
+        assert TestCase.objects.filter(project=filled_project).count() == 7
+
+    def test_deleted_project_hidden(self, user, filled_project):
+        """Тест скрытия помеченного проекта из доступных"""
+        from softlex.testcases.purge import mark_project_deleted
+        from softlex.testcases.utils import get_accessible_projects
+
+        mark_project_deleted(filled_project)
+
+        assert filled_project not in get_accessible_projects(user)
+
+
+@pytest.mark.django_db
+@pytest.mark.unit
+@pytest.mark.views
+class TestProjectDeleteView:
+    """Тесты для удаления проекта через интерфейс"""
+
+    def test_delete_tombstones_and_enqueues_purge(self, client, user, filled_project, project_member):
+        """Тест мгновенного скрытия проекта и фоновой очистки"""
+        from softlex.jobs.models import Job
+        from softlex.jobs.worker import claim_job, execute_job
+        from softlex.testcases.models import Project, TestCase
+
+        project_member.role = 'admin'
+        project_member.save()
+
+        client.force_login(user)
+        response = client.post(reverse('testcases:project_delete', args=[filled_project.pk]))
+
+        job = Job.objects.get(task='testcases.purge_project')
+        assert response.status_code == 302
+        assert response.url == reverse('jobs:job_detail', args=[job.pk])
+        assert Project.objects.get(pk=filled_project.pk).is_deleted
+        assert TestCase.objects.filter(project=filled_project).count() == 7
+
+        response = client.get(reverse('testcases:project_detail', args=[filled_project.pk]))
+        assert response.status_code == 404
+
+        claim_job('default')
+        assert execute_job(job.pk) == Job.STATUS_DONE
+        job.refresh_from_db()
+        assert job.total == 13
+        assert job.progress == 13
+        assert not Project.objects.filter(pk=filled_project.pk).exists()
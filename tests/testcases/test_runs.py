@@ -0,0 +1,174 @@
+"""
+Unit тесты для прогонов и результатов
+"""
+import pytest
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+
+User = get_user_model()
+
+
+@pytest.fixture
+def run_cases(user, project, project_member):
+    """Тест-кейсы в секциях Auth -> Login и без секции"""
+    from softlex.testcases.models import Section, TestCase
+    auth = Section.objects.create(name='Auth', project=project)
+    login = Section.objects.create(name='Login', project=project, parent=auth)
+    cases = {}
+    for title, section in [('B login', login), ('A login', login), ('Auth', auth), ('Loose', None)]:
+        cases[title] = TestCase.objects.create(
+            title=title, steps='Шаги', expected_result='Результат',
+            project=project, section=section, created_by=user
+        )
+    return {'auth': auth, 'login': login, 'cases': cases}
+
+
+@pytest.mark.django_db
+@pytest.mark.unit
+@pytest.mark.utils
+class TestRunFunctions:
+    """Тесты для функций create_run и update_results"""
+
+    def test_create_run_for_project(self, user, project, run_cases, django_assert_num_queries):
+        """Тест создания результатов одним INSERT ... SELECT"""
+        from softlex.testcases.models import TestResult
+        from softlex.testcases.runs import create_run
+
+        with django_assert_num_queries(4):
+            run, count = create_run(project, 'Регресс', user)
+
+        assert count == 4
+        results = list(TestResult.objects.filter(run=run).order_by('id').values_list('test_case__title', 'status'))
+        # Порядок: по пути секции, затем по названию; без секции - в конце
+        assert results == [
+            ('Auth', 'untested'), ('A login', 'untested'), ('B login', 'untested'), ('Loose', 'untested'),
+        ]
+
+    def test_create_run_for_section_subtree(self, user, project, run_cases):
+        """Тест прогона по поддереву секции"""
+        from softlex.testcases.runs import create_run
+
+        run, count = create_run(project, 'Auth', user, section=run_cases['auth'])
+
+        assert count == 3
+        assert run.section == run_cases['auth']
+        assert not run.results.filter(test_case__title='Loose').exists()
+
+    def test_update_results_upserts(self, user, project, run_cases, multiple_users):
+        """Тест массовой смены статусов и добавления новых тест-кейсов"""
+        from softlex.testcases.models import Project, TestCase, TestResult
+        from softlex.testcases.runs import create_run, get_run_summary, update_results
+
+        run, _ = create_run(project, 'Регресс', user, section=run_cases['login'])
+        cases = run_cases['cases']
+        foreign = TestCase.objects.create(
+            title='Чужой', steps='Шаги', expected_result='Результат',
+            project=Project.objects.create(name='Другой', created_by=user), created_by=user
+        )
+
+        updated = update_results(
+            run,
+            {cases['A login'].pk: 'passed', cases['Auth'].pk: 'failed', foreign.pk: 'passed'},
+            multiple_users[0],
+            comment='Сборка 15',
+        )
+
+        assert updated == 2
+        statuses = dict(run.results.values_list('test_case__title', 'status'))
+        assert statuses == {'A login': 'passed', 'B login': 'untested', 'Auth': 'failed'}
+        result = TestResult.objects.get(run=run, test_case=cases['A login'])
+        assert (result.updated_by, result.comment) == (multiple_users[0], 'Сборка 15')
+
+        update_results(run, {cases['A login'].pk: 'blocked'}, user)
+        result.refresh_from_db()
+        assert (result.status, result.comment) == ('blocked', 'Сборка 15')
+
+        summary = get_run_summary(run)
+        assert (summary['total'], summary['done'], summary['percent']) == (3, 2, 66)
+
+    def test_update_results_rejects_unknown_status(self, user, project, run_cases):
+        """Тест проверки статуса"""
+        from softlex.testcases.runs import create_run, update_results
+
+        run, _ = create_run(project, 'Регресс', user)
+
+        with pytest.raises(ValueError):
+            update_results(run, {run_cases['cases']['Auth'].pk: 'done'}, user)
+
+
+@pytest.mark.django_db
+@pytest.mark.unit
+@pytest.mark.views
+class TestRunViews:
+    """Тесты для страниц прогонов"""
+
+    def test_create_run_view(self, client, user, project, run_cases):
+        """Тест создания прогона через форму"""
+        from softlex.testcases.models import TestRun
+
+        client.force_login(user)
+        response = client.post(
+            reverse('testcases:run_list', args=[project.pk]),
+            {'name': 'Регресс', 'section': run_cases['login'].pk}
+        )
+
+        run = TestRun.objects.get()
+        assert response.url == reverse('testcases:run_detail', args=[run.pk])
+        assert run.results.count() == 2
+
+        response = client.get(reverse('testcases:run_list', args=[project.pk]))
+        assert response.status_code == 200
+        assert response.context['page'].object_list[0].summary['total'] == 2
+
+    def test_run_detail_and_bulk_update(self, client, user, project, run_cases):
+        """Тест страницы прогона и массовой смены статуса"""
+        from softlex.testcases.runs import create_run
+
+        run, _ = create_run(project, 'Регресс', user)
+        cases = run_cases['cases']
+
+        client.force_login(user)
+        response = client.post(
+            reverse('testcases:run_results_update', args=[run.pk]),
+            {'test_case': [cases['Auth'].pk, cases['Loose'].pk], 'status': 'failed'}
+        )
+        assert response.status_code == 302
+
+        response = client.get(reverse('testcases:run_detail', args=[run.pk]), {'status': 'failed'})
+        assert response.status_code == 200
+        assert [result.test_case.title for result in response.context['page']] == ['Auth', 'Loose']
+        assert dict((status, count) for status, _, count in response.context['summary']['statuses'])['failed'] == 2
+
+    def test_single_row_update_returns_row(self, client, user, project, run_cases):
+        """Тест смены статуса в строке таблицы через HTMX"""
+        from softlex.testcases.runs import create_run
+
+        run, _ = create_run(project, 'Регресс', user)
+
+        client.force_login(user)
+        response = client.post(
+            reverse('testcases:run_results_update', args=[run.pk]),
+            {'test_case': run_cases['cases']['Auth'].pk, 'status': 'passed'},
+            HTTP_HX_REQUEST='true'
+        )
+
+        assert response.status_code == 200
+        assert response.context['result'].status == 'passed'
+        assert '<tr>' in response.content.decode()
+
+    def test_viewer_cannot_update_results(self, client, user, project, run_cases, project_member):
+        """Тест запрета смены статусов для наблюдателя"""
+        from softlex.testcases.runs import create_run
+
+        run, _ = create_run(project, 'Регресс', user)
+        project_member.role = 'viewer'
+        project_member.save()
+
+        client.force_login(user)
+        response = client.post(
+            reverse('testcases:run_results_update', args=[run.pk]),
+            {'test_case': run_cases['cases']['Auth'].pk, 'status': 'passed'}
+        )
+
+        assert response.status_code == 403
+        assert not run.results.exclude(status='untested').exists()
@@ -0,0 +1,106 @@
+"""
+Unit тесты для полнотекстового поиска тест-кейсов
+"""
+import pytest
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+
+User = get_user_model()
+
+
+@pytest.mark.django_db
+@pytest.mark.unit
+@pytest.mark.utils
+class TestSearchTestCases:
+    """Тесты для функции search_test_cases"""
+
+    def test_title_match_ranks_higher(self, user, project):
+        """Тест приоритета совпадения в названии над совпадением в шагах"""
+        from softlex.testcases.models import TestCase
+        from softlex.testcases.search import search_test_cases
+
+        in_steps = TestCase.objects.create(
+            title='Проверка профиля', steps='Выполнить авторизацию', expected_result='Ок',
+            project=project, created_by=user
+        )
+        in_title = TestCase.objects.create(
+            title='Авторизация по паролю', steps='Ввести пароль', expected_result='Ок',
+            project=project, created_by=user
+        )
+
+        results = search_test_cases(TestCase.objects.all(), 'авторизация')
+
+        assert [test_case.pk for test_case in results] == [in_title.pk, in_steps.pk]
+
+    def test_preconditions_rank_above_steps(self, user, project):
+        """Тест приоритета совпадения в предусловиях (вес B) над совпадением в шагах (вес C)"""
+        from softlex.testcases.models import TestCase
+        from softlex.testcases.search import search_test_cases
+
+        in_steps = TestCase.objects.create(
+            title='Профиль', steps='Выполнить авторизацию', expected_result='Ок',
+            project=project, created_by=user
+        )
+        in_preconditions = TestCase.objects.create(
+            title='Профиль', preconditions='Выполнена авторизация', steps='Открыть профиль',
+            expected_result='Ок', project=project, created_by=user
+        )
+
+        results = search_test_cases(TestCase.objects.all(), 'авторизация')
+
+        assert [test_case.pk for test_case in results] == [in_preconditions.pk, in_steps.pk]
+
+    def test_highlight_escapes_html(self, user, project):
+        """Тест экранирования фрагмента с подсветкой"""
+        from softlex.testcases.models import TestCase
+        from softlex.testcases.search import search_test_cases, render_highlight
+
+        TestCase.objects.create(
+            title='<b>Корзина</b> заказа', steps='Шаги', expected_result='Ок',
+            project=project, created_by=user
+        )
+
+        result = search_test_cases(TestCase.objects.all(), 'корзина')[0]
+        html = render_highlight(result.title_snippet)
+
+        assert '<mark>' in html
+        assert '<b>' not in html
+        assert '&lt;b&gt;' in html
+
+
+@pytest.mark.django_db
+@pytest.mark.unit
+@pytest.mark.views
+class TestSearchView:
+    """Тесты для представления поиска"""
+
+    def test_results_limited_to_accessible_projects(self, client, user, project, project_member):
+        """Тест, что поиск не возвращает тест-кейсы чужих проектов"""
+        from softlex.testcases.models import Project, TestCase
+
+        other_user = User.objects.create_user(email='other@example.com', password='testpass123')
+        other_project = Project.objects.create(name='Чужой проект', created_by=other_user)
+        TestCase.objects.create(
+            title='Оплата картой', steps='Шаги', expected_result='Ок',
+            project=project, created_by=user
+        )
+        TestCase.objects.create(
+            title='Оплата наличными', steps='Шаги', expected_result='Ок',
+            project=other_project, created_by=other_user
+        )
+
+        client.force_login(user)
+        response = client.get(reverse('testcases:testcase_search'), {'q': 'оплата'})
+
+        assert response.status_code == 200
+        assert [test_case.project_id for test_case in response.context['results']] == [project.pk]
+
+    def test_htmx_returns_partial(self, client, user, project_member):
+        """Тест ответа фрагментом для HTMX запроса"""
+        client.force_login(user)
+        response = client.get(
+            reverse('testcases:testcase_search'), {'q': 'логин'}, HTTP_HX_REQUEST='true'
+        )
+
+        assert response.status_code == 200
+        assert 'base.html' not in [t.name for t in response.templates]
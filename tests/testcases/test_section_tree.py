@@ -0,0 +1,124 @@
+"""
+Unit тесты для навигации по дереву секций
+"""
+import pytest
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+
+User = get_user_model()
+
+
+@pytest.fixture
+def section_tree(user, project, project_member):
+    """Создает дерево секций: Auth -> Login -> SSO и Billing"""
+    from softlex.testcases.models import Section, TestCase
+    auth = Section.objects.create(name='Auth', project=project)
+    login = Section.objects.create(name='Login', project=project, parent=auth)
+    sso = Section.objects.create(name='SSO', project=project, parent=login)
+    billing = Section.objects.create(name='Billing', project=project)
+    for title, section in [('Auth case', auth), ('Login case', login), ('SSO case', sso), ('Loose case', None)]:
+        TestCase.objects.create(
+            title=title, steps='Шаги', expected_result='Результат',
+            project=project, section=section, created_by=user
+        )
+    return {'auth': auth, 'login': login, 'sso': sso, 'billing': billing}
+
+
+@pytest.mark.django_db
+@pytest.mark.unit
+@pytest.mark.utils
+class TestGetSectionNodes:
+    """Тесты для функции get_section_nodes"""
+
+    def test_root_level_counts(self, project, section_tree):
+        """Тест счетчиков корневого уровня"""
+        from softlex.testcases.utils import get_section_nodes
+
+        nodes = {node.name: node for node in get_section_nodes(project)}
+
+        assert set(nodes) == {'Auth', 'Billing'}
+        assert (nodes['Auth'].children_count, nodes['Auth'].case_count) == (1, 1)
+        assert (nodes['Billing'].children_count, nodes['Billing'].case_count) == (0, 0)
+
+    def test_child_level(self, project, section_tree):
+        """Тест выборки дочернего уровня"""
+        from softlex.testcases.utils import get_section_nodes
+
+        nodes = list(get_section_nodes(project, parent=section_tree['auth']))
+
+        assert nodes == [section_tree['login']]
+        assert (nodes[0].children_count, nodes[0].case_count) == (1, 1)
+
+
+@pytest.mark.django_db
+@pytest.mark.unit
+@pytest.mark.views
+class TestSectionTreeViews:
+    """Тесты для дерева секций на странице проекта"""
+
+    def test_project_detail_renders_only_root_level(self, client, user, project, section_tree):
+        """Тест первой отрисовки только с корневыми секциями"""
+        client.force_login(user)
+        response = client.get(reverse('testcases:project_detail', args=[project.pk]))
+
+        content = response.content.decode()
+        assert response.status_code == 200
+        assert reverse('testcases:section_children', args=[project.pk, section_tree['auth'].pk]) in content
+        assert f'?section={section_tree["billing"].pk}' in content
+        assert f'?section={section_tree["login"].pk}' not in content
+
+    def test_section_filter_includes_subtree(self, client, user, project, section_tree):
+        """Тест фильтра списка по секции вместе с вложенными"""
+        client.force_login(user)
+        response = client.get(
+            reverse('testcases:project_detail', args=[project.pk]),
+            {'section': section_tree['login'].pk, 'sort': 'title'}
+        )
+
+        titles = [test_case.title for test_case in response.context['page']]
+        assert titles == ['Login case', 'SSO case']
+        assert response.context['current_section'] == section_tree['login']
+
+    def test_section_children(self, client, user, project, section_tree):
+        """Тест загрузки дочерних секций и тест-кейсов узла"""
+        client.force_login(user)
+        response = client.get(
+            reverse('testcases:section_children', args=[project.pk, section_tree['auth'].pk]),
+            HTTP_HX_REQUEST='true'
+        )
+
+        content = response.content.decode()
+        assert response.status_code == 200
+        assert list(response.context['sections']) == [section_tree['login']]
+        assert 'Auth case' in content
+        assert 'Login case' not in content
+
+    def test_section_children_pagination(self, client, user, project, section_tree, monkeypatch):
+        """Тест подгрузки тест-кейсов узла по курсору"""
+        from softlex.testcases import views
+        from softlex.testcases.models import TestCase
+
+        for i in range(3):
+            TestCase.objects.create(
+                title=f'Extra {i}', steps='Шаги', expected_result='Результат',
+                project=project, section=section_tree['billing'], created_by=user
+            )
+        monkeypatch.setattr(views, 'SECTION_TESTCASES_PAGE_SIZE', 2)
+
+        client.force_login(user)
+        url = reverse('testcases:section_children', args=[project.pk, section_tree['billing'].pk])
+        first = client.get(url, HTTP_HX_REQUEST='true')
+        second = client.get(url, {'cursor': first.context['page'].next_cursor}, HTTP_HX_REQUEST='true')
+
+        assert [test_case.title for test_case in first.context['page']] == ['Extra 0', 'Extra 1']
+        assert [test_case.title for test_case in second.context['page']] == ['Extra 2']
+        assert 'sections' not in second.context
+
+    def test_section_children_requires_access(self, client, project, section_tree, multiple_users):
+        """Тест запрета для пользователя без доступа к проекту"""
+        client.force_login(multiple_users[0])
+        response = client.get(
+            reverse('testcases:section_children', args=[project.pk, section_tree['auth'].pk])
+        )
+
+        assert response.status_code == 403
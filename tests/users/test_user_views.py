@@ -311,7 +311,74 @@ class TestUserListView:
         
         assert response.status_code == 200
         assert 'page_obj' in response.context
-        assert response.context['page_obj'].paginator.num_pages > 1
+        assert len(response.context['page_obj']) == 20
+        assert response.context['page_obj'].has_next
+        
+        # Следующая страница по курсору через HTMX возвращает только строки
+        response = client.get(
+            reverse('users:user_list'),
+            {'cursor': response.context['page_obj'].next_cursor},
+            HTTP_HX_REQUEST='true'
+        )
+        
+        assert response.status_code == 200
+        assert len(response.context['page_obj']) == 6
+        assert not response.context['page_obj'].has_next
+        assert 'base.html' not in [template.name for template in response.templates]
+    
+    def test_user_list_view_search_ranked_by_similarity(self, client, admin):
+        """Тест сортировки результатов поиска по релевантности"""
+        exact = User.objects.create_user(
+            email='anna@example.com', first_name='Ivan', password='testpass123'
+        )
+        # Создан позже, поэтому без ранжирования оказался бы первым
+        partial = User.objects.create_user(
+            email='ivanova@example.com', password='testpass123'
+        )
+        User.objects.create_user(email='petrov@example.com', password='testpass123')
+        
+        client.force_login(admin)
+        response = client.get(reverse('users:user_list'), {'search': 'ivan'})
+        
+        assert [user.pk for user in response.context['page_obj']] == [exact.pk, partial.pk]
+
+
+@pytest.mark.django_db
+@pytest.mark.unit
+@pytest.mark.views
+class TestUserLookupView:
+    """Тесты для подсказок пользователей при выборе участников"""
+    
+    def test_user_lookup_by_email_prefix(self, client, user, multiple_users):
+        """Тест поиска активных пользователей по префиксу email"""
+        multiple_users[0].is_active = False
+        multiple_users[0].save()
+        
+        client.force_login(user)
+        response = client.get(reverse('users:user_lookup'), {'q': 'user'}, HTTP_HX_REQUEST='true')
+        
+        assert response.status_code == 200
+        emails = [user_obj.email for user_obj in response.context['users']]
+        assert emails == [f'user{i}@example.com' for i in range(1, 5)]
+        assert user.email not in emails
+    
+    def test_user_lookup_limit(self, client, user):
+        """Тест ограничения количества подсказок"""
+        for i in range(15):
+            User.objects.create_user(email=f'member{i:02}@example.com', password='testpass123')
+        
+        client.force_login(user)
+        response = client.get(reverse('users:user_lookup'), {'q': 'mem'})
+        
+        assert len(response.context['users']) == 10
+    
+    def test_user_lookup_short_query(self, client, user, multiple_users):
+        """Тест, что слишком короткий запрос не выполняет поиск"""
+        client.force_login(user)
+        response = client.get(reverse('users:user_lookup'), {'q': 'us'})
+        
+        assert response.status_code == 200
+        assert list(response.context['users']) == []
 
 
 @pytest.mark.django_db